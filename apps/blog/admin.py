@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from apps.blog.models import Post, SubPost, Like
+from apps.blog.models import Post, PostScore, SubPost, Like
 admin.site.register(Post)
 admin.site.register(SubPost)
-admin.site.register(Like)
\ No newline at end of file
+admin.site.register(Like)
+admin.site.register(PostScore)
\ No newline at end of file
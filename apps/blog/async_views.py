@@ -0,0 +1,74 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+
+from rest_framework.exceptions import MethodNotAllowed
+
+from apps.blog.renderers import FastJSONRenderer
+
+
+class AsyncReadView:
+  """
+  async-эндпоинт для действий вьюсета DRF (/api/async/, только JSON)
+
+  Синхронная часть DRF - аутентификация, права, троттлинг, выбор
+  рендерера - выполняется одним вызовом в потоке. Обработчик - async-метод
+  вьюсета с префиксом 'a' (alist, aretrieve, aadd_view): запросы к БД
+  через async ORM, поток не занимается на время запроса. Если вьюсет
+  не может ответить асинхронно (use_async_read() = False), вызывается
+  обычный list/retrieve в том же потоке.
+
+  Ответ рендерится здесь и отдается как HttpResponse: DRF Response
+  Django рендерил бы через sync_to_async.
+  """
+  renderer_classes = [FastJSONRenderer]
+  sync_fallback_actions = ('list', 'retrieve')
+
+  def __init__(self, viewset_class, actions):
+    self.viewset_class = viewset_class
+    self.actions = actions
+
+  @classmethod
+  def as_view(cls, viewset_class, actions):
+    handler = cls(viewset_class, actions)
+
+    async def view(request, *args, **kwargs):
+      return await handler.dispatch(request, *args, **kwargs)
+
+    # Как у APIView.as_view(): CSRF проверяет SessionAuthentication
+    view.csrf_exempt = True
+    return view
+
+  def start(self, request, args, kwargs):
+    """
+    Синхронная часть APIView.dispatch()
+
+    :return: (вьюсет, Response или None - продолжить в async-обработчике)
+    """
+    view = self.viewset_class(renderer_classes=self.renderer_classes)
+    view.action_map = self.actions
+    view.args = args
+    view.kwargs = kwargs
+    view.request = view.initialize_request(request, *args, **kwargs)
+    view.headers = view.default_response_headers
+    try:
+      view.initial(view.request, *args, **kwargs)
+      if view.action in self.sync_fallback_actions and not view.use_async_read():
+        return view, getattr(view, view.action)(view.request, *args, **kwargs)
+    except Exception as exc:
+      return view, view.handle_exception(exc)
+    return view, None
+
+  async def dispatch(self, request, *args, **kwargs):
+    view, response = await sync_to_async(self.start)(request, args, kwargs)
+    if response is None:
+      try:
+        handler = getattr(view, f'a{view.action}', None) if view.action else None
+        if handler is None:
+          raise MethodNotAllowed(request.method)
+        response = await handler(view.request, *args, **kwargs)
+      except Exception as exc:
+        response = view.handle_exception(exc)
+
+    response = view.finalize_response(view.request, response, *args, **kwargs)
+    response.render()
+    return HttpResponse(response.content, status=response.status_code, headers=response.headers)
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework.authentication import BasicAuthentication
+
+
+DEFAULT_AUTH_CACHE = {
+  'ENABLED': True,
+  # Сколько секунд проверенные логин/пароль не проверяются заново
+  'TTL': 300,
+  # Записей на процесс: сверх - вытесняются давно не использованные
+  'MAX_SIZE': 10000,
+}
+
+
+def get_auth_cache_settings():
+  return {**DEFAULT_AUTH_CACHE, **getattr(settings, 'BLOG_AUTH_CACHE', {})}
+
+
+class CredentialCache:
+  """
+  Проверенные пары логин/пароль в памяти процесса: LRU с TTL
+
+  Ключ - blake2b с ключом процесса (os.urandom) от логина и пароля:
+  пароль не хранится, а дайджест не подобрать без ключа из памяти
+  процесса. Значение - id пользователя и хэш пароля на момент
+  проверки: если хэш в БД другой (пароль сменили, в том числе в другом
+  процессе), запись не действует.
+  """
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._entries = OrderedDict()
+    self._secret = os.urandom(32)
+
+  def key(self, username, password):
+    message = f'{username}\0{password}'.encode()
+    return hashlib.blake2b(message, key=self._secret, digest_size=32).digest()
+
+  def get(self, key):
+    """:return: (id пользователя, хэш пароля) или None"""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        return None
+      user_id, password_hash, expires_at = entry
+      if expires_at <= time.monotonic():
+        del self._entries[key]
+        return None
+      self._entries.move_to_end(key)
+      return user_id, password_hash
+
+  def set(self, key, user_id, password_hash, ttl, max_size):
+    with self._lock:
+      self._entries[key] = (user_id, password_hash, time.monotonic() + ttl)
+      self._entries.move_to_end(key)
+      while len(self._entries) > max_size:
+        self._entries.popitem(last=False)
+
+  def discard(self, key):
+    with self._lock:
+      self._entries.pop(key, None)
+
+  def evict_user(self, user_id):
+    with self._lock:
+      for key in [key for key, entry in self._entries.items() if entry[0] == user_id]:
+        del self._entries[key]
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+  def __len__(self):
+    return len(self._entries)
+
+
+credential_cache = CredentialCache()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def evict_user_credentials(sender, instance, **kwargs):
+  # Смена пароля, логина или is_active в этом процессе - сразу; в других
+  # процессах запись отсекает сверка хэша пароля
+  credential_cache.evict_user(instance.pk)
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+  """
+  BasicAuthentication без хэширования пароля (PBKDF2) на каждый запрос
+
+  Первый запрос проверяет пароль как обычно и запоминает пару в
+  credential_cache. Повторные - поиск по дайджесту и загрузка
+  пользователя по id (тот же один запрос к БД, что и раньше). Запись
+  действует, пока совпадают логин, хэш пароля и is_active.
+  """
+  def authenticate_credentials(self, userid, password, request=None):
+    config = get_auth_cache_settings()
+    if not config['ENABLED']:
+      return super().authenticate_credentials(userid, password, request)
+
+    key = credential_cache.key(userid, password)
+    entry = credential_cache.get(key)
+    if entry is not None:
+      user_model = get_user_model()
+      user_id, password_hash = entry
+      user = user_model._default_manager.filter(pk=user_id).first()
+      if (
+        user is not None and user.is_active and user.password == password_hash
+        and user.get_username() == userid
+      ):
+        return (user, None)
+      credential_cache.discard(key)
+
+    user, auth = super().authenticate_credentials(userid, password, request)
+    credential_cache.set(key, user.pk, user.password, config['TTL'], config['MAX_SIZE'])
+    return (user, auth)
@@ -0,0 +1,158 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+DEFAULT_RESPONSE_CACHE = {
+  'ENABLED': False,
+  # Алиас из settings.CACHES (locmem, file, ...)
+  'ALIAS': 'default',
+  'TIMEOUT': 300,
+}
+
+LIST_VERSION_KEY = 'blog:posts:list:version'
+HITS_KEY = 'blog:posts:cache:hits'
+MISSES_KEY = 'blog:posts:cache:misses'
+
+
+def get_response_cache_settings():
+  return {**DEFAULT_RESPONSE_CACHE, **getattr(settings, 'BLOG_RESPONSE_CACHE', {})}
+
+
+def get_response_cache():
+  return caches[get_response_cache_settings()['ALIAS']]
+
+
+def post_version_key(post_id):
+  return f'blog:post:{post_id}:version'
+
+
+def get_version(key):
+  """
+  Версия - случайный токен, а не счетчик: если ключ версии вытеснен
+  из кэша, новая версия не совпадет со старыми закэшированными ответами
+  """
+  cache = get_response_cache()
+  version = cache.get(key)
+  if version is None:
+    version = uuid.uuid4().hex
+    if not cache.add(key, version, None):
+      version = cache.get(key, version)
+  return version
+
+
+def bump_version(key):
+  get_response_cache().set(key, uuid.uuid4().hex, None)
+
+
+def bump_versions(keys):
+  if not get_response_cache_settings()['ENABLED']:
+    return
+  for key in keys:
+    bump_version(key)
+  # Повтор после коммита: параллельный запрос мог успеть закэшировать
+  # старые данные, пока транзакция была открыта
+  transaction.on_commit(lambda: [bump_version(key) for key in keys])
+
+
+def invalidate_post(*post_ids):
+  """Сбросить кэш деталей постов и всех страниц списка"""
+  bump_versions([post_version_key(post_id) for post_id in post_ids] + [LIST_VERSION_KEY])
+
+
+def invalidate_post_list():
+  """Сбросить кэш страниц списка (новые посты)"""
+  bump_versions([LIST_VERSION_KEY])
+
+
+def incr_counter(key):
+  cache = get_response_cache()
+  try:
+    cache.incr(key)
+  except ValueError:
+    if not cache.add(key, 1, None):
+      cache.incr(key)
+
+
+def get_cache_stats():
+  config = get_response_cache_settings()
+  cache = get_response_cache()
+  return {
+    'enabled': config['ENABLED'],
+    'alias': config['ALIAS'],
+    'backend': f'{type(cache).__module__}.{type(cache).__name__}',
+    'hits': cache.get(HITS_KEY, 0),
+    'misses': cache.get(MISSES_KEY, 0),
+  }
+
+
+class CachedResponseMixin:
+  """
+  Кэш ответов list/retrieve на фреймворке кэша Django
+
+  Ключ содержит версию списка (list) или версию поста (retrieve) и
+  полный URL запроса. Запись в пост меняет версию - старые ключи
+  больше не читаются и истекают по TIMEOUT.
+
+  Если ответ зависит от пользователя, get_response_cache_vary()
+  возвращает часть ключа (например, id пользователя).
+  """
+  def list(self, request, *args, **kwargs):
+    return self.get_cached_response(
+      LIST_VERSION_KEY,
+      lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs)
+    )
+
+  def retrieve(self, request, *args, **kwargs):
+    # Версия - по id поста, как в invalidate_post: /posts/01/ и /posts/1/ - один пост
+    try:
+      version_key = post_version_key(int(kwargs[self.lookup_url_kwarg or self.lookup_field]))
+    except ValueError:
+      version_key = None
+    return self.get_cached_response(
+      version_key,
+      lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs)
+    )
+
+  # Кэш синхронный: с ним async-эндпоинты идут через list/retrieve
+  def use_async_read(self):
+    return super().use_async_read() and not get_response_cache_settings()['ENABLED']
+
+  def get_response_cache_key(self, version_key):
+    url = self.request.build_absolute_uri()
+    vary = self.get_response_cache_vary()
+    if vary:
+      url = f'{url}|{vary}'
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return f'blog:response:{version_key}:{get_version(version_key)}:{digest}'
+
+  def get_response_cache_vary(self):
+    return None
+
+  def get_cached_response(self, version_key, get_response):
+    config = get_response_cache_settings()
+    # version_key=None - не кэшировать (id поста не разобран)
+    if not config['ENABLED'] or version_key is None:
+      return get_response()
+
+    cache = get_response_cache()
+    key = self.get_response_cache_key(version_key)
+    data = cache.get(key)
+    if data is not None:
+      incr_counter(HITS_KEY)
+      response = Response(data)
+      response['X-Cache'] = 'HIT'
+      return response
+
+    incr_counter(MISSES_KEY)
+    response = get_response()
+    if response.status_code == status.HTTP_200_OK:
+      cache.set(key, response.data, config['TIMEOUT'])
+    response['X-Cache'] = 'MISS'
+    return response
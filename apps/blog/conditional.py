@@ -0,0 +1,185 @@
+import hashlib
+import json
+from calendar import timegm
+
+from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+  """
+  ETag / Last-Modified для list и retrieve
+
+  ETag строится по полям conditional_fields каждой строки (id, update_at,
+  счетчики) и по служебной части страницы (count, next, previous).
+  Набор полей можно менять на запрос в get_conditional_fields().
+  Если клиент прислал If-None-Match / If-Modified-Since, сначала
+  выполняется запрос только этих полей: при совпадении - 304 без
+  сериализации тел. Иначе валидаторы считаются по готовому ответу.
+
+  Last-Modified берется из update_at; счетчики (просмотры, лайки) его не
+  меняют, их изменения видны только через ETag.
+
+  alist/aretrieve (async) сравнивают валидаторы по готовому ответу: один
+  запрос к БД вместо двух.
+  """
+  conditional_fields = ('id', 'update_at')
+  datetime_field = serializers.DateTimeField()
+
+  def list(self, request, *args, **kwargs):
+    if self.has_conditional_headers(request):
+      # prefetch_related не нужен для метаданных
+      fields = self.get_conditional_fields()
+      # Ссылки курсорной пагинации строятся по полям ordering последней строки
+      fields = tuple(dict.fromkeys((*fields, *self.get_pagination_fields())))
+      queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+      rows = self.paginate_queryset(queryset.values(*fields))
+      if rows is None:
+        envelope = None
+        rows = list(queryset.values(*fields))
+      else:
+        envelope = self.get_page_envelope(self.get_paginated_response([]).data)
+      # Пагинатор пересоздается для основного запроса
+      del self._paginator
+
+      not_modified = self.get_not_modified_response(request, envelope, rows)
+      if not_modified is not None:
+        return not_modified
+
+    response = super().list(request, *args, **kwargs)
+    if response.status_code == status.HTTP_200_OK:
+      self.set_validators(response, *self.get_response_rows(response.data))
+    return response
+
+  def retrieve(self, request, *args, **kwargs):
+    if self.has_conditional_headers(request):
+      lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+      # pk не того типа - как rest_framework.generics.get_object_or_404: 404 в super().retrieve
+      try:
+        row = (
+          self.filter_queryset(self.get_queryset())
+          .prefetch_related(None)
+          .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+          .values(*self.get_conditional_fields())
+          .first()
+        )
+      except (TypeError, ValueError, ValidationError):
+        row = None
+      if row is not None:
+        not_modified = self.get_not_modified_response(request, None, [row])
+        if not_modified is not None:
+          return not_modified
+
+    response = super().retrieve(request, *args, **kwargs)
+    if response.status_code == status.HTTP_200_OK:
+      self.set_validators(response, None, [response.data])
+    return response
+
+  async def alist(self, request, *args, **kwargs):
+    response = await super().alist(request, *args, **kwargs)
+    return self.get_conditional_response(request, response)
+
+  async def aretrieve(self, request, *args, **kwargs):
+    response = await super().aretrieve(request, *args, **kwargs)
+    return self.get_conditional_response(request, response)
+
+  def get_conditional_response(self, request, response):
+    """304 или ответ с ETag / Last-Modified - по уже собранному ответу"""
+    if response.status_code != status.HTTP_200_OK:
+      return response
+    envelope, rows = self.get_response_rows(response.data)
+    if self.has_conditional_headers(request):
+      not_modified = self.get_not_modified_response(request, envelope, rows)
+      if not_modified is not None:
+        return not_modified
+    self.set_validators(response, envelope, rows)
+    return response
+
+  def get_response_rows(self, data):
+    """
+    :return: (служебная часть страницы или None, строки ответа)
+    """
+    if isinstance(data, dict) and 'results' in data:
+      return self.get_page_envelope(data), data['results']
+    if isinstance(data, list):
+      return None, data
+    return None, [data]
+
+  def get_conditional_fields(self):
+    return self.conditional_fields
+
+  def get_pagination_fields(self):
+    ordering = getattr(self.paginator, 'ordering', None) or ()
+    if isinstance(ordering, str):
+      ordering = (ordering,)
+    return tuple(field.lstrip('-') for field in ordering)
+
+  def has_conditional_headers(self, request):
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+  def get_page_envelope(self, data):
+    return {key: value for key, value in data.items() if key != 'results'}
+
+  def normalize_value(self, value):
+    # Строки из БД приводим к тому же виду, что отдает сериализатор
+    if hasattr(value, 'isoformat'):
+      return self.datetime_field.to_representation(value)
+    return value
+
+  def get_validators(self, envelope, rows):
+    """
+    :return: (ETag в кавычках, Last-Modified как timestamp или None)
+    """
+    fingerprint = {
+      'page': envelope,
+      'rows': [
+        [self.normalize_value(row[field]) for field in self.get_conditional_fields()]
+        for row in rows
+      ],
+    }
+    raw = json.dumps(fingerprint, sort_keys=True, separators=(',', ':'), default=str)
+    etag = quote_etag(hashlib.sha256(raw.encode('utf-8')).hexdigest())
+
+    last_modified = None
+    for row in rows:
+      value = row['update_at']
+      if isinstance(value, str):
+        value = parse_datetime(value)
+      timestamp = timegm(value.utctimetuple())
+      if last_modified is None or timestamp > last_modified:
+        last_modified = timestamp
+    return etag, last_modified
+
+  def set_validators(self, response, envelope, rows):
+    etag, last_modified = self.get_validators(envelope, rows)
+    response['ETag'] = etag
+    if last_modified is not None:
+      response['Last-Modified'] = http_date(last_modified)
+
+  def get_not_modified_response(self, request, envelope, rows):
+    etag, last_modified = self.get_validators(envelope, rows)
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+      # Для GET сравнение слабое: W/"x" совпадает с "x"
+      etags = [value.removeprefix('W/') for value in parse_etags(if_none_match)]
+      not_modified = '*' in etags or etag in etags
+    else:
+      if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+      not_modified = (
+        if_modified_since is not None
+        and last_modified is not None
+        and last_modified <= if_modified_since
+      )
+
+    if not not_modified:
+      return None
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    response['ETag'] = etag
+    if last_modified is not None:
+      response['Last-Modified'] = http_date(last_modified)
+    return response
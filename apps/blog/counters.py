@@ -0,0 +1,130 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+from django.utils import timezone
+
+from apps.blog.cache import invalidate_post
+from apps.blog.models import Post
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VIEW_BUFFER = {
+  'ENABLED': False,
+  # Сколько просмотров копим до сброса в БД
+  'MAX_PENDING': 100,
+  # Через сколько секунд после первого просмотра в буфере сбрасываем, даже если порог не набран
+  'FLUSH_INTERVAL': 5,
+}
+
+
+def get_view_buffer_settings():
+  return {**DEFAULT_VIEW_BUFFER, **getattr(settings, 'BLOG_VIEW_BUFFER', {})}
+
+
+class ViewCountBuffer:
+  """
+  Write-behind буфер счетчика просмотров (в памяти процесса)
+
+  Вместо UPDATE на каждый просмотр копит приращения по постам и
+  сбрасывает их одним UPDATE ... CASE, когда набран MAX_PENDING
+  просмотров или прошло FLUSH_INTERVAL секунд с первого просмотра в
+  буфере (таймер в фоновом потоке - сброс и без новых просмотров).
+  При остановке процесса остаток сбрасывается через atexit.
+  """
+  # Ограничение на размер CASE в одном UPDATE
+  flush_batch_size = 500
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._pending = Counter()
+    self._timer = None
+    self._atexit_registered = False
+
+  def add(self, post_id, amount=1):
+    config = get_view_buffer_settings()
+    with self._lock:
+      self._pending[int(post_id)] += amount
+      self._register_atexit()
+      self._start_timer(config['FLUSH_INTERVAL'])
+      pending_total = sum(self._pending.values())
+    if pending_total >= config['MAX_PENDING']:
+      self.flush()
+
+  def pending(self, post_id=None):
+    with self._lock:
+      if post_id is None:
+        return dict(self._pending)
+      return self._pending.get(int(post_id), 0)
+
+  def flush(self):
+    """
+    Сбросить накопленные просмотры в БД
+
+    :return: Количество обновленных постов
+    """
+    with self._lock:
+      pending, self._pending = self._pending, Counter()
+      self._cancel_timer()
+    if not pending:
+      return 0
+
+    try:
+      return self.write(pending)
+    except Exception:
+      # Не теряем просмотры: вернем их в буфер до следующего сброса
+      logger.exception('Не удалось сбросить буфер просмотров')
+      with self._lock:
+        self._pending.update(pending)
+        self._start_timer(get_view_buffer_settings()['FLUSH_INTERVAL'])
+      return 0
+
+  def write(self, pending):
+    updated = 0
+    items = list(pending.items())
+    now = timezone.now()
+    with transaction.atomic():
+      for start in range(0, len(items), self.flush_batch_size):
+        batch = items[start:start + self.flush_batch_size]
+        increment = Case(
+          *[When(id=post_id, then=Value(amount)) for post_id, amount in batch],
+          default=Value(0),
+          output_field=PositiveIntegerField()
+        )
+        updated += Post.objects.filter(
+          id__in=[post_id for post_id, _ in batch]
+        ).update(views_count=F('views_count') + increment, activity_at=now)
+    invalidate_post(*pending.keys())
+    return updated
+
+  def _start_timer(self, interval):
+    # Под self._lock: один таймер на непустой буфер
+    if self._timer is None:
+      self._timer = threading.Timer(interval, self._flush_on_timer)
+      self._timer.daemon = True
+      self._timer.start()
+
+  def _cancel_timer(self):
+    if self._timer is not None:
+      self._timer.cancel()
+      self._timer = None
+
+  def _flush_on_timer(self):
+    try:
+      self.flush()
+    finally:
+      # Соединение потока таймера не переиспользуется
+      connection.close()
+
+  def _register_atexit(self):
+    if not self._atexit_registered:
+      atexit.register(self.flush)
+      self._atexit_registered = True
+
+
+view_buffer = ViewCountBuffer()
@@ -0,0 +1,16 @@
+from drf_spectacular.authentication import BasicScheme
+from drf_spectacular.generators import SchemaGenerator
+
+from apps.blog.docs.lazy import attach_pending_docs
+
+
+class CachedBasicScheme(BasicScheme):
+  """CachedBasicAuthentication в схеме - тот же basicAuth"""
+  target_class = 'apps.blog.authentication.CachedBasicAuthentication'
+
+
+class LazyDocsSchemaGenerator(SchemaGenerator):
+  """Генератор схемы: перед обходом вьюсетов применяет отложенные schema_docs"""
+  def get_schema(self, request=None, public=False):
+    attach_pending_docs()
+    return super().get_schema(request=request, public=public)
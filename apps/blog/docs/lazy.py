@@ -0,0 +1,69 @@
+import threading
+from importlib import import_module
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
+
+
+DOCS_PACKAGE = 'apps.blog.docs'
+
+_pending_lock = threading.Lock()
+# (вьюсет или метод, 'модуль.ИМЯ') в порядке объявления
+_pending = []
+
+
+def is_lazy():
+  return getattr(settings, 'BLOG_LAZY_SCHEMA_DOCS', False)
+
+
+def apply_docs(target, name):
+  """extend_schema(**docs) из apps/blog/docs/<модуль>.py для вьюсета или метода"""
+  from drf_spectacular.utils import extend_schema
+
+  module_name, docs_name = name.rsplit('.', 1)
+  docs = getattr(import_module(f'{DOCS_PACKAGE}.{module_name}'), docs_name)
+  return extend_schema(**docs)(target)
+
+
+def schema_docs(name):
+  """
+  Декоратор вместо @extend_schema(**DOCS): name - 'post_doc.LIST_POSTS_DOCS'
+
+  BLOG_LAZY_SCHEMA_DOCS = False - аннотация сразу, как extend_schema.
+  True - только запоминается: модули docs и drf_spectacular не
+  импортируются при старте воркера, аннотации применяет
+  attach_pending_docs() перед генерацией схемы.
+  """
+  def decorator(target):
+    if not is_lazy():
+      return apply_docs(target, name)
+    if isinstance(target, type):
+      # Иначе DefaultSchema DRF импортирует AutoSchema (и drf_spectacular) при
+      # сборке роутера; extend_schema затем возьмет DEFAULT_SCHEMA_CLASS
+      target.schema = None
+    with _pending_lock:
+      _pending.append((target, name))
+    return target
+  return decorator
+
+
+def attach_pending_docs():
+  """Применить отложенные аннотации (в порядке объявления, как без ленивого режима)"""
+  with _pending_lock:
+    pending = _pending[:]
+    _pending.clear()
+  for target, name in pending:
+    apply_docs(target, name)
+
+
+def lazy_view(import_path, **initkwargs):
+  """View для urls.py: класс импортируется при первом запросе, а не при загрузке URL"""
+  views = []
+
+  @csrf_exempt
+  def view(request, *args, **kwargs):
+    if not views:
+      views.append(import_string(import_path).as_view(**initkwargs))
+    return views[0](request, *args, **kwargs)
+  return view
@@ -13,6 +13,9 @@ ADD_RO_REMOVE_LIKE = {
     "Метод переключает состояние лайка для конкретного поста:\n\n"
     "- Если пользователь ещё не ставил лайк - он будет добавлен.\n"
     "- Если лайк уже был - он будет удалён.\n\n"
+    "В ответе - новое состояние (`liked`) и счетчик лайков поста (`likes_count`). "
+    "Переключение атомарно: повторный клик во время обработки первого "
+    "не создаст дубль и не собьет счетчик.\n\n"
     "**Пример использования:**\n"
     "POST `/posts/{id}/like/` - переключение лайка для поста с ID `{id}`."
   ),
@@ -23,12 +26,12 @@ ADD_RO_REMOVE_LIKE = {
       examples=[
         OpenApiExample(
           "Лайк поставлен",
-          value={"message": "Вы поставили лайк"},
+          value={"message": "Вы поставили лайк", "liked": True, "likes_count": 1},
           media_type="application/json"
         ),
         OpenApiExample(
           "Лайк убран",
-          value={"message": "Лайк убран"},
+          value={"message": "Лайк убран", "liked": False, "likes_count": 0},
           media_type="application/json"
         )
       ]
@@ -1,19 +1,72 @@
 from drf_spectacular.utils import OpenApiExample, OpenApiResponse, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
+from apps.blog.serializers import SubPostPatchSerializer
+
 POST_VIEW_SET_DOCS = {
   "tags": ["Посты"],
   "description": (
     "Пост - Основной контент.\n\n"
+    "`GET` списка и деталей отдает `ETag` и `Last-Modified`. "
+    "С заголовками `If-None-Match` / `If-Modified-Since` вернется `304`, "
+    "если данные не изменились.\n\n"
   )
 }
 
 LIST_POSTS_DOCS = {
   "summary":"Получить список постов",
   "description":(
-      "- Для этого метода включена пагинация (`PostPagination`).\n"
+      "- Для этого метода включена пагинация (`PostPagination`), посты от старых к новым.\n"
+      "- `?author=id` - только посты автора.\n"
+      "- `?pagination=cursor` - keyset-пагинация (`PostCursorPagination`): "
+      "от новых к старым, без `count`, переход по ссылкам `next`/`previous`.\n"
+      "- `?include=subposts` - субпосты встраиваются в каждый пост "
+      "(один дополнительный запрос на страницу).\n"
+      "- `?include=liked_by_me` - флаг `liked_by_me` у каждого поста "
+      "(подзапрос EXISTS в том же запросе).\n"
       "- Получаем все субпосты"
   ),
+  "parameters": [
+    OpenApiParameter(
+      name="pagination",
+      type=OpenApiTypes.STR,
+      location=OpenApiParameter.QUERY,
+      required=False,
+      enum=["cursor"],
+      description="Режим пагинации. `cursor` - стабильная пагинация по курсору.",
+    ),
+    OpenApiParameter(
+      name="cursor",
+      type=OpenApiTypes.STR,
+      location=OpenApiParameter.QUERY,
+      required=False,
+      description="Непрозрачный курсор из ссылок `next`/`previous`.",
+    ),
+    OpenApiParameter(
+      name="author",
+      type=OpenApiTypes.INT,
+      location=OpenApiParameter.QUERY,
+      required=False,
+      description="ID автора: только его посты",
+    ),
+    OpenApiParameter(
+      name="include",
+      type=OpenApiTypes.STR,
+      location=OpenApiParameter.QUERY,
+      required=False,
+      description=(
+        "Через запятую: `subposts` - встроить субпосты поста в поле `subposts`, "
+        "`liked_by_me` - флаг лайка текущего пользователя в поле `liked_by_me`."
+      ),
+    ),
+    OpenApiParameter(
+      name="subposts_limit",
+      type=OpenApiTypes.INT,
+      location=OpenApiParameter.QUERY,
+      required=False,
+      description="Не больше N субпостов на пост (вместе с `include=subposts`, максимум 100).",
+    ),
+  ],
   "responses":{
       200: OpenApiResponse(description="Список постов с пагинацией"),
   },
@@ -26,6 +79,25 @@ RETRIEVE_POST_DOCS = {
     "Возвращает данные одного поста по его ID.\n\n"
     "Если субпост с указанным идентификатором не найден - будет возвращена ошибка 404."
   ),
+  "parameters": [
+    OpenApiParameter(
+      name="include",
+      type=OpenApiTypes.STR,
+      location=OpenApiParameter.QUERY,
+      required=False,
+      description=(
+        "Через запятую: `subposts` - встроить субпосты поста в поле `subposts`, "
+        "`liked_by_me` - флаг лайка текущего пользователя в поле `liked_by_me`."
+      ),
+    ),
+    OpenApiParameter(
+      name="subposts_limit",
+      type=OpenApiTypes.INT,
+      location=OpenApiParameter.QUERY,
+      required=False,
+      description="Не больше N субпостов на пост (вместе с `include=subposts`, максимум 100).",
+    ),
+  ],
   "responses": {
     200: OpenApiResponse(
       description="Субпост успешно найден",
@@ -61,10 +133,17 @@ CREATE_POST_DOCS = {
   "description": (
     "Метод создаёт новый пост или несколько постов за один запрос.\n\n"
     "- Если передаётся список объектов - происходит массовое создание.\n"
-    "- Если объект содержит поле `subposts` (список), создаётся пост с вложенными субпостами в одной транзакции.\n\n"
+    "- Если объект содержит поле `subposts` (список), создаётся пост с вложенными субпостами в одной транзакции.\n"
+    "- `Content-Type: application/x-ndjson` - потоковый импорт: один пост на строку. "
+    "Строки обрабатываются чанками (`?chunk_size=`, запись `bulk_create` с `?batch_size=`), "
+    "каждый чанк - отдельная транзакция. В ответе сводка по чанкам с индексами ошибочных строк "
+    "(201 - без ошибок, 207 - часть строк не прошла валидацию).\n\n"
     "Если данные некорректны - возвращается 400 с деталями ошибок."
   ),
-  "request": {"application/json": OpenApiTypes.ANY},
+  "request": {
+    "application/json": OpenApiTypes.ANY,
+    "application/x-ndjson": OpenApiTypes.STR,
+  },
   "examples": [
     OpenApiExample(
       "Одиночный пост",
@@ -296,6 +375,105 @@ PARTIAL_UPDATE_POST_DOCS = {
 }
 
 
+BULK_UPDATE_POSTS_DOCS = {
+  "operation_id": "posts_bulk_update",
+  "summary": "Массово обновить посты",
+  "description": (
+    "`PATCH /api/posts/` - частичное обновление нескольких постов за один запрос.\n\n"
+    "- Тело - список объектов `{id, ...поля}`; меняются только переданные поля.\n"
+    "- Владелец проверяется для всего набора одним запросом.\n"
+    "- Все изменения - в одной транзакции: при ошибке не сохраняется ничего.\n\n"
+    "**Правила:**\n"
+    "- Ошибки валидации - 400, `errors` по индексам элементов списка.\n"
+    "- Если хотя бы один пост не найден - 404, если чужой - 403."
+  ),
+  "request": {"application/json": OpenApiTypes.ANY},
+  "examples": [
+    OpenApiExample(
+      "Массовое обновление",
+      value=[
+        {"id": 1, "title": "Новый заголовок"},
+        {"id": 2, "body": "Новый текст"},
+      ],
+      media_type="application/json",
+    ),
+  ],
+  "responses": {
+    200: OpenApiResponse(description="Список обновлённых постов"),
+    400: OpenApiResponse(
+      description="Ошибка валидации данных",
+      examples=[
+        OpenApiExample(
+          "Ошибка в элементе списка",
+          value={"errors": {"1": {"title": ["Это поле не может быть пустым."]}}},
+          media_type="application/json",
+        )
+      ],
+    ),
+    403: OpenApiResponse(description="Среди постов есть чужие"),
+    404: OpenApiResponse(description="Среди постов есть несуществующие"),
+  },
+  "tags": ["Посты"]
+}
+
+PATCH_SUBPOSTS_DOCS = {
+  "operation_id": "posts_subposts_patch",
+  "summary": "Изменить субпосты поста операциями",
+  "description": (
+    "`PATCH /api/posts/{id}/subposts/` - изменения субпостов без передачи всего списка.\n\n"
+    "- `add` - новый субпост (`title`, `body`).\n"
+    "- `update` - изменить `title` и/или `body` субпоста `id`.\n"
+    "- `remove` - удалить субпост `id`.\n"
+    "- `move` - переставить субпост `id`.\n\n"
+    "Место для `add` и `move` - `after`: id субпоста, после которого встать; "
+    "`null` - в начало; не передан - в конец. Субпосты отдаются в этом порядке "
+    "(`?include=subposts`, `GET /api/subposts/?post=id`).\n\n"
+    "**Правила:**\n"
+    "- Операции выполняются по порядку, все - в одной транзакции: при ошибке не сохраняется ничего.\n"
+    "- Изменять субпосты может только автор поста - иначе 403.\n"
+    "- `id` и `after` - только субпосты этого поста, иначе 400.\n"
+    "- Не больше 1000 операций за запрос."
+  ),
+  "request": SubPostPatchSerializer,
+  "examples": [
+    OpenApiExample(
+      "Операции",
+      value={
+        "operations": [
+          {"op": "add", "title": "Новый", "body": "Текст", "after": 12},
+          {"op": "update", "id": 15, "body": "Исправленный текст"},
+          {"op": "move", "id": 20, "after": None},
+          {"op": "remove", "id": 21},
+        ]
+      },
+      media_type="application/json",
+    ),
+  ],
+  "responses": {
+    200: OpenApiResponse(
+      description="id субпостов по операциям (у add - id созданного)",
+      examples=[
+        OpenApiExample(
+          "Результат",
+          value={
+            "operations": [
+              {"op": "add", "id": 31},
+              {"op": "update", "id": 15},
+              {"op": "move", "id": 20},
+              {"op": "remove", "id": 21},
+            ]
+          },
+          media_type="application/json",
+        )
+      ],
+    ),
+    400: OpenApiResponse(description="Ошибка в операциях или субпост не из этого поста"),
+    403: OpenApiResponse(description="Пост другого автора"),
+    404: OpenApiResponse(description="Пост не найден"),
+  },
+  "tags": ["Посты"]
+}
+
 DELETE_POST_DOCS = {
   "summary": "Удалить пост",
   "description": (
@@ -358,3 +536,144 @@ ADD_VIEW_DOCS = {
   },
   "tags": ["Просмотр"]
 }
+
+
+CACHE_STATS_DOCS = {
+  "summary": "Статистика кэша постов",
+  "description": (
+    "Счётчики попаданий и промахов кэша ответов `GET /api/posts/` и "
+    "`GET /api/posts/{id}/`.\n\n"
+    "Доступно только администраторам."
+  ),
+  "responses": {
+    200: OpenApiResponse(
+      description="Счётчики кэша",
+      examples=[
+        OpenApiExample(
+          "Пример ответа",
+          value={
+            "enabled": True,
+            "alias": "default",
+            "backend": "django.core.cache.backends.locmem.LocMemCache",
+            "hits": 120,
+            "misses": 14
+          },
+          media_type="application/json",
+        )
+      ]
+    ),
+    403: OpenApiResponse(description="Нет прав администратора")
+  },
+  "tags": ["Посты"]
+}
+
+
+SEARCH_POSTS_DOCS = {
+  "summary": "Полнотекстовый поиск по постам и субпостам",
+  "description": (
+    "Ищет слова из `q` в заголовках и тексте постов и субпостов.\n\n"
+    "- Индекс SQLite FTS5, ранжирование bm25 (меньше `rank` - выше релевантность).\n"
+    "- Слова ищутся по префиксу: `пост` найдёт `постов`.\n"
+    "- `snippet` - фрагмент текста, совпадения в `<mark>`.\n"
+    "- `subpost` - id субпоста или `null`, если совпадение в самом посте."
+  ),
+  "parameters": [
+    OpenApiParameter(
+      name="q",
+      type=OpenApiTypes.STR,
+      location=OpenApiParameter.QUERY,
+      required=True,
+      description="Поисковый запрос",
+    ),
+    OpenApiParameter(
+      name="limit",
+      type=OpenApiTypes.INT,
+      location=OpenApiParameter.QUERY,
+      required=False,
+      description="Количество результатов (по умолчанию 20, максимум 100)",
+    ),
+  ],
+  "responses": {
+    200: OpenApiResponse(
+      description="Результаты поиска",
+      examples=[
+        OpenApiExample(
+          "Пример ответа",
+          value={
+            "q": "django",
+            "results": [
+              {
+                "post": 10,
+                "subpost": None,
+                "title": "Заметки о Django",
+                "snippet": "…пишем API на <mark>Django</mark> REST framework…",
+                "rank": -2.41
+              }
+            ]
+          },
+          media_type="application/json",
+        )
+      ]
+    ),
+    400: OpenApiResponse(description="Не передан параметр `q`"),
+  },
+  "tags": ["Посты"]
+}
+
+LIKES_STATE_DOCS = {
+  "summary": "Состояние лайков для списка постов",
+  "description": (
+    "Возвращает, какие из переданных постов лайкнул текущий пользователь.\n\n"
+    "- `ids` - id постов через запятую, не больше 100.\n"
+    "- Один запрос к БД на весь список.\n"
+    "- Несуществующие посты возвращаются как `false`."
+  ),
+  "parameters": [
+    OpenApiParameter(
+      name="ids",
+      type=OpenApiTypes.STR,
+      location=OpenApiParameter.QUERY,
+      required=True,
+      description="id постов через запятую, например `1,2,3`",
+    ),
+  ],
+  "responses": {
+    200: OpenApiResponse(
+      description="Флаги лайков по id поста",
+      examples=[
+        OpenApiExample(
+          "Пример ответа",
+          value={"liked": {"1": True, "2": False, "3": True}},
+          media_type="application/json",
+        )
+      ]
+    ),
+    400: OpenApiResponse(description="Не передан или некорректен параметр `ids`"),
+  },
+  "tags": ["Посты"]
+}
+
+TRENDING_POSTS_DOCS = {
+  "summary": "Популярные посты (trending)",
+  "description": (
+    "Посты с наибольшим рейтингом по недавним просмотрам и лайкам.\n\n"
+    "- Вклад активности затухает вдвое каждые `BLOG_TRENDING['HALF_LIFE']` секунд.\n"
+    "- Лайк весит больше просмотра (`LIKE_WEIGHT` / `VIEW_WEIGHT`).\n"
+    "- Рейтинг хранится в `PostScore` и пересчитывается командой "
+    "`python manage.py refresh_trending` только для постов с новой активностью: "
+    "свежие просмотры и лайки попадают в ленту после очередного запуска."
+  ),
+  "parameters": [
+    OpenApiParameter(
+      name="limit",
+      type=OpenApiTypes.INT,
+      location=OpenApiParameter.QUERY,
+      required=False,
+      description="Количество постов (по умолчанию 20, максимум 100)",
+    ),
+  ],
+  "responses": {
+    200: OpenApiResponse(description="Посты по убыванию рейтинга в поле `results`"),
+  },
+  "tags": ["Посты"]
+}
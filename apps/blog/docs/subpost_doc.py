@@ -20,8 +20,19 @@ LIST_SUBPOSTS_DOCS = {
   "description": (
     "Возвращает список всех постов.\n\n"
     "Результат может быть отфильтрован и пагинирован.\n"
-    "Каждый элемент содержит подробную информацию о посте."
+    "Каждый элемент содержит подробную информацию о посте.\n\n"
+    "- `?post=id` - только субпосты поста, в порядке поста (`position`, затем `id`): "
+    "новые - в конце, порядок меняет `PATCH /api/posts/{id}/subposts/`."
   ),
+  "parameters": [
+    OpenApiParameter(
+      name="post",
+      type=OpenApiTypes.INT,
+      location=OpenApiParameter.QUERY,
+      required=False,
+      description="ID поста: только его субпосты",
+    ),
+  ],
   "responses": {
     200: OpenApiResponse(
       description="Возвращается все субпосты",
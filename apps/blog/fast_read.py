@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from apps.blog.pagination import apaginate_queryset
+
+
+DEFAULT_FAST_READ = {
+  'ENABLED': True,
+}
+
+
+def get_fast_read_settings():
+  return {**DEFAULT_FAST_READ, **getattr(settings, 'BLOG_FAST_READ', {})}
+
+
+class FastReadMixin:
+  """
+  list/retrieve через .values() и ValuesSerializer вместо ModelSerializer
+
+  Модели и поля DRF не создаются: строка БД сразу превращается в dict
+  ответа. Пагинация, ETag и кэш ответов работают как обычно - меняется
+  только источник данных. Вьюсет может отключить быстрый путь для
+  отдельных запросов через use_fast_read() (например, при prefetch).
+
+  alist/aretrieve - то же на async ORM (AsyncReadView, /api/async/).
+  """
+  fast_read_serializer_class = None
+
+  def use_fast_read(self):
+    return self.fast_read_serializer_class is not None and get_fast_read_settings()['ENABLED']
+
+  def use_async_read(self):
+    """False - async-эндпоинт вызывает синхронный list/retrieve в потоке"""
+    return self.use_fast_read()
+
+  def get_fast_read_serializer(self):
+    return self.fast_read_serializer_class(context=self.get_serializer_context())
+
+  def list(self, request, *args, **kwargs):
+    if not self.use_fast_read():
+      return super().list(request, *args, **kwargs)
+
+    serializer = self.get_fast_read_serializer()
+    queryset = self.filter_queryset(self.get_queryset()).values(*serializer.lookups)
+    page = self.paginate_queryset(queryset)
+    if page is not None:
+      return self.get_paginated_response(serializer.many(page))
+    return Response(serializer.many(queryset))
+
+  def retrieve(self, request, *args, **kwargs):
+    if not self.use_fast_read():
+      return super().retrieve(request, *args, **kwargs)
+
+    serializer = self.get_fast_read_serializer()
+    queryset = self.filter_queryset(self.get_queryset()).values(*serializer.lookups)
+    lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+    row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+    self.check_object_permissions(request, row)
+    return Response(serializer.to_representation(row))
+
+  async def apaginate_queryset(self, queryset):
+    if self.paginator is None:
+      return None
+    return await apaginate_queryset(self.paginator, queryset, self.request, view=self)
+
+  async def alist(self, request, *args, **kwargs):
+    serializer = self.get_fast_read_serializer()
+    queryset = self.filter_queryset(self.get_queryset()).values(*serializer.lookups)
+    page = await self.apaginate_queryset(queryset)
+    if page is not None:
+      return self.get_paginated_response(serializer.many(page))
+    return Response(serializer.many([row async for row in queryset]))
+
+  async def aretrieve(self, request, *args, **kwargs):
+    serializer = self.get_fast_read_serializer()
+    queryset = self.filter_queryset(self.get_queryset()).values(*serializer.lookups)
+    lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+    # Как rest_framework.generics.get_object_or_404
+    try:
+      row = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+    except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+      raise Http404
+    self.check_object_permissions(request, row)
+    return Response(serializer.to_representation(row))
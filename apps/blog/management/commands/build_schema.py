@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.schema import build_schema, get_schema_version, schema_path
+
+
+class Command(BaseCommand):
+  help = 'Сгенерировать файлы схемы OpenAPI для /api/schema/ (при деплое, до запуска воркеров)'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--force', action='store_true', help='Пересобрать, даже если файлы этой версии есть')
+
+  def handle(self, *args, **options):
+    version = get_schema_version()
+    if not options['force'] and schema_path(version, 'yaml').exists():
+      self.stdout.write(f'Схема версии {version} уже собрана')
+      return
+
+    for path in build_schema(version):
+      self.stdout.write(str(path))
+    self.stdout.write(self.style.SUCCESS(f'Схема версии {version} собрана'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.services import rebuild_likes_count
+
+
+class Command(BaseCommand):
+  help = 'Пересчитать Post.likes_count с нуля по таблице лайков'
+
+  def handle(self, *args, **options):
+    updated = rebuild_likes_count()
+    self.stdout.write(self.style.SUCCESS(f'Пересчитано постов: {updated}'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.blog.search import create_search_index, fts_supported, rebuild_search_index
+
+
+class Command(BaseCommand):
+  help = 'Перестроить полнотекстовый индекс (FTS5) постов и субпостов'
+
+  def handle(self, *args, **options):
+    if not fts_supported():
+      raise CommandError('FTS5 доступен только в SQLite с ENABLE_FTS5')
+    # Таблица и триггеры создаются, если их удалили вручную
+    create_search_index()
+    rows = rebuild_search_index()
+    self.stdout.write(self.style.SUCCESS(f'Строк в индексе: {rows}'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.trending import refresh_scores
+
+
+class Command(BaseCommand):
+  help = 'Пересчитать рейтинг trending для постов с новой активностью (запускать по расписанию)'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--batch-size', type=int, default=None, help='Постов за один bulk_update')
+
+  def handle(self, *args, **options):
+    refreshed = refresh_scores(batch_size=options['batch_size'])
+    self.stdout.write(self.style.SUCCESS(f'Пересчитано постов: {refreshed}'))
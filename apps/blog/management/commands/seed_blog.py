@@ -0,0 +1,241 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.blog.models import Like, Post, SubPost
+from apps.blog.search import index_new_rows, search_index_exists
+from apps.blog.subpost_patch import POSITION_STEP
+
+
+WORDS = (
+  'django python api пост субпост лайк просмотр кэш индекс запрос база '
+  'данных сервер клиент страница курсор поиск текст заголовок автор '
+  'свекла капуста борщ рецепт погода город горы озеро море река '
+  'быстро медленно память процессор сеть диск очередь поток задача'
+).split()
+
+SEED_TABLES = [Post._meta.db_table, SubPost._meta.db_table, Like._meta.db_table]
+
+
+def random_text(rng, words):
+  # Редкое слово ("тег123") - для избирательных поисковых запросов
+  text = rng.choices(WORDS, k=words)
+  text.append(f'тег{rng.randrange(10000)}')
+  return ' '.join(text)
+
+
+@contextmanager
+def disable_auto_now(*models):
+  """create_at / update_at берутся из объектов, а не из timezone.now()"""
+  fields = [
+    field for model in models for field in model._meta.fields
+    if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+  ]
+  saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+  for field in fields:
+    field.auto_now = field.auto_now_add = False
+  try:
+    yield
+  finally:
+    for field, auto_now, auto_now_add in saved:
+      field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def next_id(model):
+  return (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+
+@contextmanager
+def deferred_indexes():
+  """
+  Снять индексы и триггеры таблиц блога на время вставки (только SQLite)
+
+  Индексы строятся один раз по готовым данным вместо обновления на каждую
+  строку. Триггеры FTS тоже снимаются: новые строки добавляются в индекс
+  поиска одним INSERT ... SELECT в конце.
+  """
+  if connection.vendor != 'sqlite':
+    raise CommandError('--defer-indexes поддерживается только для SQLite')
+
+  placeholders = ', '.join(['%s'] * len(SEED_TABLES))
+  with connection.cursor() as cursor:
+    cursor.execute(
+      f"SELECT type, name, sql FROM sqlite_master "
+      f"WHERE type IN ('index', 'trigger') AND tbl_name IN ({placeholders}) AND sql IS NOT NULL",
+      SEED_TABLES
+    )
+    objects = cursor.fetchall()
+    for object_type, name, _ in objects:
+      cursor.execute(f'DROP {object_type.upper()} "{name}"')
+  post_min_id, subpost_min_id = next_id(Post), next_id(SubPost)
+  try:
+    yield
+  finally:
+    with connection.cursor() as cursor:
+      for _, _, sql in objects:
+        cursor.execute(sql)
+    if search_index_exists():
+      index_new_rows(post_min_id, subpost_min_id)
+
+
+class Command(BaseCommand):
+  help = 'Быстро наполнить базу синтетическими пользователями, постами, субпостами и лайками'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--users', type=int, default=100, help='Новых пользователей (0 - взять существующих)')
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--subposts-min', type=int, default=0, help='Субпостов на пост: минимум')
+    parser.add_argument('--subposts-max', type=int, default=4, help='Субпостов на пост: максимум')
+    parser.add_argument('--likes-per-post', type=float, default=3.0, help='Среднее количество лайков на пост')
+    parser.add_argument(
+      '--like-skew', type=float, default=1.2,
+      help='Показатель Ципфа: чем больше, тем сильнее лайки сосредоточены на немногих постах'
+    )
+    parser.add_argument('--days', type=int, default=365, help='Посты равномерно за последние N дней')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='Постов в одной транзакции')
+    parser.add_argument('--batch-size', type=int, default=5000, help='batch_size для bulk_create')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--defer-indexes', action='store_true', help='Создать индексы после вставки (SQLite)')
+
+  def handle(self, *args, **options):
+    if options['subposts_min'] > options['subposts_max']:
+      raise CommandError('--subposts-min больше --subposts-max')
+
+    self.rng = random.Random(options['seed'])
+    self.options = options
+    self.counts = {'users': 0, 'posts': 0, 'subposts': 0, 'likes': 0}
+    started = time.perf_counter()
+
+    user_ids = self.create_users(options['users'])
+    if not user_ids:
+      raise CommandError('Нет пользователей: укажите --users')
+
+    if options['defer_indexes']:
+      with deferred_indexes():
+        self.create_posts(user_ids)
+      self.log('Индексы созданы', started)
+    else:
+      self.create_posts(user_ids)
+
+    # Явные id: последовательности (PostgreSQL) нужно догнать
+    with connection.cursor() as cursor:
+      for sql in connection.ops.sequence_reset_sql(no_style(), [Post, SubPost, Like]):
+        cursor.execute(sql)
+
+    elapsed = time.perf_counter() - started
+    total = sum(self.counts.values())
+    for name, count in self.counts.items():
+      self.stdout.write(f'{name}: {count}')
+    self.stdout.write(self.style.SUCCESS(
+      f'Строк: {total} за {elapsed:.1f} с ({total / elapsed:,.0f} строк/с)'
+    ))
+
+  def log(self, message, started):
+    if self.options['verbosity'] > 1:
+      elapsed = time.perf_counter() - started
+      rows = sum(self.counts.values())
+      self.stdout.write(f'{message}: {rows} строк, {elapsed:.1f} с, {rows / elapsed:,.0f} строк/с')
+
+  def create_users(self, count):
+    if not count:
+      return list(User.objects.values_list('id', flat=True))
+
+    # Хэш пароля считается один раз: make_password на каждого - минуты CPU
+    password = make_password('Seed_UseR_1_Password')
+    start = next_id(User)
+    users = [
+      User(id=start + i, username=f'seed_user_{start + i}', password=password)
+      for i in range(count)
+    ]
+    with transaction.atomic():
+      User.objects.bulk_create(users, batch_size=self.options['batch_size'])
+    with connection.cursor() as cursor:
+      for sql in connection.ops.sequence_reset_sql(no_style(), [User]):
+        cursor.execute(sql)
+    self.counts['users'] = count
+    return [user.id for user in users]
+
+  def get_like_counts(self, posts, users):
+    """
+    Лайков на пост по закону Ципфа: ранги постов перемешаны, на пост
+    не больше, чем пользователей (один лайк от пользователя)
+    """
+    total = posts * self.options['likes_per_post']
+    ranks = list(range(1, posts + 1))
+    self.rng.shuffle(ranks)
+    skew = self.options['like_skew']
+    norm = sum(rank ** -skew for rank in range(1, posts + 1))
+    return [
+      # Случайное округление: сумма близка к total
+      min(users, int(total * rank ** -skew / norm + self.rng.random()))
+      for rank in ranks
+    ]
+
+  def create_posts(self, user_ids):
+    options = self.options
+    posts = options['posts']
+    if not posts:
+      return
+
+    started = time.perf_counter()
+    like_counts = self.get_like_counts(posts, len(user_ids))
+    next_ids = {model: next_id(model) for model in (Post, SubPost, Like)}
+    now = timezone.now()
+    first = now - timedelta(days=options['days'])
+    step = (now - first) / posts
+
+    with disable_auto_now(Post, SubPost):
+      for chunk_start in range(0, posts, options['chunk_size']):
+        chunk_end = min(posts, chunk_start + options['chunk_size'])
+        post_objs, subpost_objs, like_objs = [], [], []
+
+        for index in range(chunk_start, chunk_end):
+          post_id = next_ids[Post] + index
+          create_at = first + step * index
+          likes = like_counts[index]
+          views = likes * self.rng.randint(5, 50) + self.rng.randint(0, 20)
+          post_objs.append(Post(
+            id=post_id,
+            author_id=self.rng.choice(user_ids),
+            title=random_text(self.rng, 5),
+            body=random_text(self.rng, 60),
+            create_at=create_at,
+            update_at=create_at,
+            views_count=views,
+            likes_count=likes,
+            activity_at=create_at if views or likes else None,
+          ))
+          for _ in range(self.rng.randint(options['subposts_min'], options['subposts_max'])):
+            subpost_objs.append(SubPost(
+              id=next_ids[SubPost],
+              post_id=post_id,
+              title=random_text(self.rng, 4),
+              body=random_text(self.rng, 40),
+              create_at=create_at,
+              update_at=create_at,
+              # Как в миграции 0006: по id с зазором
+              position=next_ids[SubPost] * POSITION_STEP,
+            ))
+            next_ids[SubPost] += 1
+          for user_id in self.rng.sample(user_ids, likes):
+            like_objs.append(Like(id=next_ids[Like], user_id=user_id, post_id=post_id))
+            next_ids[Like] += 1
+
+        with transaction.atomic():
+          Post.objects.bulk_create(post_objs, batch_size=options['batch_size'])
+          SubPost.objects.bulk_create(subpost_objs, batch_size=options['batch_size'])
+          Like.objects.bulk_create(like_objs, batch_size=options['batch_size'])
+
+        self.counts['posts'] += len(post_objs)
+        self.counts['subposts'] += len(subpost_objs)
+        self.counts['likes'] += len(like_objs)
+        self.log(f'Посты {chunk_end}/{posts}', started)
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from apps.blog.search import create_search_index, drop_search_index, fts_supported, rebuild_search_index
+
+
+def create_index(apps, schema_editor):
+    # FTS5 есть только в SQLite; на других базах поиск идет через icontains
+    if not fts_supported(schema_editor.connection):
+        return
+    create_search_index(schema_editor.connection)
+    rebuild_search_index(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_likes_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.10 on 2026-10-18 14:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import F, Q
+
+
+def mark_active_posts(apps, schema_editor):
+    # Первый refresh_trending учтет уже накопленные просмотры и лайки
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(Q(views_count__gt=0) | Q(likes_count__gt=0)).update(activity_at=F('update_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score', serialize=False, to='blog.post')),
+                ('score', models.FloatField(db_index=True, null=True)),
+                ('views_seen', models.PositiveIntegerField(default=0)),
+                ('likes_seen', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Рейтинг поста',
+                'verbose_name_plural': 'Рейтинги постов',
+            },
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='activity_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(mark_active_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.10 on 2026-10-18 14:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from apps.blog.search import create_search_index, search_index_exists
+
+
+def restore_search_triggers(apps, schema_editor):
+    # SQLite пересоздает blog_post и blog_subpost при AlterField - вместе с триггерами FTS
+    if search_index_exists(schema_editor.connection):
+        create_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0004_trending'),
+    ]
+
+    operations = [
+        # При откате выполняется последней
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AlterField(
+            model_name='post',
+            name='author',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='posts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='subpost',
+            name='post',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sub_posts', to='blog.post'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['create_at', 'id'], name='blog_post_create_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', 'create_at', 'id'], name='blog_post_author_create_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subpost',
+            index=models.Index(fields=['post', 'create_at', 'id'], name='blog_subpost_post_create_idx'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
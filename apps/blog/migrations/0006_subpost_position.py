@@ -0,0 +1,49 @@
+# Generated by Django 4.2.10 on 2026-10-18 14:51
+
+from django.db import migrations, models
+from django.db.models import F
+
+from apps.blog.search import create_search_index, search_index_exists
+
+
+# POSITION_STEP (apps/blog/subpost_patch.py) на момент миграции
+POSITION_STEP = 1024
+
+
+def restore_search_triggers(apps, schema_editor):
+    # SQLite пересоздает blog_subpost при AddField с default - вместе с триггерами FTS
+    if search_index_exists(schema_editor.connection):
+        create_search_index(schema_editor.connection)
+
+
+def fill_positions(apps, schema_editor):
+    # Порядок id совпадает с прежним порядком по create_at; один UPDATE на таблицу
+    SubPost = apps.get_model('blog', 'SubPost')
+    SubPost.objects.update(position=F('id') * POSITION_STEP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_indexes'),
+    ]
+
+    operations = [
+        # При откате выполняется последней
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.RemoveIndex(
+            model_name='subpost',
+            name='blog_subpost_post_create_idx',
+        ),
+        migrations.AddField(
+            model_name='subpost',
+            name='position',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_positions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='subpost',
+            index=models.Index(fields=['post', 'position', 'id'], name='blog_subpost_post_position_idx'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
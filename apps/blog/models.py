@@ -5,16 +5,30 @@ class Post(models.Model):
   class Meta:
     verbose_name = 'Пост'
     verbose_name_plural = 'Посты'
+    indexes = [
+      # Лента от новых к старым (PostCursorPagination)
+      models.Index(fields=['create_at', 'id'], name='blog_post_create_at_idx'),
+      # Посты автора (?author=) в порядке ленты
+      models.Index(fields=['author', 'create_at', 'id'], name='blog_post_author_create_idx'),
+    ]
 
+  # Отдельный индекс не нужен: author - префикс blog_post_author_create_idx
   author = models.ForeignKey(
     User, 
     on_delete=models.CASCADE, 
-    related_name='posts')
+    related_name='posts',
+    db_index=False)
   title = models.CharField(max_length=250)
   body = models.TextField()
   create_at = models.DateTimeField(auto_now_add=True)
   update_at = models.DateTimeField(auto_now=True)
   views_count = models.PositiveIntegerField(default=0)
+  # Денормализованный счетчик, обновляется в LikeViewSet.like
+  # Пересчитать: python manage.py rebuild_likes_count
+  likes_count = models.PositiveIntegerField(default=0)
+  # Последний просмотр или лайк: refresh_trending пересчитывает
+  # только посты с активностью после прошлого запуска
+  activity_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
   def __str__(self):
     return f"{self.title} {self.author}"
@@ -24,15 +38,24 @@ class SubPost(models.Model):
   class Meta:
     verbose_name = 'Подпост'
     verbose_name_plural = 'Подпосты'
+    indexes = [
+      # Субпосты поста по порядку (?post=, ?include=subposts, PATCH /posts/{id}/subposts/)
+      models.Index(fields=['post', 'position', 'id'], name='blog_subpost_post_position_idx'),
+    ]
 
+  # Отдельный индекс не нужен: post - префикс blog_subpost_post_position_idx
   post = models.ForeignKey(
     Post, 
     on_delete=models.CASCADE, 
-    related_name='sub_posts')
+    related_name='sub_posts',
+    db_index=False)
   title = models.CharField(max_length=250)
   body = models.TextField()
   create_at = models.DateTimeField(auto_now_add=True)
   update_at = models.DateTimeField(auto_now=True)
+  # Порядок в посте (затем id): шаг POSITION_STEP, вставка между соседями -
+  # середина зазора без сдвига остальных (apps/blog/subpost_patch.py)
+  position = models.BigIntegerField(default=0)
   
 
 class Like(models.Model):
@@ -50,4 +73,29 @@ class Like(models.Model):
     Post, 
     on_delete=models.CASCADE, 
     related_name='likes')
-  create_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+  create_at = models.DateTimeField(auto_now_add=True)
+
+
+class PostScore(models.Model):
+  """
+  Рейтинг поста для ленты trending (python manage.py refresh_trending)
+
+  score - log2 суммы весов просмотров и лайков, каждый со множителем
+  2 ** (t / HALF_LIFE). Со временем множитель у всех постов растет
+  одинаково, поэтому старая активность "затухает" относительно новой
+  без пересчета всей таблицы.
+  """
+  class Meta:
+    verbose_name = 'Рейтинг поста'
+    verbose_name_plural = 'Рейтинги постов'
+
+  post = models.OneToOneField(
+    Post,
+    on_delete=models.CASCADE,
+    primary_key=True,
+    related_name='score')
+  score = models.FloatField(null=True, db_index=True)
+  # Значения счетчиков поста на момент последнего пересчета
+  views_seen = models.PositiveIntegerField(default=0)
+  likes_seen = models.PositiveIntegerField(default=0)
+  refreshed_at = models.DateTimeField(db_index=True)
@@ -1,4 +1,195 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
 
 class PostPagination(PageNumberPagination):
-  page_size = 3
\ No newline at end of file
+  page_size = 3
+
+
+async def apaginate_queryset(paginator, queryset, request, view=None):
+  """
+  paginate_queryset для async ORM
+
+  PageNumberPagination: COUNT и страница через acount() и async for,
+  остальное (номер страницы, ссылки, ошибки) - как в DRF. Свой
+  apaginate_queryset у пагинатора - он; иначе синхронный в потоке.
+  """
+  if hasattr(paginator, 'apaginate_queryset'):
+    return await paginator.apaginate_queryset(queryset, request, view)
+  if not isinstance(paginator, PageNumberPagination):
+    return await sync_to_async(paginator.paginate_queryset)(queryset, request, view)
+
+  paginator.request = request
+  page_size = paginator.get_page_size(request)
+  if not page_size:
+    return None
+
+  django_paginator = paginator.django_paginator_class(queryset, page_size)
+  # count - cached_property: считаем заранее, page() его не пересчитает
+  django_paginator.count = await queryset.acount()
+  page_number = paginator.get_page_number(request, django_paginator)
+  try:
+    page = django_paginator.page(page_number)
+  except InvalidPage as exc:
+    msg = paginator.invalid_page_message.format(page_number=page_number, message=str(exc))
+    raise NotFound(msg)
+  page.object_list = [item async for item in page.object_list]
+
+  paginator.page = page
+  if django_paginator.num_pages > 1 and paginator.template is not None:
+    paginator.display_page_controls = True
+  return list(page)
+
+
+class PostCursorPagination(BasePagination):
+  """
+  Keyset-пагинация по (create_at, id): от новых постов к старым.
+
+  Курсор - непрозрачная base64-строка с ключом последней (или первой)
+  строки страницы. Страница N стоит столько же, сколько первая:
+  нет OFFSET и COUNT(*). Новые посты попадают в начало ленты и не
+  сдвигают уже выданные страницы - дублей и пропусков нет.
+  """
+  page_size = PostPagination.page_size
+  cursor_query_param = 'cursor'
+  ordering = ('-create_at', '-id')
+  invalid_cursor_message = 'Некорректный курсор'
+
+  def paginate_queryset(self, queryset, request, view=None):
+    queryset, position, reverse = self.get_page_queryset(queryset, request)
+    # Берем на одну запись больше: так узнаем, есть ли следующая страница
+    return self.set_page(list(queryset[:self.page_size + 1]), position, reverse)
+
+  async def apaginate_queryset(self, queryset, request, view=None):
+    queryset, position, reverse = self.get_page_queryset(queryset, request)
+    return self.set_page([item async for item in queryset[:self.page_size + 1]], position, reverse)
+
+  def get_page_queryset(self, queryset, request):
+    """
+    :return: (queryset страницы без LIMIT, позиция курсора, reverse)
+    """
+    self.request = request
+    self.base_url = request.build_absolute_uri()
+    self.has_next = False
+    self.has_previous = False
+
+    position, reverse = self.decode_cursor(request)
+    if position is None:
+      queryset = queryset.order_by(*self.ordering)
+    else:
+      create_at, pk = position
+      if reverse:
+        queryset = queryset.filter(
+          Q(create_at__gt=create_at) | Q(create_at=create_at, id__gt=pk)
+        ).order_by('create_at', 'id')
+      else:
+        queryset = queryset.filter(
+          Q(create_at__lt=create_at) | Q(create_at=create_at, id__lt=pk)
+        ).order_by(*self.ordering)
+    return queryset, position, reverse
+
+  def set_page(self, results, position, reverse):
+    has_more = len(results) > self.page_size
+    results = results[:self.page_size]
+
+    if reverse:
+      results.reverse()
+      self.has_previous = has_more
+      self.has_next = True
+    else:
+      self.has_next = has_more
+      self.has_previous = position is not None
+
+    self.page = results
+    return results
+
+  def get_paginated_response(self, data):
+    return Response({
+      'next': self.get_next_link(),
+      'previous': self.get_previous_link(),
+      'results': data,
+    })
+
+  def get_paginated_response_schema(self, schema):
+    return {
+      'type': 'object',
+      'required': ['results'],
+      'properties': {
+        'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+        'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+        'results': schema,
+      },
+    }
+
+  def get_next_link(self):
+    if not self.has_next or not self.page:
+      return None
+    return self.build_link(self.page[-1], reverse=False)
+
+  def get_previous_link(self):
+    if not self.has_previous or not self.page:
+      return None
+    return self.build_link(self.page[0], reverse=True)
+
+  def build_link(self, item, reverse):
+    cursor = self.encode_cursor(
+      self.get_item_value(item, 'create_at'),
+      self.get_item_value(item, 'id'),
+      reverse
+    )
+    return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+  def get_item_value(self, item, name):
+    if isinstance(item, dict):
+      return item[name]
+    return getattr(item, name)
+
+  def encode_cursor(self, create_at, pk, reverse):
+    payload = {'t': create_at.isoformat(), 'i': pk}
+    if reverse:
+      payload['r'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode('ascii')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+  def decode_cursor(self, request):
+    """
+    :return: ((create_at, id), reverse) или (None, False) для первой страницы
+    """
+    encoded = request.query_params.get(self.cursor_query_param)
+    if not encoded:
+      return None, False
+
+    try:
+      payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+      create_at = parse_datetime(payload['t'])
+      pk = int(payload['i'])
+      reverse = bool(payload.get('r'))
+    except (TypeError, ValueError, KeyError, AttributeError, binascii.Error):
+      raise NotFound(self.invalid_cursor_message)
+
+    # id вне BIGINT до БД не доходит (OverflowError в драйвере)
+    if create_at is None or not -2 ** 63 <= pk < 2 ** 63:
+      raise NotFound(self.invalid_cursor_message)
+    return (create_at, pk), reverse
+
+  def get_schema_operation_parameters(self, view):
+    return [
+      {
+        'name': self.cursor_query_param,
+        'required': False,
+        'in': 'query',
+        'description': 'Курсор страницы (значение из next/previous)',
+        'schema': {'type': 'string'},
+      },
+    ]
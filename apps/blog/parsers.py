@@ -0,0 +1,92 @@
+import io
+import json
+
+from django.conf import settings
+
+from rest_framework.parsers import BaseParser, JSONParser
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
+
+DEFAULT_NDJSON_IMPORT = {
+  'CHUNK_SIZE': 500,
+  'MAX_CHUNK_SIZE': 5000,
+  'BATCH_SIZE': 500,
+}
+
+
+def get_ndjson_import_settings():
+  return {**DEFAULT_NDJSON_IMPORT, **getattr(settings, 'BLOG_NDJSON_IMPORT', {})}
+
+
+def is_utf8(encoding):
+  return encoding.lower().replace('_', '-') in ('utf-8', 'utf8')
+
+
+def loads(raw, encoding):
+  """JSON из байтов: orjson для UTF-8, если установлен, иначе json"""
+  if orjson is not None and is_utf8(encoding):
+    try:
+      return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+      # Ошибку (и то, что orjson не принимает, но принимает json) - как у json
+      pass
+  return json.loads(raw.decode(encoding))
+
+
+class FastJSONParser(JSONParser):
+  """
+  JSONParser на orjson, если он установлен
+
+  Тело читается целиком и разбирается orjson (только UTF-8). Если
+  orjson не справился - разбор stdlib json как у JSONParser: тот же
+  ParseError, NaN/Infinity по STRICT_JSON.
+  """
+  def parse(self, stream, media_type=None, parser_context=None):
+    parser_context = parser_context or {}
+    encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+    if orjson is None or not is_utf8(encoding):
+      return super().parse(stream, media_type, parser_context)
+
+    raw = stream.read()
+    try:
+      return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+      return super().parse(io.BytesIO(raw), media_type, parser_context)
+
+
+class InvalidLine:
+  """Строка NDJSON, которую не удалось разобрать"""
+  def __init__(self, message):
+    self.message = message
+
+
+class NDJSONParser(BaseParser):
+  """
+  application/x-ndjson: один JSON-объект на строку
+
+  Возвращает генератор, а не список: строки читаются из потока по мере
+  обработки, весь запрос в память не загружается. Ошибочная строка не
+  прерывает разбор - вместо объекта отдается InvalidLine.
+  """
+  media_type = 'application/x-ndjson'
+
+  def parse(self, stream, media_type=None, parser_context=None):
+    parser_context = parser_context or {}
+    encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+    if stream is None:
+      return iter(())
+    return self.iter_lines(stream, encoding)
+
+  def iter_lines(self, stream, encoding):
+    for raw in iter(stream.readline, b''):
+      line = raw.strip()
+      if not line:
+        continue
+      try:
+        yield loads(line, encoding)
+      except (ValueError, UnicodeDecodeError) as exc:
+        yield InvalidLine(f'Некорректный JSON: {exc}')
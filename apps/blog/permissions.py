@@ -0,0 +1,19 @@
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+
+
+class IsAuthorOrReadOnly(BasePermission):
+  """
+  Изменять и удалять объект может только автор поста
+
+  Сравниваются id, User не загружается: у поста - author_id, у
+  других объектов - атрибут из author_id_attr вьюсета (например,
+  аннотация с автором поста). На чтение проверки нет: obj может
+  быть строкой .values() (apps/blog/fast_read.py).
+  """
+  message = 'Доступ ограничен: вы не автор поста'
+
+  def has_object_permission(self, request, view, obj):
+    if request.method in SAFE_METHODS:
+      return True
+    author_id = getattr(obj, getattr(view, 'author_id_attr', 'author_id'))
+    return author_id == request.user.id
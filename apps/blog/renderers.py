@@ -0,0 +1,43 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
+
+if orjson is not None:
+  # Даты, dataclass - через encoder_class DRF (формат дат DRF, а не orjson);
+  # ключи не-строки - как у json.dumps
+  ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+class FastJSONRenderer(JSONRenderer):
+  """
+  JSONRenderer на orjson, если он установлен
+
+  Вывод совпадает с JSONRenderer: компактные разделители, кириллица
+  без \\u-экранирования, \\u2028/\\u2029 экранированы, типы вне JSON
+  (даты, Decimal, ленивые строки) идут через encoder_class.
+  Отступ (?indent, Browsable API), ensure_ascii или ошибка orjson
+  (например, int больше 64 бит) - рендер stdlib json как у DRF.
+  Отличия:
+  - NaN/Infinity orjson пишет как null, а не падает по STRICT_JSON;
+  - float с экспонентой записывается короче (1e-6 вместо 1e-06, 1e20
+    вместо 1e+20, например rank в /search/): значение то же, байты нет.
+  """
+  def render(self, data, accepted_media_type=None, renderer_context=None):
+    if orjson is None or data is None or self.ensure_ascii or not self.compact:
+      return super().render(data, accepted_media_type, renderer_context)
+    if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+      return super().render(data, accepted_media_type, renderer_context)
+
+    try:
+      ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+      return super().render(data, accepted_media_type, renderer_context)
+
+    # Как в JSONRenderer: JSON должен оставаться подмножеством JavaScript
+    if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+      ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return ret
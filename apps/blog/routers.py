@@ -0,0 +1,14 @@
+from rest_framework.routers import DefaultRouter
+
+
+class BulkRouter(DefaultRouter):
+  """
+  DefaultRouter + PATCH на маршруте списка -> действие bulk_update
+
+  Метод попадает в маршрут, только если у ViewSet есть bulk_update.
+  """
+  routes = [
+    route._replace(mapping={**route.mapping, 'patch': 'bulk_update'})
+    if route.name == '{basename}-list' else route
+    for route in DefaultRouter.routes
+  ]
@@ -0,0 +1,158 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from importlib.metadata import version as package_version
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.http import parse_etags, quote_etag
+
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+
+DEFAULT_SCHEMA_CACHE = {
+  # Каталог файлов схемы
+  'DIR': Path(tempfile.gettempdir()) / 'blog_schema',
+  # Версия кода: None - хэш исходников (get_code_version)
+  'VERSION': None,
+}
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+# От этих исходников зависит схема: вьюсеты, сериализаторы, docs, urls, настройки
+SOURCE_DIRS = ('apps', 'config')
+SKIP_DIRS = {'tests', 'migrations', '__pycache__'}
+PACKAGES = ('django', 'djangorestframework', 'drf-spectacular')
+
+RENDERERS = {
+  renderer.format: renderer for renderer in (OpenApiYamlRenderer, OpenApiJsonRenderer)
+}
+
+_build_lock = threading.Lock()
+# (версия, формат, gzip) -> байты: файл читается один раз на процесс
+_loaded = {}
+
+
+def get_schema_cache_settings():
+  return {**DEFAULT_SCHEMA_CACHE, **getattr(settings, 'BLOG_SCHEMA_CACHE', {})}
+
+
+@lru_cache(maxsize=None)
+def get_code_version():
+  """
+  Хэш исходников apps/ и config/ (без тестов и миграций), версий
+  Django/DRF/drf-spectacular и SPECTACULAR_SETTINGS. Считается один раз
+  на процесс: код меняется только с перезапуском.
+  """
+  digest = hashlib.sha256()
+  for source_dir in SOURCE_DIRS:
+    for path in sorted((ROOT / source_dir).rglob('*.py')):
+      if SKIP_DIRS.intersection(path.relative_to(ROOT).parts):
+        continue
+      digest.update(path.relative_to(ROOT).as_posix().encode())
+      digest.update(path.read_bytes())
+  for package in PACKAGES:
+    digest.update(f'{package}=={package_version(package)}'.encode())
+  digest.update(repr(sorted(getattr(settings, 'SPECTACULAR_SETTINGS', {}).items())).encode())
+  return digest.hexdigest()[:16]
+
+
+def get_schema_version():
+  return get_schema_cache_settings()['VERSION'] or get_code_version()
+
+
+def schema_path(version, schema_format, compressed=False):
+  name = f'openapi-{version}.{schema_format}'
+  if compressed:
+    name += '.gz'
+  return Path(get_schema_cache_settings()['DIR']) / name
+
+
+def write_atomic(path, content):
+  # Параллельные воркеры не увидят недописанный файл
+  handle, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+  with os.fdopen(handle, 'wb') as file:
+    file.write(content)
+  os.replace(tmp_path, path)
+
+
+def build_schema(version=None):
+  """
+  Сгенерировать схему и записать файлы yaml / json (+ .gz) для версии
+
+  Файлы других версий удаляются.
+  :return: Список записанных путей
+  """
+  version = version or get_schema_version()
+  directory = Path(get_schema_cache_settings()['DIR'])
+  directory.mkdir(parents=True, exist_ok=True)
+
+  generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+  schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+
+  paths = []
+  for schema_format, renderer_class in RENDERERS.items():
+    content = renderer_class().render(schema, renderer_context={})
+    for compressed, data in ((False, content), (True, gzip.compress(content, mtime=0))):
+      path = schema_path(version, schema_format, compressed)
+      write_atomic(path, data)
+      paths.append(path)
+
+  for path in directory.glob('openapi-*'):
+    if path not in paths:
+      path.unlink(missing_ok=True)
+  return paths
+
+
+def load_schema(schema_format, compressed):
+  """Байты схемы текущей версии: генерация при первом обращении"""
+  version = get_schema_version()
+  key = (version, schema_format, compressed)
+  if key not in _loaded:
+    path = schema_path(version, schema_format, compressed)
+    if not path.exists():
+      with _build_lock:
+        if not path.exists():
+          build_schema(version)
+    _loaded[key] = path.read_bytes()
+  return version, _loaded[key]
+
+
+class CachedSchemaView(SpectacularAPIView):
+  """
+  /api/schema/ из готового файла вместо генерации на каждый запрос
+
+  Формат (yaml / json) выбирается как у SpectacularAPIView. Файлы
+  пишет build_schema (python manage.py build_schema) или первый запрос
+  после изменения кода. ETag - версия кода и формат: If-None-Match
+  дает 304; Accept-Encoding: gzip - заранее сжатый файл.
+  Запросы с ?lang или ?version генерируются как раньше.
+  """
+  def _get_schema_response(self, request):
+    if request.GET.get('lang') or self.api_version or request.version or self._get_version_parameter(request):
+      return super()._get_schema_response(request)
+
+    renderer = request.accepted_renderer
+    compressed = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+    version, content = load_schema(renderer.format, compressed)
+    etag = quote_etag(f'{version}-{renderer.format}{"-gzip" if compressed else ""}')
+
+    etags = [value.removeprefix('W/') for value in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))]
+    if '*' in etags or etag in etags:
+      response = HttpResponse(status=304)
+    else:
+      content_type = renderer.media_type
+      if renderer.charset:
+        content_type = f'{content_type}; charset={renderer.charset}'
+      response = HttpResponse(content, content_type=content_type)
+      response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+      if compressed:
+        response['Content-Encoding'] = 'gzip'
+    response['ETag'] = etag
+    response['Vary'] = 'Accept, Accept-Encoding'
+    return response
@@ -0,0 +1,172 @@
+import re
+
+from django.db import connection, transaction
+
+from apps.blog.models import Post, SubPost
+
+
+# Полнотекстовый индекс SQLite FTS5 (миграция 0003_search_index)
+# rowid: пост -> id * 2, субпост -> id * 2 + 1
+SEARCH_TABLE = 'blog_search_index'
+SNIPPET_TOKENS = 12
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+CREATE_TABLE_SQL = (
+  f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+  "title, body, post_id UNINDEXED, "
+  "tokenize='unicode61 remove_diacritics 2')"
+)
+
+TRIGGERS_SQL = [
+  f"""CREATE TRIGGER IF NOT EXISTS blog_post_search_ai AFTER INSERT ON blog_post BEGIN
+    INSERT INTO {SEARCH_TABLE}(rowid, title, body, post_id) VALUES (new.id * 2, new.title, new.body, new.id);
+  END""",
+  f"""CREATE TRIGGER IF NOT EXISTS blog_post_search_au AFTER UPDATE OF title, body ON blog_post BEGIN
+    UPDATE {SEARCH_TABLE} SET title = new.title, body = new.body WHERE rowid = new.id * 2;
+  END""",
+  f"""CREATE TRIGGER IF NOT EXISTS blog_post_search_ad AFTER DELETE ON blog_post BEGIN
+    DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2;
+  END""",
+  f"""CREATE TRIGGER IF NOT EXISTS blog_subpost_search_ai AFTER INSERT ON blog_subpost BEGIN
+    INSERT INTO {SEARCH_TABLE}(rowid, title, body, post_id) VALUES (new.id * 2 + 1, new.title, new.body, new.post_id);
+  END""",
+  f"""CREATE TRIGGER IF NOT EXISTS blog_subpost_search_au AFTER UPDATE OF title, body, post_id ON blog_subpost BEGIN
+    UPDATE {SEARCH_TABLE} SET title = new.title, body = new.body, post_id = new.post_id WHERE rowid = new.id * 2 + 1;
+  END""",
+  f"""CREATE TRIGGER IF NOT EXISTS blog_subpost_search_ad AFTER DELETE ON blog_subpost BEGIN
+    DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2 + 1;
+  END""",
+]
+
+DROP_SQL = [
+  'DROP TRIGGER IF EXISTS blog_post_search_ai',
+  'DROP TRIGGER IF EXISTS blog_post_search_au',
+  'DROP TRIGGER IF EXISTS blog_post_search_ad',
+  'DROP TRIGGER IF EXISTS blog_subpost_search_ai',
+  'DROP TRIGGER IF EXISTS blog_subpost_search_au',
+  'DROP TRIGGER IF EXISTS blog_subpost_search_ad',
+  f'DROP TABLE IF EXISTS {SEARCH_TABLE}',
+]
+
+FILL_SQL = [
+  f"""INSERT INTO {SEARCH_TABLE}(rowid, title, body, post_id)
+    SELECT id * 2, title, body, id FROM blog_post""",
+  f"""INSERT INTO {SEARCH_TABLE}(rowid, title, body, post_id)
+    SELECT id * 2 + 1, title, body, post_id FROM blog_subpost""",
+]
+
+
+def fts_supported(conn=connection):
+  if conn.vendor != 'sqlite':
+    return False
+  with conn.cursor() as cursor:
+    cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+    return bool(cursor.fetchone()[0])
+
+
+def search_index_exists(conn=connection):
+  return conn.vendor == 'sqlite' and SEARCH_TABLE in conn.introspection.table_names()
+
+
+def create_search_index(conn=connection):
+  with conn.cursor() as cursor:
+    cursor.execute(CREATE_TABLE_SQL)
+    for sql in TRIGGERS_SQL:
+      cursor.execute(sql)
+
+
+def drop_search_index(conn=connection):
+  with conn.cursor() as cursor:
+    for sql in DROP_SQL:
+      cursor.execute(sql)
+
+
+def rebuild_search_index(conn=connection):
+  """
+  Перестроить индекс с нуля по blog_post и blog_subpost
+
+  :return: Количество строк в индексе
+  """
+  with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+    cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    for sql in FILL_SQL:
+      cursor.execute(sql)
+    cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+    cursor.execute(f'SELECT COUNT(*) FROM {SEARCH_TABLE}')
+    return cursor.fetchone()[0]
+
+
+def index_new_rows(post_min_id, subpost_min_id, conn=connection):
+  """
+  Добавить в индекс посты и субпосты с id не меньше заданных
+  (массовая вставка со снятыми триггерами)
+  """
+  with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+    cursor.execute(f'{FILL_SQL[0]} WHERE id >= %s', [post_min_id])
+    cursor.execute(f'{FILL_SQL[1]} WHERE id >= %s', [subpost_min_id])
+
+
+def build_match_query(query):
+  """
+  Строка пользователя -> запрос FTS5
+
+  Каждое слово в кавычках (синтаксис FTS5 в запросе не исполняется)
+  и с * - поиск по префиксу, чтобы находились формы слова.
+  """
+  tokens = TOKEN_RE.findall(query)
+  return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search(query, limit=20):
+  """
+  Ранжированный поиск по постам и субпостам (bm25)
+
+  :return: Список {post, subpost, title, snippet, rank}
+  """
+  match = build_match_query(query)
+  if not match:
+    return []
+
+  if not search_index_exists():
+    return naive_search(query, limit)
+
+  sql = (
+    f"SELECT rowid, post_id, title, "
+    f"snippet({SEARCH_TABLE}, -1, '<mark>', '</mark>', '…', {SNIPPET_TOKENS}), "
+    f"bm25({SEARCH_TABLE}) AS rank "
+    f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+    f"ORDER BY rank LIMIT %s"
+  )
+  with connection.cursor() as cursor:
+    cursor.execute(sql, [match, limit])
+    rows = cursor.fetchall()
+
+  return [
+    {
+      'post': post_id,
+      'subpost': rowid // 2 if rowid % 2 else None,
+      'title': title,
+      'snippet': snippet,
+      'rank': rank,
+    }
+    for rowid, post_id, title, snippet, rank in rows
+  ]
+
+
+def naive_search(query, limit=20):
+  """
+  Поиск через icontains: полный просмотр таблиц
+
+  Запасной вариант без FTS5 (например, PostgreSQL) и база для сравнения
+  в benchmarks/bench_search.py.
+  """
+  results = []
+  for post_id, title, body in Post.objects.filter(body__icontains=query).values_list('id', 'title', 'body')[:limit]:
+    results.append({'post': post_id, 'subpost': None, 'title': title, 'snippet': body[:200], 'rank': None})
+
+  remaining = limit - len(results)
+  if remaining > 0:
+    subposts = SubPost.objects.filter(body__icontains=query).values_list('id', 'post_id', 'title', 'body')
+    for subpost_id, post_id, title, body in subposts[:remaining]:
+      results.append({'post': post_id, 'subpost': subpost_id, 'title': title, 'snippet': body[:200], 'rank': None})
+  return results
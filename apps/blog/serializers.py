@@ -2,6 +2,17 @@ from rest_framework import serializers
 from apps.blog.models import Post, SubPost, Like
 
 
+class SubPostSerializer(serializers.ModelSerializer):
+  id = serializers.ReadOnlyField(required=False)
+
+  class Meta:
+    model = SubPost
+    fields = ['id', 'title', 'post', 'body', 'create_at', 'update_at']
+    extra_kwargs = {
+      'post': {'required': False}
+    }
+
+
 class PostSerializer(serializers.ModelSerializer):
   author = serializers.HiddenField(
     default=serializers.CurrentUserDefault(), 
@@ -14,27 +25,139 @@ class PostSerializer(serializers.ModelSerializer):
   views_count = serializers.ReadOnlyField(
     help_text="Количество просмотров"
   )
+  likes_count = serializers.ReadOnlyField(
+    help_text="Количество лайков"
+  )
+  subposts = SubPostSerializer(
+    source='included_subposts',
+    many=True,
+    read_only=True,
+    help_text="Субпосты (только с ?include=subposts)"
+  )
+  liked_by_me = serializers.BooleanField(
+    read_only=True,
+    help_text="Лайкнул ли пост текущий пользователь (только с ?include=liked_by_me)"
+  )
 
   class Meta:
     model = Post
-    fields = ['id', 'title', 'author', 'author_display', 'body', 'create_at', 'update_at', 'views_count']
+    fields = ['id', 'title', 'author', 'author_display', 'body', 'create_at', 'update_at', 'views_count', 'likes_count', 'subposts', 'liked_by_me']
+    # Поля только по запросу: context['include'] (?include=subposts,liked_by_me)
+    optional_fields = ['subposts', 'liked_by_me']
 
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    include = self.context.get('include', ())
+    for field_name in self.Meta.optional_fields:
+      if field_name not in include:
+        self.fields.pop(field_name, None)
 
-class SubPostSerializer(serializers.ModelSerializer):
-  id = serializers.ReadOnlyField(required=False)
 
-  class Meta:
-    model = SubPost
-    fields = ['id', 'title', 'post', 'body', 'create_at', 'update_at']
-    extra_kwargs = {
-      'post': {'required': False}
-    }
+class ValuesSerializer:
+  """
+  Быстрый сериализатор только для чтения: строки .values() -> dict
+
+  Без полей DRF на каждую строку: список (поле ответа, путь для
+  values(), преобразование). Набор и формат полей совпадают с обычным
+  сериализатором - это проверяют тесты (test_fast_read).
+  """
+  fields = ()
+  # Поля только по запросу: context['include']
+  optional_fields = ()
+  datetime_field = serializers.DateTimeField()
+
+  def __init__(self, context=None):
+    include = (context or {}).get('include', ())
+    self.fields = [
+      (name, lookup, convert) for name, lookup, convert in self.fields
+      if name not in self.optional_fields or name in include
+    ]
+    self.lookups = [lookup for _, lookup, _ in self.fields]
+
+  @classmethod
+  def datetime(cls, value):
+    return cls.datetime_field.to_representation(value)
+
+  def to_representation(self, row):
+    data = {}
+    for name, lookup, convert in self.fields:
+      value = row[lookup]
+      if convert is not None and value is not None:
+        value = convert(value)
+      data[name] = value
+    return data
+
+  def many(self, rows):
+    return [self.to_representation(row) for row in rows]
+
+
+class PostValuesSerializer(ValuesSerializer):
+  fields = (
+    ('id', 'id', None),
+    ('title', 'title', None),
+    ('author_display', 'author__username', None),
+    ('body', 'body', None),
+    ('create_at', 'create_at', ValuesSerializer.datetime),
+    ('update_at', 'update_at', ValuesSerializer.datetime),
+    ('views_count', 'views_count', None),
+    ('likes_count', 'likes_count', None),
+    # EXISTS в SQLite - 0/1
+    ('liked_by_me', 'liked_by_me', bool),
+  )
+  optional_fields = ('liked_by_me',)
+
+
+class SubPostValuesSerializer(ValuesSerializer):
+  fields = (
+    ('id', 'id', None),
+    ('title', 'title', None),
+    ('post', 'post_id', None),
+    ('body', 'body', None),
+    ('create_at', 'create_at', ValuesSerializer.datetime),
+    ('update_at', 'update_at', ValuesSerializer.datetime),
+  )
 
 
 class SubPostWithIDSerializer(SubPostSerializer):
   id = serializers.IntegerField(required=False)
 
 
+class SubPostOperationSerializer(serializers.Serializer):
+  """Операция PATCH /posts/{id}/subposts/"""
+  op = serializers.ChoiceField(choices=['add', 'update', 'remove', 'move'])
+  id = serializers.IntegerField(required=False, help_text="Субпост (update, remove, move)")
+  title = serializers.CharField(max_length=SubPost._meta.get_field('title').max_length, required=False)
+  body = serializers.CharField(required=False)
+  after = serializers.IntegerField(
+    required=False,
+    allow_null=True,
+    help_text="add, move: id субпоста, после которого встать; null - в начало; не передан - в конец"
+  )
+
+  def validate(self, attrs):
+    op = attrs['op']
+    if op == 'add':
+      required, forbidden = ('title', 'body'), ('id',)
+    elif op == 'update':
+      required, forbidden = ('id',), ('after',)
+      if 'title' not in attrs and 'body' not in attrs:
+        raise serializers.ValidationError('update: нужно title или body')
+    else:
+      required, forbidden = ('id',), ('title', 'body')
+      if op == 'remove':
+        forbidden += ('after',)
+
+    errors = {name: f'Обязательное поле для {op}' for name in required if name not in attrs}
+    errors.update({name: f'Недопустимое поле для {op}' for name in forbidden if name in attrs})
+    if errors:
+      raise serializers.ValidationError(errors)
+    return attrs
+
+
+class SubPostPatchSerializer(serializers.Serializer):
+  operations = SubPostOperationSerializer(many=True, allow_empty=False, max_length=1000)
+
+
 class LikeSerializer(serializers.ModelSerializer):
   user = serializers.HiddenField(default=serializers.CurrentUserDefault())
   post = serializers.PrimaryKeyRelatedField(queryset=Post.objects.all())
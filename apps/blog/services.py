@@ -1,6 +1,87 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-# пока что не рабочий, логика пока что в apps/blog/views.py
+from rest_framework.exceptions import ValidationError, PermissionDenied, NotFound
+
+from apps.blog.models import Post, Like
+
+
+def rebuild_likes_count():
+  """
+  Пересчитывает Post.likes_count по таблице Like одним UPDATE
+
+  :return: Количество обновленных постов
+  """
+  likes = (
+    Like.objects.filter(post=OuterRef('pk'))
+    .values('post')
+    .annotate(total=Count('id'))
+    .values('total')
+  )
+  with transaction.atomic():
+    return Post.objects.update(likes_count=Coalesce(Subquery(likes), 0))
+
+
+class LikeToggleConflict(Exception):
+  """Параллельный переключатель успел изменить лайк: повторить"""
+
+
+def toggle_like(user_id, post_id, attempts=3):
+  """
+  Переключить лайк за два запроса к БД
+
+  1. UPDATE поста: likes_count +-1 в зависимости от того, есть ли лайк,
+     RETURNING - новый счетчик и прежнее состояние. Строка поста
+     блокируется до конца транзакции, переключатели одного поста идут
+     по очереди.
+  2. DELETE или INSERT лайка.
+
+  Если второй запрос не сходится с первым (лайк уже удален или
+  IntegrityError по unique_together), транзакция откатывается и
+  переключение повторяется.
+
+  :return: (liked, likes_count) или None, если поста нет
+  """
+  for attempt in range(attempts):
+    try:
+      with transaction.atomic():
+        return _toggle_like_once(user_id, post_id)
+    except (LikeToggleConflict, IntegrityError):
+      if attempt == attempts - 1:
+        raise
+
+
+def _toggle_like_once(user_id, post_id):
+  post_table = Post._meta.db_table
+  like_table = Like._meta.db_table
+  exists_sql = f'EXISTS (SELECT 1 FROM {like_table} WHERE user_id = %s AND post_id = %s)'
+  sql = (
+    f'UPDATE {post_table} SET likes_count = CASE '
+    f'WHEN {exists_sql} THEN (CASE WHEN likes_count > 0 THEN likes_count - 1 ELSE 0 END) '
+    f'ELSE likes_count + 1 END, activity_at = %s '
+    f'WHERE id = %s '
+    f'RETURNING likes_count, {exists_sql}'
+  )
+  with connection.cursor() as cursor:
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    cursor.execute(sql, [user_id, post_id, now, post_id, user_id, post_id])
+    row = cursor.fetchone()
+  if row is None:
+    return None
+
+  likes_count, was_liked = row
+  if was_liked:
+    deleted, _ = Like.objects.filter(user_id=user_id, post_id=post_id).delete()
+    if not deleted:
+      raise LikeToggleConflict()
+    return False, likes_count
+
+  Like.objects.create(user_id=user_id, post_id=post_id)
+  return True, likes_count
+
+
 class MassCreation:
   def specify_data(data):
     pass
@@ -9,14 +90,71 @@ class MassCreation:
     serializer = serializer_class(data=data, many=True)
     serializer.is_valid(raise_exception=True)
     return serializer
-  
-  def mass_update(self, request, *args, **kwargs):
-    now = timezone.now()
-    data = request.data
-    for item in data:
-      item['updated_at'] = now
-      serializer = self.get_serializer(data=data, many=True)
-
-    serializer = self.get_serializer(data=data, many=True)
-    serializer.is_valid(raise_exception=True)
-    self.perform_bulk_update(serializer)
\ No newline at end of file
+
+  def mass_update(serializer_class, data, user, context, batch_size=500):
+    """
+    Массовое частичное обновление постов
+
+    Проверка владельца - одним запросом на весь набор, запись -
+    bulk_update только по переданным полям, все в одной транзакции.
+
+    :param data: Список [{id, ...поля}]
+    :return: Обновленные посты в порядке data
+    """
+    if not isinstance(data, list) or not data:
+      raise ValidationError({'massages': 'Ожидается непустой список [{id, ...}]'})
+
+    changes = {}
+    seen_ids = set()
+    # Ошибки по индексу элемента: {index: {поле: [ошибки]}}
+    errors = {}
+    for index, item in enumerate(data):
+      if not isinstance(item, dict):
+        errors[index] = {'non_field_errors': ['Ожидается объект']}
+        continue
+      try:
+        post_id = int(item.get('id'))
+      except (TypeError, ValueError):
+        errors[index] = {'id': ['Обязательное целое поле']}
+        continue
+      if post_id in seen_ids:
+        errors[index] = {'id': [f'id={post_id} передан повторно']}
+        continue
+      seen_ids.add(post_id)
+
+      fields = {key: value for key, value in item.items() if key != 'id'}
+      serializer = serializer_class(data=fields, partial=True, context=context)
+      if not serializer.is_valid():
+        errors[index] = serializer.errors
+        continue
+      changes[post_id] = serializer.validated_data
+
+    if errors:
+      raise ValidationError({'errors': errors})
+
+    with transaction.atomic():
+      posts = Post.objects.select_related('author').filter(id__in=changes.keys())
+      post_map = {post.id: post for post in posts}
+
+      missing = changes.keys() - post_map.keys()
+      if missing:
+        raise NotFound(f'Посты не найдены: (id){sorted(missing)}')
+      foreign = sorted(post_id for post_id, post in post_map.items() if post.author_id != user.id)
+      if foreign:
+        raise PermissionDenied(f'Доступ к постам {foreign} ограничен')
+
+      # Группы по набору полей: каждый UPDATE пишет только то, что передали
+      now = timezone.now()
+      groups = {}
+      for post_id, validated_data in changes.items():
+        post = post_map[post_id]
+        for field, value in validated_data.items():
+          setattr(post, field, value)
+        post.update_at = now
+        fields = tuple(sorted(validated_data.keys())) + ('update_at',)
+        groups.setdefault(fields, []).append(post)
+
+      for fields, group in groups.items():
+        Post.objects.bulk_update(group, fields, batch_size=batch_size)
+
+    return [post_map[post_id] for post_id in changes]
@@ -0,0 +1,191 @@
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from rest_framework.exceptions import ValidationError
+
+from apps.blog.models import SubPost
+
+
+# Зазор между соседними позициями: ~10 вставок подряд в одно место без перенумерации
+POSITION_STEP = 1024
+
+# after не передан: в конец поста
+END = object()
+
+
+def next_position(post_id):
+  """Позиция после последнего субпоста поста (MAX по индексу post, position, id)"""
+  last = SubPost.objects.filter(post_id=post_id).aggregate(last=Max('position'))['last']
+  return POSITION_STEP if last is None else last + POSITION_STEP
+
+
+class SubPostPatch:
+  """
+  Операции над субпостами поста: add, update, remove, move
+
+  Порядок субпостов - (position, id). Новое место - середина зазора
+  между соседями, остальные строки не сдвигаются. Читаются только
+  субпосты из операций (id и after) и по одному соседу на вставку;
+  запись - DELETE, bulk_update и bulk_create в одной транзакции.
+  Стоимость зависит от числа операций, а не от числа субпостов поста.
+
+  Если зазор исчерпан, позиции всех субпостов поста пересчитываются
+  заново с шагом POSITION_STEP (один раз за патч).
+  """
+  def __init__(self, post):
+    self.post = post
+    self.now = timezone.now()
+    # id -> SubPost: субпосты из операций
+    self.rows = {}
+    # id -> SubPost(id, position): остальные, загружаются только при перенумерации
+    self.others = {}
+    self.added = []
+    self.removed = set()
+    self.changed = set()
+    self.renumbered = False
+    # Первый и последний из остальных субпостов (не меняются до записи)
+    self._edges = {}
+
+  def apply(self, operations):
+    """
+    :param operations: validated_data SubPostOperationSerializer(many=True)
+    :return: [{'op': ..., 'id': ...}] в порядке операций (id новых - после INSERT)
+    """
+    with transaction.atomic():
+      self.load(operations)
+      results = [(operation['op'], getattr(self, operation['op'])(operation)) for operation in operations]
+      self.save()
+    return [{'op': op, 'id': subpost.id} for op, subpost in results]
+
+  def load(self, operations):
+    ids = {operation['id'] for operation in operations if 'id' in operation}
+    ids.update(operation['after'] for operation in operations if operation.get('after') is not None)
+    self.rows = {row.id: row for row in SubPost.objects.filter(post=self.post, id__in=ids)}
+    missing = ids - self.rows.keys()
+    if missing:
+      raise ValidationError({'operations': f'Субпосты {sorted(missing)} не принадлежат посту {self.post.id}'})
+
+  def get_row(self, subpost_id):
+    if subpost_id in self.removed:
+      raise ValidationError({'operations': f'Субпост {subpost_id} удален предыдущей операцией'})
+    return self.rows[subpost_id]
+
+  def add(self, operation):
+    subpost = SubPost(post=self.post, title=operation['title'], body=operation['body'])
+    self.place(subpost, operation.get('after', END))
+    self.added.append(subpost)
+    return subpost
+
+  def update(self, operation):
+    row = self.get_row(operation['id'])
+    for field in ('title', 'body'):
+      if field in operation:
+        setattr(row, field, operation[field])
+    self.changed.add(row.id)
+    return row
+
+  def remove(self, operation):
+    row = self.get_row(operation['id'])
+    self.removed.add(row.id)
+    self.changed.discard(row.id)
+    return row
+
+  def move(self, operation):
+    row = self.get_row(operation['id'])
+    self.place(row, operation.get('after', END))
+    self.changed.add(row.id)
+    return row
+
+  def place(self, subpost, after):
+    position = self.free_position(subpost, after)
+    if position is None:
+      self.renumber()
+      position = self.free_position(subpost, after)
+    subpost.position = position
+
+  def free_position(self, subpost, after):
+    """Позиция после after (None - в начало, END - в конец) или None, если зазора нет"""
+    if after is END:
+      last = self.edge(subpost, last=True)
+      return POSITION_STEP if last is None else last[0] + POSITION_STEP
+    if after is None:
+      first = self.edge(subpost, last=False)
+      return POSITION_STEP if first is None else first[0] - POSITION_STEP
+
+    anchor = self.get_row(after)
+    if anchor is subpost:
+      raise ValidationError({'operations': f'Субпост {after} нельзя поставить после самого себя'})
+    successor = self.successor(subpost, anchor)
+    if successor is None:
+      return anchor.position + POSITION_STEP
+    if successor[0] - anchor.position < 2:
+      return None
+    return (anchor.position + successor[0]) // 2
+
+  @staticmethod
+  def key(subpost):
+    # У новых id еще нет: их позиции не совпадают с соседними
+    return (subpost.position, subpost.id or 0)
+
+  def loaded(self, exclude):
+    """Субпосты в памяти (кроме удаленных и exclude)"""
+    rows = [row for row in self.rows.values() if row.id not in self.removed]
+    return [subpost for subpost in (*rows, *self.others.values(), *self.added) if subpost is not exclude]
+
+  def untouched(self):
+    return SubPost.objects.filter(post=self.post).exclude(id__in=list(self.rows))
+
+  def edge(self, exclude, last):
+    keys = [self.key(subpost) for subpost in self.loaded(exclude)]
+    if not self.renumbered:
+      if last not in self._edges:
+        order = ('-position', '-id') if last else ('position', 'id')
+        self._edges[last] = self.untouched().order_by(*order).values_list('position', 'id').first()
+      if self._edges[last] is not None:
+        keys.append(self._edges[last])
+    if not keys:
+      return None
+    return max(keys) if last else min(keys)
+
+  def successor(self, exclude, anchor):
+    anchor_key = self.key(anchor)
+    keys = [self.key(subpost) for subpost in self.loaded(exclude) if self.key(subpost) > anchor_key]
+    if not self.renumbered:
+      position, anchor_id = anchor_key
+      key = (
+        self.untouched()
+        .filter(Q(position__gt=position) | Q(position=position, id__gt=anchor_id))
+        .order_by('position', 'id')
+        .values_list('position', 'id')
+        .first()
+      )
+      if key is not None:
+        keys.append(key)
+    return min(keys, default=None)
+
+  def renumber(self):
+    others = self.untouched().only('id', 'position')
+    self.others = {row.id: row for row in others}
+    self.renumbered = True
+    for index, subpost in enumerate(sorted(self.loaded(None), key=self.key), 1):
+      subpost.position = index * POSITION_STEP
+
+  def save(self):
+    if self.removed:
+      SubPost.objects.filter(id__in=self.removed).delete()
+    changed = [self.rows[row_id] for row_id in self.changed]
+    for row in changed:
+      row.update_at = self.now
+    if changed:
+      SubPost.objects.bulk_update(changed, ['title', 'body', 'position', 'update_at'])
+    if self.renumbered:
+      # Остальные и неизмененные субпосты из операций: только новая позиция
+      rows = [row for row_id, row in self.rows.items() if row_id not in self.changed and row_id not in self.removed]
+      SubPost.objects.bulk_update([*rows, *self.others.values()], ['position'], batch_size=500)
+    if self.added:
+      SubPost.objects.bulk_create(self.added)
+
+  @property
+  def modified(self):
+    return bool(self.removed or self.changed or self.added)
@@ -0,0 +1,130 @@
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post, SubPost, Like
+
+
+class AsyncReadTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(username='test_user', password='Test_UseR_1_Test')
+    cls.posts = [
+      Post.objects.create(title=f'Пост {i}', body='Содержание', author=cls.user, views_count=i)
+      for i in range(5)
+    ]
+    for post in cls.posts[:2]:
+      SubPost.objects.create(post=post, title='Субпост', body='Текст')
+    Like.objects.create(user=cls.user, post=cls.posts[4])
+
+  def setUp(self):
+    self.client.force_login(self.user)
+    self.async_client.force_login(self.user)
+
+  async def assertSameAsSync(self, name, args=(), params=None):
+    response = await self.async_client.get(reverse(f'async-{name}', args=args), params)
+    expected = await self.sync_get(reverse(name, args=args), params)
+
+    self.assertEqual(expected.status_code, response.status_code)
+    # Ссылки пагинации ведут на свой эндпоинт
+    self.assertEqual(expected.content.replace(b'/api/', b'/api/async/'), response.content)
+    return response
+
+  async def sync_get(self, url, params=None):
+    return await sync_to_async(self.client.get)(url, params)
+
+  # GET /async/posts/ : тот же ответ, что у /posts/
+  async def test_post_list(self):
+    response = await self.assertSameAsSync('post-list')
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertEqual(5, response.json()['count'])
+
+    await self.assertSameAsSync('post-list', params={'page': 2, 'author': self.user.id})
+    await self.assertSameAsSync('post-list', params={'include': 'liked_by_me'})
+
+  # GET /async/posts/?pagination=cursor : курсор
+  async def test_post_list_cursor(self):
+    response = await self.assertSameAsSync('post-list', params={'pagination': 'cursor'})
+    next_page = await self.async_client.get(response.json()['next'])
+    self.assertEqual(status.HTTP_200_OK, next_page.status_code)
+    self.assertEqual(2, len(next_page.json()['results']))
+
+  # Ошибки параметров : как у синхронного API
+  async def test_errors(self):
+    await self.assertSameAsSync('post-list', params={'page': 100})
+    await self.assertSameAsSync('post-list', params={'include': 'unknown'})
+    await self.assertSameAsSync('post-list', params={'cursor': 'broken'})
+
+  # GET /async/posts/?include=subposts : синхронный list в потоке
+  async def test_include_subposts(self):
+    response = await self.assertSameAsSync('post-list', params={'include': 'subposts'})
+    self.assertIn('subposts', response.json()['results'][0])
+
+  # GET /async/posts/{id}/ и 404
+  async def test_post_retrieve(self):
+    response = await self.assertSameAsSync('post-detail', args=[self.posts[1].id])
+    self.assertEqual(self.posts[1].id, response.json()['id'])
+    self.assertIn('ETag', response)
+
+    response = await self.assertSameAsSync('post-detail', args=[99999])
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+  # If-None-Match : 304
+  async def test_not_modified(self):
+    url = reverse('async-post-list')
+    etag = (await self.async_client.get(url))['ETag']
+    response = await self.async_client.get(url, headers={'If-None-Match': etag})
+    self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+  # GET /async/subposts/ и /async/subposts/{id}/
+  async def test_subposts(self):
+    await self.assertSameAsSync('subpost-list')
+    await self.assertSameAsSync('subpost-list', params={'post': self.posts[0].id})
+    subpost = await SubPost.objects.afirst()
+    await self.assertSameAsSync('subpost-detail', args=[subpost.id])
+
+  # GET /async/posts/{id}/view/ : +1 просмотр
+  async def test_add_view(self):
+    post = self.posts[2]
+    response = await self.async_client.get(reverse('async-post-add-view', args=[post.id]))
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    await post.arefresh_from_db()
+    self.assertEqual(3, post.views_count)
+
+    response = await self.async_client.get(reverse('async-post-add-view', args=[99999]))
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+  # Буфер просмотров
+  @override_settings(BLOG_VIEW_BUFFER={'ENABLED': True, 'MAX_PENDING': 1})
+  async def test_add_view_buffered(self):
+    post = self.posts[2]
+    response = await self.async_client.get(reverse('async-post-add-view', args=[post.id]))
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    await post.arefresh_from_db()
+    self.assertEqual(3, post.views_count)
+
+  # Без авторизации : 401 с WWW-Authenticate, как у синхронного API
+  async def test_anonymous(self):
+    self.client.cookies.clear()
+    self.async_client.cookies.clear()
+    response = await self.assertSameAsSync('post-list')
+    self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+    self.assertIn('WWW-Authenticate', response)
+
+  # Метод не из actions : 405
+  async def test_method_not_allowed(self):
+    response = await self.async_client.post(reverse('async-post-list'))
+    self.assertEqual(status.HTTP_405_METHOD_NOT_ALLOWED, response.status_code)
+
+  # Кэш ответов включен : синхронный list с кэшем
+  @override_settings(BLOG_RESPONSE_CACHE={'ENABLED': True})
+  async def test_response_cache(self):
+    await self.async_client.get(reverse('async-post-list'))
+    response = await self.async_client.get(reverse('async-post-list'))
+    self.assertEqual('HIT', response['X-Cache'])
@@ -0,0 +1,151 @@
+import base64
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from drf_spectacular.settings import spectacular_settings
+
+from apps.blog.authentication import CredentialCache, credential_cache
+
+
+PASSWORD = 'Test_UseR_1_Test'
+
+
+def basic(username, password):
+  credentials = base64.b64encode(f'{username}:{password}'.encode()).decode()
+  return {'HTTP_AUTHORIZATION': f'Basic {credentials}'}
+
+
+class CachedBasicAuthenticationTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(username='test_user', password=PASSWORD)
+
+  def setUp(self):
+    credential_cache.clear()
+    self.addCleanup(credential_cache.clear)
+    self.url = reverse('post-list')
+
+  def get(self, username='test_user', password=PASSWORD):
+    return self.client.get(self.url, **basic(username, password))
+
+  def count_password_checks(self, requests):
+    with mock.patch.object(User, 'check_password', autospec=True, side_effect=User.check_password) as check:
+      statuses = [self.get(*credentials).status_code for credentials in requests]
+    return statuses, check.call_count
+
+  # GET /posts/ с Basic : пароль хэшируется только на первом запросе
+  def test_cached(self):
+    statuses, checks = self.count_password_checks([()] * 3)
+
+    self.assertEqual([status.HTTP_200_OK] * 3, statuses)
+    self.assertEqual(1, checks)
+    self.assertEqual(1, len(credential_cache))
+
+  # Повторный запрос : пользователь по id и пост
+  def test_cached_queries(self):
+    self.get()
+    with self.assertNumQueries(2):
+      self.client.get(reverse('post-detail', args=[99999]), **basic('test_user', PASSWORD))
+
+  # Неверный пароль : 401, в кэш не попадает
+  def test_wrong_password(self):
+    self.get()
+    statuses, checks = self.count_password_checks([('test_user', 'wrong')] * 2)
+
+    self.assertEqual([status.HTTP_401_UNAUTHORIZED] * 2, statuses)
+    self.assertEqual(2, checks)
+    self.assertEqual(1, len(credential_cache))
+
+  # Смена пароля : старый сразу перестает действовать
+  def test_password_change(self):
+    self.get()
+    self.user.set_password('New_PassworD_2')
+    self.user.save()
+
+    self.assertEqual(0, len(credential_cache))
+    self.assertEqual(status.HTTP_401_UNAUTHORIZED, self.get().status_code)
+    self.assertEqual(status.HTTP_200_OK, self.get(password='New_PassworD_2').status_code)
+
+  # Смена пароля в другом процессе (без сигнала в этом) : запись не действует по хэшу
+  def test_password_change_elsewhere(self):
+    self.get()
+    User.objects.filter(pk=self.user.pk).update(password=make_password('New_PassworD_2'))
+
+    self.assertEqual(status.HTTP_401_UNAUTHORIZED, self.get().status_code)
+    self.assertEqual(0, len(credential_cache))
+
+  # Пользователь деактивирован или переименован : 401
+  def test_user_changed_elsewhere(self):
+    self.get()
+    User.objects.filter(pk=self.user.pk).update(is_active=False)
+    self.assertEqual(status.HTTP_401_UNAUTHORIZED, self.get().status_code)
+
+    User.objects.filter(pk=self.user.pk).update(is_active=True, username='renamed')
+    self.assertEqual(status.HTTP_401_UNAUTHORIZED, self.get().status_code)
+    self.assertEqual(status.HTTP_200_OK, self.get(username='renamed').status_code)
+
+  # TTL истек : пароль проверяется заново
+  @override_settings(BLOG_AUTH_CACHE={'TTL': 0})
+  def test_expired(self):
+    statuses, checks = self.count_password_checks([()] * 2)
+
+    self.assertEqual([status.HTTP_200_OK] * 2, statuses)
+    self.assertEqual(2, checks)
+
+  # Кэш выключен : как BasicAuthentication
+  @override_settings(BLOG_AUTH_CACHE={'ENABLED': False})
+  def test_disabled(self):
+    statuses, checks = self.count_password_checks([()] * 2)
+
+    self.assertEqual([status.HTTP_200_OK] * 2, statuses)
+    self.assertEqual(2, checks)
+    self.assertEqual(0, len(credential_cache))
+
+  # POST /auth/token/ и Authorization: Token
+  def test_token(self):
+    response = self.client.post(
+      reverse('auth-token'), {'username': 'test_user', 'password': PASSWORD}, format='json'
+    )
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    response = self.client.get(self.url, HTTP_AUTHORIZATION=f'Token {response.json()["token"]}')
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    response = self.client.get(self.url, HTTP_AUTHORIZATION='Token wrong')
+    self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+
+  # Схема : CachedBasicAuthentication - basicAuth, как BasicAuthentication
+  def test_schema(self):
+    schema = spectacular_settings.DEFAULT_GENERATOR_CLASS().get_schema(request=None, public=True)
+    self.assertEqual(
+      {'basicAuth', 'tokenAuth', 'cookieAuth'}, set(schema['components']['securitySchemes'])
+    )
+
+
+class CredentialCacheTestCase(SimpleTestCase):
+  # Сверх MAX_SIZE вытесняется давно не использованная запись
+  def test_lru(self):
+    cache = CredentialCache()
+    keys = [cache.key('user', str(i)) for i in range(3)]
+    cache.set(keys[0], 1, 'hash', 60, 2)
+    cache.set(keys[1], 2, 'hash', 60, 2)
+    cache.get(keys[0])
+    cache.set(keys[2], 3, 'hash', 60, 2)
+
+    self.assertEqual((1, 'hash'), cache.get(keys[0]))
+    self.assertIsNone(cache.get(keys[1]))
+    self.assertEqual((3, 'hash'), cache.get(keys[2]))
+
+  # Ключ зависит от логина, пароля и ключа процесса
+  def test_key(self):
+    cache = CredentialCache()
+    self.assertEqual(cache.key('user', 'password'), cache.key('user', 'password'))
+    self.assertNotEqual(cache.key('user', 'password'), cache.key('user', 'passwore'))
+    self.assertNotEqual(cache.key('user', 'password'), cache.key('use', 'rpassword'))
+    self.assertNotEqual(cache.key('user', 'password'), CredentialCache().key('user', 'password'))
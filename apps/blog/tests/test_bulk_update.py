@@ -0,0 +1,93 @@
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post
+
+
+class PostBulkUpdateTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.user_1 = User.objects.create_user(
+      username='test_user_1',
+      password='Test_UseR_1_Test'
+    )
+    cls.posts = [
+      Post.objects.create(title=f'Пост {i}', body='Содержание', author=cls.user)
+      for i in range(3)
+    ]
+    cls.foreign_post = Post.objects.create(
+      title='Чужой пост',
+      body='Содержание',
+      author=cls.user_1
+    )
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+    self.url = reverse('post-list')
+
+  # PATCH обновляет только переданные поля (200_OK)
+  def test_bulk_update(self):
+    data = [
+      {'id': self.posts[0].id, 'title': 'Новый 0'},
+      {'id': self.posts[1].id, 'body': 'Новый текст 1'},
+    ]
+    response = self.client.patch(self.url, data, format='json')
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertEqual([self.posts[0].id, self.posts[1].id], [item['id'] for item in response.data])
+    post_0 = Post.objects.get(id=self.posts[0].id)
+    post_1 = Post.objects.get(id=self.posts[1].id)
+    self.assertEqual(('Новый 0', 'Содержание'), (post_0.title, post_0.body))
+    self.assertEqual(('Пост 1', 'Новый текст 1'), (post_1.title, post_1.body))
+    self.assertGreater(post_0.update_at, self.posts[0].update_at)
+
+  # PATCH один SELECT с проверкой владельца + UPDATE на набор полей
+  def test_bulk_update_queries(self):
+    data = [{'id': post.id, 'title': f'Новый {post.id}'} for post in self.posts]
+
+    with self.assertNumQueries(4):
+      # SAVEPOINT, SELECT, UPDATE, RELEASE
+      response = self.client.patch(self.url, data, format='json')
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+  # PATCH чужой пост: ничего не меняется (403_FORBIDDEN)
+  def test_bulk_update_foreign(self):
+    data = [
+      {'id': self.posts[0].id, 'title': 'Новый 0'},
+      {'id': self.foreign_post.id, 'title': 'Взлом'},
+    ]
+    response = self.client.patch(self.url, data, format='json')
+
+    self.assertEqual(status.HTTP_403_FORBIDDEN, response.status_code)
+    self.assertEqual('Пост 0', Post.objects.get(id=self.posts[0].id).title)
+
+  # PATCH нет такого поста (404_NOT_FOUND)
+  def test_bulk_update_not_found(self):
+    response = self.client.patch(self.url, [{'id': 99999, 'title': 'Новый'}], format='json')
+
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+  # PATCH ошибки валидации с индексами (400_BAD_REQUEST)
+  def test_bulk_update_invalid(self):
+    data = [
+      {'id': self.posts[0].id, 'title': ''},
+      {'title': 'Без id'},
+      {'id': self.posts[0].id, 'title': 'Повтор'},
+    ]
+    response = self.client.patch(self.url, data, format='json')
+
+    self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+    self.assertEqual({'0', '1', '2'}, {str(index) for index in response.data['errors']})
+
+  # PATCH не список (400_BAD_REQUEST)
+  def test_bulk_update_not_list(self):
+    response = self.client.patch(self.url, {'id': self.posts[0].id}, format='json')
+
+    self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
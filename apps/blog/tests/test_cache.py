@@ -0,0 +1,182 @@
+import tempfile
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.cache import get_cache_stats
+from apps.blog.models import Post, SubPost
+
+
+RESPONSE_CACHE = {'ENABLED': True, 'ALIAS': 'default', 'TIMEOUT': 300}
+
+
+@override_settings(BLOG_RESPONSE_CACHE=RESPONSE_CACHE)
+class PostResponseCacheTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.post_1 = Post.objects.create(
+      title='Пост 1',
+      body='Содержание',
+      author=cls.user
+    )
+    cls.post_2 = Post.objects.create(
+      title='Пост 2',
+      body='Содержание',
+      author=cls.user
+    )
+    cls.subpost_1 = SubPost.objects.create(
+      post=cls.post_1,
+      title='Субпост 1',
+      body='Содержание'
+    )
+
+  def setUp(self):
+    caches['default'].clear()
+    self.client.force_authenticate(self.user)
+    self.list_url = reverse('post-list')
+    self.detail_url = reverse('post-detail', args=[self.post_1.id])
+
+  def assert_cache(self, url, expected):
+    response = self.client.get(url)
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertEqual(expected, response['X-Cache'])
+    return response
+
+  # GET повторный запрос отдается из кэша без БД
+  def test_hit(self):
+    self.assert_cache(self.list_url, 'MISS')
+    self.assert_cache(self.detail_url, 'MISS')
+
+    with self.assertNumQueries(0):
+      self.assert_cache(self.list_url, 'HIT')
+      self.assert_cache(self.detail_url, 'HIT')
+
+    stats = get_cache_stats()
+    self.assertEqual(2, stats['hits'])
+    self.assertEqual(2, stats['misses'])
+
+  # PATCH поста сбрасывает его детали и список
+  def test_invalidate_on_update(self):
+    self.assert_cache(self.list_url, 'MISS')
+    self.assert_cache(self.detail_url, 'MISS')
+    other_url = reverse('post-detail', args=[self.post_2.id])
+    self.assert_cache(other_url, 'MISS')
+
+    self.client.patch(self.detail_url, {'title': 'Новый заголовок'}, format='json')
+
+    response = self.assert_cache(self.detail_url, 'MISS')
+    self.assertEqual('Новый заголовок', response.data['title'])
+    self.assert_cache(self.list_url, 'MISS')
+    # Чужой пост остается в кэше
+    self.assert_cache(other_url, 'HIT')
+
+  # PATCH сбрасывает и детали по другой записи id (/posts/01/)
+  def test_invalidate_padded_id(self):
+    padded_url = f'{self.list_url}0{self.post_1.id}/'
+    self.assert_cache(padded_url, 'MISS')
+    self.assert_cache(padded_url, 'HIT')
+
+    self.client.patch(self.detail_url, {'title': 'Новый заголовок'}, format='json')
+
+    response = self.assert_cache(padded_url, 'MISS')
+    self.assertEqual('Новый заголовок', response.data['title'])
+
+  # GET id не число : 404 мимо кэша
+  def test_invalid_id(self):
+    response = self.client.get(f'{self.list_url}abc/')
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+    self.assertNotIn('X-Cache', response)
+
+  # POST новый пост сбрасывает список
+  def test_invalidate_on_create(self):
+    self.assert_cache(self.list_url, 'MISS')
+    self.client.post(self.list_url, {'title': 'Новый', 'body': 'Содержание'}, format='json')
+
+    response = self.assert_cache(self.list_url, 'MISS')
+    self.assertEqual(3, response.data['count'])
+
+  # DELETE поста
+  def test_invalidate_on_destroy(self):
+    self.assert_cache(self.detail_url, 'MISS')
+    self.client.delete(self.detail_url)
+
+    response = self.client.get(self.detail_url)
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+  # Субпост, просмотр и лайк сбрасывают кэш поста
+  def test_invalidate_on_related_changes(self):
+    subpost_url = reverse('subpost-detail', args=[self.subpost_1.id])
+    changes = [
+      lambda: self.client.put(
+        subpost_url,
+        {'post': self.post_1.id, 'title': 'Обновлен', 'body': 'Текст'},
+        format='json'
+      ),
+      lambda: self.client.get(reverse('post-add-view', args=[self.post_1.id])),
+      lambda: self.client.post(reverse('post-like', kwargs={'pk': self.post_1.id})),
+    ]
+    self.assert_cache(self.detail_url, 'MISS')
+    for change in changes:
+      self.assert_cache(self.detail_url, 'HIT')
+      change()
+      self.assert_cache(self.detail_url, 'MISS')
+
+    response = self.assert_cache(self.detail_url, 'HIT')
+    self.assertEqual(1, response.data['views_count'])
+    self.assertEqual(1, response.data['likes_count'])
+
+  # GET статистика только для админа
+  def test_stats_admin_only(self):
+    url = reverse('post-cache-stats')
+    self.assertEqual(status.HTTP_403_FORBIDDEN, self.client.get(url).status_code)
+
+    admin = User.objects.create_superuser(username='admin', password='Test_UseR_1_Test')
+    self.client.force_authenticate(admin)
+    response = self.client.get(url)
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertTrue(response.data['enabled'])
+
+
+class FileResponseCacheTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.post_1 = Post.objects.create(
+      title='Пост 1',
+      body='Содержание',
+      author=cls.user
+    )
+
+  # Файловый бэкенд: тот же кэш и сброс
+  def test_file_backend(self):
+    with tempfile.TemporaryDirectory() as location:
+      file_caches = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'file': {
+          'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+          'LOCATION': location,
+        },
+      }
+      with override_settings(CACHES=file_caches, BLOG_RESPONSE_CACHE={**RESPONSE_CACHE, 'ALIAS': 'file'}):
+        self.client.force_authenticate(self.user)
+        url = reverse('post-detail', args=[self.post_1.id])
+
+        self.assertEqual('MISS', self.client.get(url)['X-Cache'])
+        self.assertEqual('HIT', self.client.get(url)['X-Cache'])
+        self.client.patch(url, {'title': 'Новый заголовок'}, format='json')
+        response = self.client.get(url)
+        self.assertEqual('MISS', response['X-Cache'])
+        self.assertEqual('Новый заголовок', response.data['title'])
+        self.assertIn('FileBasedCache', get_cache_stats()['backend'])
@@ -0,0 +1,132 @@
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post, SubPost
+
+
+class ConditionalGetTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.post_1 = Post.objects.create(
+      title='Пост 1',
+      body='Содержание',
+      author=cls.user
+    )
+    cls.post_2 = Post.objects.create(
+      title='Пост 2',
+      body='Содержание',
+      author=cls.user
+    )
+    cls.subpost_1 = SubPost.objects.create(
+      post=cls.post_1,
+      title='Субпост 1',
+      body='Содержание'
+    )
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+    self.list_url = reverse('post-list')
+    self.detail_url = reverse('post-detail', args=[self.post_1.id])
+
+  # GET ответ содержит ETag и Last-Modified
+  def test_validators_in_response(self):
+    for url in [self.list_url, self.detail_url, reverse('subpost-list')]:
+      response = self.client.get(url)
+      self.assertEqual(status.HTTP_200_OK, response.status_code)
+      self.assertTrue(response['ETag'].startswith('"'))
+      self.assertIn('Last-Modified', response)
+
+  # GET If-None-Match: 304 одним запросом только метаданных
+  def test_not_modified_detail(self):
+    etag = self.client.get(self.detail_url)['ETag']
+
+    with self.assertNumQueries(1):
+      response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+    self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+    self.assertEqual(etag, response['ETag'])
+    self.assertEqual(b'', response.content)
+
+  # GET If-None-Match для страницы списка
+  def test_not_modified_list(self):
+    etag = self.client.get(self.list_url)['ETag']
+
+    response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+    self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    cursor_etag = self.client.get(self.list_url, {'pagination': 'cursor'})['ETag']
+    response = self.client.get(self.list_url, {'pagination': 'cursor'}, HTTP_IF_NONE_MATCH=cursor_etag)
+    self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+  # GET If-None-Match для курсорной страницы со ссылкой next (постов больше page_size)
+  def test_not_modified_cursor_pages(self):
+    for i in range(3, 6):
+      Post.objects.create(title=f'Пост {i}', body='Содержание', author=self.user)
+    first = self.client.get(self.list_url, {'pagination': 'cursor'})
+    self.assertIsNotNone(first.data['next'])
+
+    for url in (f'{self.list_url}?pagination=cursor', first.data['next']):
+      etag = self.client.get(url)['ETag']
+      response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+      self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    response = self.client.get(self.list_url, {'pagination': 'cursor'}, HTTP_IF_NONE_MATCH='"abc"')
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertEqual(first.data['next'], response.data['next'])
+
+  # GET изменения поста, счетчиков и набора id меняют ETag
+  def test_etag_changes(self):
+    etag = self.client.get(self.detail_url)['ETag']
+    list_etag = self.client.get(self.list_url)['ETag']
+
+    self.client.get(reverse('post-add-view', args=[self.post_1.id]))
+    response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertNotEqual(etag, response['ETag'])
+
+    Post.objects.create(title='Пост 3', body='Содержание', author=self.user)
+    response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag)
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+  # GET If-Modified-Since
+  def test_if_modified_since(self):
+    last_modified = self.client.get(self.detail_url)['Last-Modified']
+
+    response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT')
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+  # GET субпост: 304 и смена ETag после обновления
+  def test_subpost(self):
+    url = reverse('subpost-detail', args=[self.subpost_1.id])
+    etag = self.client.get(url)['ETag']
+
+    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+    self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    self.client.put(url, {'post': self.post_1.id, 'title': 'Новый', 'body': 'Текст'}, format='json')
+    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+  # GET нет такого поста (404_NOT_FOUND)
+  def test_not_found(self):
+    url = reverse('post-detail', args=[99999])
+    response = self.client.get(url, HTTP_IF_NONE_MATCH='"abc"')
+
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+  # GET id не число с условными заголовками (404_NOT_FOUND)
+  def test_invalid_id(self):
+    for url in (f'{self.list_url}abc/', f'{reverse("subpost-list")}abc/'):
+      for headers in ({'HTTP_IF_NONE_MATCH': '"abc"'}, {'HTTP_IF_MODIFIED_SINCE': 'Mon, 01 Jan 2001 00:00:00 GMT'}):
+        response = self.client.get(url, **headers)
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
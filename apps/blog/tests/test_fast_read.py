@@ -0,0 +1,106 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post, SubPost, Like
+from apps.blog.serializers import PostSerializer, PostValuesSerializer, SubPostSerializer, SubPostValuesSerializer
+
+
+SLOW_READ = override_settings(BLOG_FAST_READ={'ENABLED': False})
+
+
+class FastReadTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(username='test_user', password='Test_UseR_1_Test')
+    cls.other = User.objects.create_user(username='другой', password='Test_UseR_1_Test')
+    now = timezone.now()
+    cls.posts = []
+    for i in range(5):
+      post = Post.objects.create(
+        title=f'Пост {i}', body='Содержание "с кавычками"\n', author=cls.other if i % 2 else cls.user,
+        views_count=i * 3, likes_count=i
+      )
+      # Микросекунды в дате: формат должен совпасть
+      Post.objects.filter(id=post.id).update(create_at=now - timedelta(days=i, microseconds=i * 7))
+      cls.posts.append(post)
+      SubPost.objects.create(post=post, title=f'Субпост {i}', body='Текст')
+    Like.objects.create(user=cls.user, post=cls.posts[3])
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+
+  def assertSameAsSerializer(self, url, params=None):
+    fast = self.client.get(url, params)
+    with SLOW_READ:
+      slow = self.client.get(url, params)
+    self.assertEqual(status.HTTP_200_OK, fast.status_code)
+    self.assertEqual(slow.content, fast.content)
+    return fast
+
+  # GET /posts/ : тот же JSON, что у PostSerializer
+  def test_post_list(self):
+    self.assertSameAsSerializer(reverse('post-list'))
+    self.assertSameAsSerializer(reverse('post-list'), {'author': self.other.id})
+
+  # GET /posts/?pagination=cursor : курсор по строкам-словарям
+  def test_post_list_cursor(self):
+    response = self.assertSameAsSerializer(reverse('post-list'), {'pagination': 'cursor', 'page_size': 2})
+    self.assertSameAsSerializer(response.data['next'])
+
+  # GET /posts/{id}/ : тот же JSON
+  def test_post_retrieve(self):
+    self.assertSameAsSerializer(reverse('post-detail', args=[self.posts[2].id]))
+
+  # GET /posts/?include=liked_by_me : bool, а не 0/1
+  def test_liked_by_me(self):
+    response = self.assertSameAsSerializer(reverse('post-list'), {'include': 'liked_by_me'})
+    liked = {item['id']: item['liked_by_me'] for item in response.data['results']}
+    self.assertIs(True, liked[self.posts[3].id])
+    self.assertIs(False, liked[self.posts[4].id])
+
+  # GET /subposts/ и /subposts/{id}/ : тот же JSON, что у SubPostSerializer
+  def test_subposts(self):
+    self.assertSameAsSerializer(reverse('subpost-list'))
+    self.assertSameAsSerializer(reverse('subpost-list'), {'post': self.posts[3].id})
+    self.assertSameAsSerializer(reverse('subpost-detail', args=[self.posts[3].sub_posts.get().id]))
+
+  # Несуществующий id : 404, как у get_object()
+  def test_not_found(self):
+    response = self.client.get(reverse('post-detail', args=[99999]))
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+  # ?include=subposts : обычный сериализатор (prefetch)
+  def test_include_subposts_uses_serializer(self):
+    with mock.patch.object(PostValuesSerializer, 'many') as many:
+      response = self.client.get(reverse('post-list'), {'include': 'subposts'})
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    many.assert_not_called()
+    self.assertIn('subposts', response.data['results'][0])
+
+  # Запросов не больше, чем у сериализатора
+  def test_queries(self):
+    with self.assertNumQueries(2):
+      self.client.get(reverse('post-list'))
+    with self.assertNumQueries(1):
+      self.client.get(reverse('post-detail', args=[self.posts[0].id]))
+
+  # Поля совпадают с читаемыми полями обычных сериализаторов
+  def test_fields(self):
+    def readable(serializer):
+      return [name for name, field in serializer.fields.items() if not field.write_only]
+
+    def fast_names(serializer):
+      return [name for name, _, _ in serializer.fields]
+
+    context = {'include': {'liked_by_me'}}
+    self.assertEqual(readable(PostSerializer(context=context)), fast_names(PostValuesSerializer(context=context)))
+    self.assertEqual(readable(PostSerializer()), fast_names(PostValuesSerializer()))
+    self.assertEqual(readable(SubPostSerializer()), fast_names(SubPostValuesSerializer()))
@@ -0,0 +1,83 @@
+import json
+
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post
+
+
+def to_ndjson(lines):
+  return '\n'.join(
+    line if isinstance(line, str) else json.dumps(line, ensure_ascii=False)
+    for line in lines
+  ).encode('utf-8')
+
+
+class NDJSONImportTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+    self.url = reverse('post-list')
+
+  def post_ndjson(self, lines, **params):
+    url = self.url
+    if params:
+      url += '?' + '&'.join(f'{key}={value}' for key, value in params.items())
+    return self.client.generic('POST', url, to_ndjson(lines), content_type='application/x-ndjson')
+
+  # POST все строки валидны (201_CREATED)
+  def test_import(self):
+    lines = [{'title': f'Пост {i}', 'body': 'Содержание'} for i in range(7)]
+    response = self.post_ndjson(lines, chunk_size=3, batch_size=2)
+
+    self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+    self.assertEqual(7, response.data['created'])
+    self.assertEqual(0, response.data['failed'])
+    self.assertEqual([3, 3, 1], [chunk['created'] for chunk in response.data['chunks']])
+    self.assertEqual(7, Post.objects.filter(author=self.user).count())
+
+  # POST ошибки строк с индексами (207_MULTI_STATUS)
+  def test_import_with_errors(self):
+    lines = [
+      {'title': 'Пост 0', 'body': 'Содержание'},
+      {'body': 'Без заголовка'},
+      '{не json',
+      '',
+      [1, 2],
+      {'title': 'Пост 4', 'body': 'Содержание'},
+    ]
+    response = self.post_ndjson(lines, chunk_size=2)
+
+    self.assertEqual(status.HTTP_207_MULTI_STATUS, response.status_code)
+    self.assertEqual(2, response.data['created'])
+    self.assertEqual(3, response.data['failed'])
+    errors = [error for chunk in response.data['chunks'] for error in chunk['errors']]
+    self.assertEqual([1, 2, 3], [error['index'] for error in errors])
+    self.assertIn('title', errors[0]['errors'])
+    self.assertEqual({'Пост 0', 'Пост 4'}, set(Post.objects.values_list('title', flat=True)))
+
+  # POST некорректный chunk_size (400_BAD_REQUEST)
+  def test_invalid_chunk_size(self):
+    response = self.post_ndjson([{'title': 'Пост', 'body': 'Содержание'}], chunk_size=0)
+
+    self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+    self.assertFalse(Post.objects.exists())
+
+  # PUT / PATCH поста с application/x-ndjson: импорт только в POST (415_UNSUPPORTED_MEDIA_TYPE)
+  def test_update_not_supported(self):
+    post = Post.objects.create(title='Пост', body='Содержание', author=self.user)
+    url = reverse('post-detail', args=[post.id])
+    body = to_ndjson([{'title': 'Новый', 'body': 'Содержание'}])
+    for method in ('PUT', 'PATCH'):
+      response = self.client.generic(method, url, body, content_type='application/x-ndjson')
+      self.assertEqual(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, response.status_code)
+    self.assertEqual('Пост', Post.objects.get(id=post.id).title)
@@ -0,0 +1,168 @@
+from django.test import override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Like, Post, SubPost
+
+
+class IncludeSubPostsTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.post_1 = Post.objects.create(
+      title='Пост 1',
+      body='Содержание',
+      author=cls.user
+    )
+    cls.post_2 = Post.objects.create(
+      title='Пост 2',
+      body='Содержание',
+      author=cls.user
+    )
+    cls.subposts = [
+      SubPost.objects.create(post=cls.post_1, title=f'Субпост {i}', body='Содержание')
+      for i in range(4)
+    ]
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+
+  # GET без include субпостов в ответе нет
+  def test_without_include(self):
+    response = self.client.get(reverse('post-detail', args=[self.post_1.id]))
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertNotIn('subposts', response.data)
+
+  # GET /posts/{id}/?include=subposts (200_OK)
+  def test_retrieve_include(self):
+    url = reverse('post-detail', args=[self.post_1.id])
+    with self.assertNumQueries(2):
+      response = self.client.get(url, {'include': 'subposts'})
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertEqual(
+      [subpost.id for subpost in self.subposts],
+      [item['id'] for item in response.data['subposts']]
+    )
+    self.assertEqual(self.post_1.id, response.data['subposts'][0]['post'])
+
+  # GET список: лимит субпостов на пост
+  def test_list_include_limit(self):
+    response = self.client.get(reverse('post-list'), {'include': 'subposts', 'subposts_limit': 2})
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    subposts = {item['id']: item['subposts'] for item in response.data['results']}
+    self.assertEqual(
+      [subpost.id for subpost in self.subposts[:2]],
+      [item['id'] for item in subposts[self.post_1.id]]
+    )
+    self.assertEqual([], subposts[self.post_2.id])
+
+  # GET неизвестный include (400_BAD_REQUEST)
+  def test_unknown_include(self):
+    response = self.client.get(reverse('post-list'), {'include': 'comments'})
+
+    self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+  # Изменение субпоста меняет ETag поста с include=subposts
+  def test_etag_changes_on_subpost_update(self):
+    url = reverse('post-detail', args=[self.post_1.id])
+    etag = self.client.get(url, {'include': 'subposts'})['ETag']
+
+    self.client.put(
+      reverse('subpost-detail', args=[self.subposts[0].id]),
+      {'post': self.post_1.id, 'title': 'Обновлен', 'body': 'Текст'},
+      format='json'
+    )
+
+    response = self.client.get(url, {'include': 'subposts'}, HTTP_IF_NONE_MATCH=etag)
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertEqual('Обновлен', response.data['subposts'][0]['title'])
+
+
+class LikedByMeTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.other = User.objects.create_user(
+      username='other_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.posts = [
+      Post.objects.create(title=f'Пост {i}', body='Содержание', author=cls.user)
+      for i in range(3)
+    ]
+    Like.objects.create(user=cls.user, post=cls.posts[0])
+    Like.objects.create(user=cls.other, post=cls.posts[1])
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+
+  # GET список: liked_by_me в том же запросе (200_OK)
+  def test_list_liked_by_me(self):
+    with self.assertNumQueries(2):
+      response = self.client.get(reverse('post-list'), {'include': 'liked_by_me'})
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    flags = {item['id']: item['liked_by_me'] for item in response.data['results']}
+    self.assertEqual({self.posts[0].id: True, self.posts[1].id: False, self.posts[2].id: False}, flags)
+
+  # GET детали: liked_by_me вместе с subposts
+  def test_retrieve_liked_by_me(self):
+    url = reverse('post-detail', args=[self.posts[0].id])
+    response = self.client.get(url, {'include': 'liked_by_me,subposts'})
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertTrue(response.data['liked_by_me'])
+    self.assertEqual([], response.data['subposts'])
+
+  # GET без include флага нет
+  def test_without_include(self):
+    response = self.client.get(reverse('post-detail', args=[self.posts[0].id]))
+
+    self.assertNotIn('liked_by_me', response.data)
+
+  # Кэш ответов: у каждого пользователя свой liked_by_me
+  @override_settings(BLOG_RESPONSE_CACHE={'ENABLED': True})
+  def test_cache_per_user(self):
+    url = reverse('post-detail', args=[self.posts[0].id])
+    self.client.get(url, {'include': 'liked_by_me'})
+
+    self.client.force_authenticate(self.other)
+    response = self.client.get(url, {'include': 'liked_by_me'})
+
+    self.assertEqual('MISS', response['X-Cache'])
+    self.assertFalse(response.data['liked_by_me'])
+
+  # GET /posts/likes-state/?ids=... одним запросом (200_OK)
+  def test_likes_state(self):
+    ids = [post.id for post in self.posts] + [99999]
+    with self.assertNumQueries(1):
+      response = self.client.get(reverse('post-likes-state'), {'ids': ','.join(map(str, ids))})
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertEqual({
+      str(self.posts[0].id): True,
+      str(self.posts[1].id): False,
+      str(self.posts[2].id): False,
+      '99999': False,
+    }, response.data['liked'])
+
+  # GET /posts/likes-state/ некорректные ids (400_BAD_REQUEST)
+  def test_likes_state_invalid(self):
+    url = reverse('post-likes-state')
+    too_many = ','.join(str(i) for i in range(1, 102))
+
+    for ids in ['', '1,abc', too_many, '99999999999999999999999', f'1,{-2 ** 63 - 1}']:
+      response = self.client.get(url, {'ids': ids})
+      self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code, ids)
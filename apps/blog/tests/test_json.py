@@ -0,0 +1,114 @@
+import io
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from apps.blog import parsers, renderers
+from apps.blog.models import Post, SubPost
+from apps.blog.parsers import FastJSONParser
+from apps.blog.renderers import FastJSONRenderer
+from apps.blog.serializers import PostSerializer, SubPostSerializer
+
+
+TEXT = 'Борщ "со свеклой" \\ \n\t\x01\x1f    😀 é'
+
+
+class FastJSONCases:
+  """Общие проверки: с orjson и без него вывод один и тот же"""
+
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(username='пользователь', password='Test_UseR_1_Test')
+    cls.post = Post.objects.create(title=TEXT, body=TEXT * 3, author=cls.user, views_count=7)
+    cls.subpost = SubPost.objects.create(post=cls.post, title=TEXT, body='Текст')
+
+  def assertSameRender(self, data, accepted_media_type=None, renderer_context=None):
+    expected = JSONRenderer().render(data, accepted_media_type, renderer_context)
+    self.assertEqual(expected, FastJSONRenderer().render(data, accepted_media_type, renderer_context))
+
+  # Вывод сериализаторов: даты, кириллица, спецсимволы
+  def test_serializers(self):
+    self.assertSameRender(PostSerializer([self.post], many=True).data)
+    self.assertSameRender(PostSerializer(self.post).data)
+    self.assertSameRender(SubPostSerializer(self.subpost).data)
+    self.assertSameRender({'count': 1, 'next': None, 'results': [PostSerializer(self.post).data]})
+
+  # Типы вне JSON - через encoder_class DRF
+  def test_python_types(self):
+    moment = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc)
+    self.assertSameRender({
+      'datetime': moment,
+      'naive': moment.replace(tzinfo=None, microsecond=0),
+      'date': date(2024, 5, 1),
+      'time': moment.time(),
+      'timedelta': timedelta(hours=1, seconds=3),
+      'decimal': Decimal('1.50'),
+      'uuid': uuid.UUID(int=1),
+      'lazy': gettext_lazy('Текст'),
+      'float': 0.1,
+      1: True,
+      'big': 2 ** 70,
+      'queryset': Post.objects.values_list('id', flat=True),
+    })
+
+  # Отступ и пустой ответ
+  def test_indent_and_empty(self):
+    data = PostSerializer(self.post).data
+    self.assertSameRender(data, 'application/json; indent=4')
+    self.assertSameRender(data, renderer_context={'indent': 2})
+    self.assertSameRender(None)
+
+  # Разбор: тот же результат, ошибки - ParseError
+  def test_parser(self):
+    body = JSONRenderer().render([PostSerializer(self.post).data, {'n': 2 ** 40, 'f': 1.5}])
+    self.assertEqual(JSONParser().parse(io.BytesIO(body)), FastJSONParser().parse(io.BytesIO(body)))
+
+    for invalid in (b'{"a": ', b'', b'NaN', '{"a": "я"}'.encode('cp1251')):
+      with self.assertRaises(ParseError):
+        FastJSONParser().parse(io.BytesIO(invalid))
+
+  # POST /posts/ : тело через FastJSONParser, ответ через FastJSONRenderer
+  def test_endpoint(self):
+    self.client.force_authenticate(self.user)
+    response = self.client.post(reverse('post-list'), {'title': TEXT, 'body': 'Текст'}, format='json')
+
+    self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+    self.assertEqual(TEXT, Post.objects.get(id=response.data['id']).title)
+    self.assertEqual(JSONRenderer().render(response.data), response.content)
+
+
+@skipUnless(renderers.orjson, 'orjson не установлен')
+class OrjsonTestCase(FastJSONCases, APITestCase):
+  # orjson действительно используется
+  def test_uses_orjson(self):
+    with mock.patch.object(renderers, 'orjson', wraps=renderers.orjson) as orjson:
+      FastJSONRenderer().render({'a': 1})
+    orjson.dumps.assert_called_once()
+
+  # float с экспонентой: другая запись, то же значение
+  def test_exponent_floats(self):
+    data = {'rank': 1e-06, 'big': 1e20}
+    content = FastJSONRenderer().render(data)
+
+    self.assertEqual(b'{"rank":1e-6,"big":1e20}', content)
+    self.assertEqual(data, json.loads(content))
+
+
+class StdlibTestCase(FastJSONCases, APITestCase):
+  def setUp(self):
+    for module in (renderers, parsers):
+      patcher = mock.patch.object(module, 'orjson', None)
+      patcher.start()
+      self.addCleanup(patcher.stop)
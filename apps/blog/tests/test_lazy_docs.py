@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from rest_framework.viewsets import ViewSet
+from drf_spectacular.openapi import AutoSchema
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.settings import spectacular_settings
+
+from apps.blog.docs import lazy
+
+
+ROOT = Path(__file__).resolve().parents[3]
+
+# Старт воркера в ленивом режиме: загрузка URL (вьюсеты), затем генерация схемы
+WORKER_SCRIPT = '''
+import sys
+import config.wsgi
+from django.urls import resolve
+resolve('/api/posts/')
+loaded = sorted(m for m in sys.modules if m.startswith(('drf_spectacular.', 'apps.blog.docs.')) and m != 'apps.blog.docs.lazy')
+print(' '.join(loaded))
+
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.settings import spectacular_settings
+schema = spectacular_settings.DEFAULT_GENERATOR_CLASS().get_schema(request=None, public=True)
+sys.stdout.flush()
+sys.stdout.buffer.write(OpenApiJsonRenderer().render(schema, renderer_context={}))
+'''
+
+
+class LazySchemaDocsTestCase(SimpleTestCase):
+  # BLOG_LAZY_SCHEMA_DOCS=1 : docs и drf_spectacular не импортируются при старте, схема та же
+  def test_worker_startup(self):
+    env = {**os.environ, 'SECRET_KEY': 'x', 'BLOG_LAZY_SCHEMA_DOCS': '1'}
+    env.pop('DJANGO_SETTINGS_MODULE', None)
+    result = subprocess.run(
+      [sys.executable, '-c', WORKER_SCRIPT], cwd=ROOT, env=env, capture_output=True, check=True
+    )
+    loaded, content = result.stdout.split(b'\n', 1)
+
+    # Остаются только AppConfig и системная проверка drf_spectacular
+    self.assertEqual(['drf_spectacular.apps', 'drf_spectacular.checks'], loaded.decode().split())
+    schema = spectacular_settings.DEFAULT_GENERATOR_CLASS().get_schema(request=None, public=True)
+    self.assertEqual(OpenApiJsonRenderer().render(schema, renderer_context={}), content)
+
+  # schema_docs : аннотации откладываются до attach_pending_docs()
+  @override_settings(BLOG_LAZY_SCHEMA_DOCS=True)
+  def test_pending(self):
+    class DocsViewSet(ViewSet):
+      @lazy.schema_docs('post_doc.LIST_POSTS_DOCS')
+      def list(self, request):
+        pass
+
+    DocsViewSet = lazy.schema_docs('post_doc.POST_VIEW_SET_DOCS')(DocsViewSet)
+    self.addCleanup(lazy._pending.clear)
+
+    self.assertIsNone(DocsViewSet.schema)
+    self.assertFalse(hasattr(DocsViewSet.list, 'kwargs'))
+
+    lazy.attach_pending_docs()
+    self.assertEqual([], lazy._pending)
+    self.assertIsInstance(DocsViewSet.schema, AutoSchema)
+    self.assertIn('schema', DocsViewSet.list.kwargs)
@@ -1,10 +1,20 @@
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth.models import User
 
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from apps.blog.counters import ViewCountBuffer, view_buffer
 from apps.blog.models import Like, Post
+from apps.blog.services import toggle_like
 
 
 class LikeTestCase(APITestCase):
@@ -50,6 +60,88 @@ class LikeTestCase(APITestCase):
 
     self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
 
+  # POST лайк и снятие лайка меняют likes_count
+  def test_likes_count(self):
+    url = reverse('post-like', kwargs={'pk': self.post_1.id})
+
+    self.client.post(url)
+    self.post_1.refresh_from_db()
+    self.assertEqual(1, self.post_1.likes_count)
+
+    self.client.post(url)
+    self.post_1.refresh_from_db()
+    self.assertEqual(0, self.post_1.likes_count)
+
+  # POST ответ содержит новое состояние и счетчик (200_OK)
+  def test_like_response_state(self):
+    url = reverse('post-like', kwargs={'pk': self.post_1.id})
+
+    response = self.client.post(url)
+    self.assertEqual({'message': 'Вы поставили лайк', 'liked': True, 'likes_count': 1}, response.data)
+
+    response = self.client.post(url)
+    self.assertEqual({'message': 'Лайк убран', 'liked': False, 'likes_count': 0}, response.data)
+
+  # Переключение лайка - не больше двух запросов к данным
+  def test_toggle_two_statements(self):
+    self.client.force_authenticate(self.user)
+    url = reverse('post-like', kwargs={'pk': self.post_1.id})
+
+    for _ in range(2):
+      with CaptureQueriesContext(connection) as ctx:
+        self.client.post(url)
+      statements = [
+        q['sql'] for q in ctx.captured_queries
+        if 'blog_like' in q['sql'] or 'blog_post' in q['sql']
+      ]
+      self.assertEqual(2, len(statements))
+
+  # Конфликт при вставке лайка: откат счетчика и повтор
+  def test_toggle_retry_on_conflict(self):
+    real_create = Like.objects.create
+    calls = []
+
+    def create(**kwargs):
+      calls.append(kwargs)
+      if len(calls) == 1:
+        raise IntegrityError('UNIQUE constraint failed')
+      return real_create(**kwargs)
+
+    with mock.patch.object(Like.objects, 'create', side_effect=create):
+      liked, likes_count = toggle_like(self.user.id, self.post_1.id)
+
+    self.assertTrue(liked)
+    self.assertEqual(1, likes_count)
+    self.assertEqual(2, len(calls))
+    self.post_1.refresh_from_db()
+    self.assertEqual(1, self.post_1.likes_count)
+
+  # Расхождение счетчика с лайками не уводит его ниже нуля
+  def test_unlike_with_zero_count(self):
+    Like.objects.create(user=self.user, post=self.post_1)
+    url = reverse('post-like', kwargs={'pk': self.post_1.id})
+
+    response = self.client.post(url)
+
+    self.assertFalse(response.data['liked'])
+    self.assertEqual(0, response.data['likes_count'])
+    self.assertFalse(Like.objects.filter(user=self.user, post=self.post_1).exists())
+
+  # Команда rebuild_likes_count пересчитывает счетчик
+  def test_rebuild_likes_count(self):
+    user_1 = User.objects.create_user(
+      username='test_user_1',
+      password='Test_UseR_1_Test'
+    )
+    Like.objects.create(user=self.user, post=self.post_1)
+    Like.objects.create(user=user_1, post=self.post_1)
+    Post.objects.filter(id=self.post_1.id).update(likes_count=100)
+
+    call_command('rebuild_likes_count', stdout=StringIO())
+
+    self.post_1.refresh_from_db()
+    self.assertEqual(2, self.post_1.likes_count)
+
 
 class ViewTestCase(APITestCase):
   @classmethod
@@ -74,4 +166,91 @@ class ViewTestCase(APITestCase):
     response = self.client.get(url)
     self.post_1.refresh_from_db()
     self.assertEqual(response.status_code, status.HTTP_200_OK)
-    self.assertEqual(self.post_1.views_count, 1)
\ No newline at end of file
+    self.assertEqual(self.post_1.views_count, 1)
+
+
+@override_settings(BLOG_VIEW_BUFFER={'ENABLED': True, 'MAX_PENDING': 3, 'FLUSH_INTERVAL': 3600})
+class ViewBufferTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user', 
+      password='Test_UseR_1_Test'
+    )
+    cls.post_1 = Post.objects.create(
+      title='Пост 1', 
+      body='Содержание',
+      author=cls.user
+    )
+    cls.post_2 = Post.objects.create(
+      title='Пост 2', 
+      body='Содержание',
+      author=cls.user
+    )
+
+  def setUp(self):
+    self.client.force_login(self.user)
+    view_buffer.flush()
+    self.addCleanup(view_buffer.flush)
+
+  # GET просмотр копится в буфере, в БД не пишется (200_OK)
+  def test_view_buffered(self):
+    url = reverse('post-add-view', args=[self.post_1.pk])
+    response = self.client.get(url)
+
+    self.post_1.refresh_from_db()
+    self.assertEqual(response.status_code, status.HTTP_200_OK)
+    self.assertEqual(0, self.post_1.views_count)
+    self.assertEqual(1, view_buffer.pending(self.post_1.pk))
+
+  # GET порог MAX_PENDING сбрасывает буфер одним запросом
+  def test_flush_on_threshold(self):
+    self.client.get(reverse('post-add-view', args=[self.post_1.pk]))
+    self.client.get(reverse('post-add-view', args=[self.post_2.pk]))
+    self.client.get(reverse('post-add-view', args=[self.post_1.pk]))
+
+    self.post_1.refresh_from_db()
+    self.post_2.refresh_from_db()
+    self.assertEqual(2, self.post_1.views_count)
+    self.assertEqual(1, self.post_2.views_count)
+    self.assertEqual({}, view_buffer.pending())
+
+  # flush: один UPDATE на все посты
+  def test_flush_single_update(self):
+    view_buffer.add(self.post_1.pk)
+    view_buffer.add(self.post_2.pk)
+
+    with CaptureQueriesContext(connection) as ctx:
+      view_buffer.flush()
+
+    updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+    self.assertEqual(1, len(updates))
+
+  # GET нет такого поста (404_NOT_FOUND)
+  def test_view_not_found(self):
+    url = reverse('post-add-view', args=[99999])
+    response = self.client.get(url)
+
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+    self.assertEqual({}, view_buffer.pending())
+
+  # Без новых просмотров буфер сбрасывается таймером через FLUSH_INTERVAL
+  @override_settings(BLOG_VIEW_BUFFER={'ENABLED': True, 'MAX_PENDING': 100, 'FLUSH_INTERVAL': 0.05})
+  def test_flush_on_timer(self):
+    buffer = ViewCountBuffer()
+    written = threading.Event()
+    with mock.patch.object(buffer, 'write', side_effect=lambda pending: written.set()) as write:
+      buffer.add(self.post_1.pk)
+      buffer.add(self.post_1.pk)
+      self.assertTrue(written.wait(5))
+
+    write.assert_called_once_with({self.post_1.pk: 2})
+    self.assertEqual({}, buffer.pending())
+
+  # Сброс по порогу отменяет таймер
+  @override_settings(BLOG_VIEW_BUFFER={'ENABLED': True, 'MAX_PENDING': 1, 'FLUSH_INTERVAL': 3600})
+  def test_threshold_cancels_timer(self):
+    buffer = ViewCountBuffer()
+    with mock.patch.object(buffer, 'write'):
+      buffer.add(self.post_1.pk)
+    self.assertIsNone(buffer._timer)
@@ -0,0 +1,114 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post
+from apps.blog.pagination import PostCursorPagination
+
+
+class PostCursorPaginationTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    # Одинаковый create_at у части постов: порядок решает id
+    now = timezone.now()
+    cls.posts = []
+    for i in range(7):
+      post = Post.objects.create(
+        title=f'Пост {i}',
+        body='Содержание',
+        author=cls.user
+      )
+      cls.posts.append(post)
+    for i, post in enumerate(cls.posts):
+      Post.objects.filter(id=post.id).update(create_at=now - timedelta(minutes=i // 2))
+
+  def setUp(self):
+    self.client.force_login(self.user)
+    self.url = reverse('post-list')
+
+  def expected_ids(self):
+    return list(Post.objects.order_by('-create_at', '-id').values_list('id', flat=True))
+
+  def collect_pages(self, url):
+    ids = []
+    pages = 0
+    while url:
+      response = self.client.get(url)
+      self.assertEqual(status.HTTP_200_OK, response.status_code)
+      ids.extend(item['id'] for item in response.data['results'])
+      url = response.data['next']
+      pages += 1
+    return ids, pages
+
+  # GET все страницы по курсору (200_OK)
+  def test_walk_all_pages(self):
+    ids, pages = self.collect_pages(f'{self.url}?pagination=cursor')
+
+    self.assertEqual(self.expected_ids(), ids)
+    self.assertEqual(3, pages)
+
+  # GET первая страница без count
+  def test_first_page(self):
+    response = self.client.get(self.url, {'pagination': 'cursor'})
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertNotIn('count', response.data)
+    self.assertIsNone(response.data['previous'])
+    self.assertEqual(PostCursorPagination.page_size, len(response.data['results']))
+
+  # GET новые посты не сдвигают следующие страницы
+  def test_insert_between_pages(self):
+    response = self.client.get(self.url, {'pagination': 'cursor'})
+    first_ids = [item['id'] for item in response.data['results']]
+    expected_rest = self.expected_ids()[len(first_ids):]
+
+    Post.objects.create(title='Новый', body='Содержание', author=self.user)
+
+    rest_ids, _ = self.collect_pages(response.data['next'])
+    self.assertEqual(expected_rest, rest_ids)
+
+  # GET ссылка previous возвращает предыдущую страницу
+  def test_previous_link(self):
+    first = self.client.get(self.url, {'pagination': 'cursor'})
+    second = self.client.get(first.data['next'])
+    back = self.client.get(second.data['previous'])
+
+    self.assertEqual(first.data['results'], back.data['results'])
+    self.assertIsNone(back.data['previous'])
+
+  # GET некорректный курсор (404_NOT_FOUND)
+  def test_invalid_cursor(self):
+    response = self.client.get(self.url, {'cursor': 'не-курсор'})
+
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    # id больше BIGINT
+    payload = json.dumps({'t': '2024-01-01T00:00:00+00:00', 'i': 10 ** 25}).encode()
+    response = self.client.get(self.url, {'cursor': base64.urlsafe_b64encode(payload).decode()})
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+  # Курсор постоянной стоимости: нет COUNT(*) и OFFSET
+  def test_page_without_count_and_offset(self):
+    first = self.client.get(self.url, {'pagination': 'cursor'})
+    next_url = first.data['next']
+
+    with CaptureQueriesContext(connection) as ctx:
+      self.client.get(next_url)
+
+    post_queries = [q['sql'] for q in ctx.captured_queries if 'FROM "blog_post"' in q['sql']]
+    self.assertEqual(1, len(post_queries))
+    self.assertNotIn('COUNT(', post_queries[0])
+    self.assertNotIn('OFFSET', post_queries[0])
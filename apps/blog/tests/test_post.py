@@ -94,6 +94,20 @@ class PostApiTestCase(APITestCase):
     self.assertEqual(status.HTTP_200_OK, response.status_code)
     self.assertEqual(serializer_data, response.data['results'])
 
+  # GET ?author=id только посты автора (200_OK)
+  def test_get_author_filter(self):
+    response = self.client.get(reverse('post-list'), {'author': self.user_1.id})
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertEqual([self.post_5.id], [item['id'] for item in response.data['results']])
+
+  # GET ?author=abc или id больше BIGINT (400_BAD_REQUEST)
+  def test_get_author_filter_invalid(self):
+    for author in ('abc', '99999999999999999999999'):
+      response = self.client.get(reverse('post-list'), {'author': author})
+
+      self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code, author)
+
   # POST Одиночное создание (201_CREATED)
   def test_create_post(self):
     url = reverse('post-list')
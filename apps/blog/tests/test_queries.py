@@ -0,0 +1,168 @@
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post, SubPost, Like
+
+
+class QueryBudgetTestCase(APITestCase):
+  """
+  Бюджет запросов для list/retrieve: не зависит от количества строк
+
+  force_authenticate: без запросов сессии и пользователя
+  """
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.users = [
+      User.objects.create_user(username=f'author_{i}', password='Test_UseR_1_Test')
+      for i in range(5)
+    ]
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+
+  def create_posts(self, count):
+    posts = []
+    for i in range(count):
+      post = Post.objects.create(
+        title=f'Пост {i}',
+        body='Содержание',
+        author=self.users[i % len(self.users)]
+      )
+      SubPost.objects.create(post=post, title='Субпост', body='Содержание')
+      Like.objects.create(user=self.user, post=post)
+      posts.append(post)
+    return posts
+
+  def assert_budget(self, budget, url, data=None):
+    with self.assertNumQueries(budget):
+      response = self.client.get(url, data)
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    return response
+
+  # GET /posts/ : COUNT + страница с автором
+  def test_post_list(self):
+    self.create_posts(2)
+    self.assert_budget(2, reverse('post-list'))
+
+    self.create_posts(10)
+    response = self.assert_budget(2, reverse('post-list'), {'page': 2})
+    self.assertEqual(3, len(response.data['results']))
+
+  # GET /posts/?pagination=cursor : только страница
+  def test_post_list_cursor(self):
+    self.create_posts(12)
+    first = self.assert_budget(1, reverse('post-list'), {'pagination': 'cursor'})
+    self.assert_budget(1, first.data['next'])
+
+  # GET /posts/?include=subposts : COUNT + страница + один prefetch субпостов
+  def test_post_list_include_subposts(self):
+    self.create_posts(2)
+    self.assert_budget(3, reverse('post-list'), {'include': 'subposts'})
+
+    self.create_posts(10)
+    self.assert_budget(3, reverse('post-list'), {'include': 'subposts', 'subposts_limit': 1})
+
+  # GET /posts/{id}/
+  def test_post_retrieve(self):
+    post = self.create_posts(1)[0]
+    self.assert_budget(1, reverse('post-detail', args=[post.id]))
+
+  # GET /subposts/ : COUNT + страница
+  def test_subpost_list(self):
+    self.create_posts(2)
+    self.assert_budget(2, reverse('subpost-list'))
+
+    self.create_posts(25)
+    response = self.assert_budget(2, reverse('subpost-list'))
+    self.assertEqual(20, len(response.data['results']))
+
+  # GET /subposts/{id}/
+  def test_subpost_retrieve(self):
+    post = self.create_posts(1)[0]
+    subpost = post.sub_posts.first()
+    self.assert_budget(1, reverse('subpost-detail', args=[subpost.id]))
+
+
+class WriteQueryBudgetTestCase(APITestCase):
+  """
+  Бюджет запросов для изменений: строка поста читается один раз,
+  владелец сравнивается по author_id (без запроса за User)
+  """
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(username='test_user', password='Test_UseR_1_Test')
+    cls.other = User.objects.create_user(username='other_user', password='Test_UseR_1_Test')
+    cls.post = Post.objects.create(title='Пост', body='Содержание', author=cls.user)
+    cls.foreign_post = Post.objects.create(title='Чужой пост', body='Содержание', author=cls.other)
+    cls.subpost = SubPost.objects.create(post=cls.post, title='Субпост', body='Содержание')
+    cls.foreign_subpost = SubPost.objects.create(post=cls.foreign_post, title='Субпост', body='Содержание')
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+
+  def assert_budget(self, budget, expected_status, method, url, data=None):
+    with self.assertNumQueries(budget):
+      response = getattr(self.client, method)(url, data, format='json')
+    self.assertEqual(expected_status, response.status_code)
+    return response
+
+  # PATCH /posts/{id}/ : SELECT поста с автором + UPDATE
+  def test_post_update(self):
+    url = reverse('post-detail', args=[self.post.id])
+    self.assert_budget(2, status.HTTP_200_OK, 'patch', url, {'title': 'Новый'})
+
+  # PUT /posts/{id}/ с субпостами : пост читается и пишется один раз (+ MAX(position) для новых)
+  def test_post_update_with_subposts(self):
+    url = reverse('post-detail', args=[self.post.id])
+    data = {
+      'title': 'Новый',
+      'body': 'Содержание',
+      'subposts': [{'id': self.subpost.id, 'title': 'Обновлен'}, {'title': 'Новый', 'body': 'Текст'}],
+    }
+    with self.assertNumQueries(9) as queries:
+      response = self.client.put(url, data, format='json')
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    post_queries = [q['sql'] for q in queries.captured_queries if q['sql'].startswith(('SELECT "blog_post"', 'UPDATE "blog_post"'))]
+    self.assertEqual(2, len(post_queries))
+
+  # PATCH / DELETE чужого поста : 403 после одного SELECT
+  def test_post_foreign(self):
+    url = reverse('post-detail', args=[self.foreign_post.id])
+    self.assert_budget(1, status.HTTP_403_FORBIDDEN, 'patch', url, {'title': 'Новый'})
+    self.assert_budget(1, status.HTTP_403_FORBIDDEN, 'delete', url)
+
+  # POST /subposts/ : SELECT поста (поле post) + MAX(position) + INSERT + UPDATE update_at поста
+  def test_subpost_create(self):
+    data = {'post': self.post.id, 'title': 'Субпост', 'body': 'Текст'}
+    self.assert_budget(4, status.HTTP_201_CREATED, 'post', reverse('subpost-list'), data)
+
+  # POST /subposts/ в чужой пост : 403 после одного SELECT
+  def test_subpost_create_foreign(self):
+    data = {'post': self.foreign_post.id, 'title': 'Субпост', 'body': 'Текст'}
+    self.assert_budget(1, status.HTTP_403_FORBIDDEN, 'post', reverse('subpost-list'), data)
+
+  # PUT /subposts/{id}/ : SELECT субпоста с автором поста, SELECT поста (поле post), 2 UPDATE
+  def test_subpost_update(self):
+    url = reverse('subpost-detail', args=[self.subpost.id])
+    data = {'post': self.post.id, 'title': 'Обновлен', 'body': 'Текст'}
+    self.assert_budget(4, status.HTTP_200_OK, 'put', url, data)
+
+  # PUT / DELETE чужого субпоста, перенос субпоста в чужой пост : 403
+  def test_subpost_foreign(self):
+    url = reverse('subpost-detail', args=[self.foreign_subpost.id])
+    data = {'post': self.foreign_post.id, 'title': 'Обновлен', 'body': 'Текст'}
+    self.assert_budget(1, status.HTTP_403_FORBIDDEN, 'put', url, data)
+    self.assert_budget(1, status.HTTP_403_FORBIDDEN, 'delete', url)
+
+    url = reverse('subpost-detail', args=[self.subpost.id])
+    data = {'post': self.foreign_post.id, 'title': 'Обновлен', 'body': 'Текст'}
+    self.assert_budget(2, status.HTTP_403_FORBIDDEN, 'put', url, data)
+    self.assertEqual(self.post.id, SubPost.objects.get(id=self.subpost.id).post_id)
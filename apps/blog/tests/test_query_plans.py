@@ -0,0 +1,165 @@
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post, SubPost, Like
+from apps.blog.trending import refresh_scores
+
+
+# Полный проход по таблице без индекса: "SCAN blog_post"
+BARE_SCAN_RE = re.compile(r'^SCAN (\w+)$')
+INNER_PARENS_RE = re.compile(r'\([^()]*\)')
+
+
+def outer_sql(sql):
+  """SQL без подзапросов и выражений в скобках"""
+  while True:
+    stripped = INNER_PARENS_RE.sub('', sql)
+    if stripped == sql:
+      return sql.upper()
+    sql = stripped
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN есть только в SQLite')
+class QueryPlanTestCase(APITestCase):
+  """
+  Планы запросов эндпоинтов (EXPLAIN QUERY PLAN) на заполненной базе
+
+  Запрещены:
+  - USE TEMP B-TREE: сортировка/группировка без подходящего индекса.
+    Исключение - сортировка результата подзапроса (срез prefetch
+    через ROW_NUMBER): строк в нем не больше страницы * лимита;
+  - SCAN таблицы без индекса, кроме прохода по первичному ключу
+    с LIMIT и без WHERE (страница в порядке id).
+  """
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    authors = [
+      User.objects.create_user(username=f'author_{i}', password='Test_UseR_1_Test')
+      for i in range(5)
+    ]
+    posts = Post.objects.bulk_create([
+      Post(title=f'Пост {i}', body='Содержание', author=authors[i % len(authors)], views_count=i)
+      for i in range(200)
+    ])
+    SubPost.objects.bulk_create([
+      SubPost(post=post, title=f'Субпост {j}', body='Содержание')
+      for post in posts
+      for j in range(3)
+    ])
+    Like.objects.bulk_create([Like(user=cls.user, post=post) for post in posts[::2]])
+    Post.objects.update(activity_at=timezone.now())
+    refresh_scores()
+    # Статистика для планировщика, как на рабочей базе
+    with connection.cursor() as cursor:
+      cursor.execute('ANALYZE')
+
+    cls.tables = set(connection.introspection.table_names())
+    cls.post = posts[10]
+    cls.author = authors[0]
+    cls.subpost = SubPost.objects.filter(post=cls.post).first()
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+
+  def explain(self, sql):
+    with connection.cursor() as cursor:
+      cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+      # (id, parent, notused, detail)
+      return cursor.fetchall()
+
+  def reads_tables(self, plan, parent):
+    """Читает ли узел плана parent строки таблиц (а не подзапроса)"""
+    for _, row_parent, _, detail in plan:
+      if row_parent == parent and detail.startswith(('SCAN ', 'SEARCH ')):
+        if detail.split()[1] in self.tables:
+          return True
+    return False
+
+  def get_plan_problems(self, sql, plan):
+    problems = []
+    upper_sql = outer_sql(sql)
+    for _, parent, _, detail in plan:
+      if 'USE TEMP B-TREE' in detail:
+        if self.reads_tables(plan, parent):
+          problems.append(detail)
+        continue
+      match = BARE_SCAN_RE.match(detail)
+      if match and match.group(1) in self.tables and not ('LIMIT' in upper_sql and ' WHERE ' not in upper_sql):
+        problems.append(detail)
+    return problems
+
+  def assert_plans(self, url, data=None):
+    with CaptureQueriesContext(connection) as ctx:
+      response = self.client.get(url, data)
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    selects = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT')]
+    self.assertTrue(selects)
+    for sql in selects:
+      plan = self.explain(sql)
+      problems = self.get_plan_problems(sql, plan)
+      self.assertFalse(problems, f'{url} {data}\n{sql}\n' + '\n'.join(row[-1] for row in plan))
+    return response
+
+  # Проверка самой проверки: сортировка по полю без индекса
+  def test_detects_problems(self):
+    sql = 'SELECT * FROM blog_post WHERE views_count > 10 ORDER BY title'
+    problems = self.get_plan_problems(sql, self.explain(sql))
+
+    self.assertIn('USE TEMP B-TREE FOR ORDER BY', problems)
+    self.assertIn('SCAN blog_post', problems)
+
+  # GET /posts/
+  def test_post_list(self):
+    self.assert_plans(reverse('post-list'))
+    self.assert_plans(reverse('post-list'), {'page': 5})
+
+  # GET /posts/?pagination=cursor
+  def test_post_list_cursor(self):
+    first = self.assert_plans(reverse('post-list'), {'pagination': 'cursor'})
+    second = self.assert_plans(first.data['next'])
+    self.assert_plans(second.data['previous'])
+
+  # GET /posts/?author=id
+  def test_post_list_author(self):
+    self.assert_plans(reverse('post-list'), {'author': self.author.id})
+    self.assert_plans(reverse('post-list'), {'author': self.author.id, 'pagination': 'cursor'})
+
+  # GET /posts/?include=subposts,liked_by_me
+  def test_post_list_include(self):
+    self.assert_plans(reverse('post-list'), {'include': 'subposts,liked_by_me'})
+    self.assert_plans(reverse('post-list'), {'include': 'subposts', 'subposts_limit': 2})
+
+  # GET /posts/{id}/
+  def test_post_retrieve(self):
+    self.assert_plans(reverse('post-detail', args=[self.post.id]), {'include': 'subposts,liked_by_me'})
+
+  # GET /posts/trending/
+  def test_trending(self):
+    self.assert_plans(reverse('post-trending'))
+
+  # GET /posts/likes-state/
+  def test_likes_state(self):
+    self.assert_plans(reverse('post-likes-state'), {'ids': f'{self.post.id},{self.post.id + 1}'})
+
+  # GET /subposts/ и /subposts/?post=id
+  def test_subpost_list(self):
+    self.assert_plans(reverse('subpost-list'))
+    self.assert_plans(reverse('subpost-list'), {'post': self.post.id})
+
+  # GET /subposts/{id}/
+  def test_subpost_retrieve(self):
+    self.assert_plans(reverse('subpost-detail', args=[self.subpost.id]))
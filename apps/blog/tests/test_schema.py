@@ -0,0 +1,99 @@
+import gzip
+import json
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from apps.blog import schema
+from drf_spectacular.views import SpectacularAPIView
+
+
+class CachedSchemaTestCase(APITestCase):
+  def setUp(self):
+    directory = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, directory)
+    settings = override_settings(BLOG_SCHEMA_CACHE={'DIR': directory, 'VERSION': 'v1'})
+    settings.enable()
+    self.addCleanup(settings.disable)
+    schema._loaded.clear()
+    self.addCleanup(schema._loaded.clear)
+
+  def generated(self, **params):
+    # Схема без кэша - как отдавал SpectacularAPIView
+    request = APIRequestFactory().get(reverse('schema'), **params)
+    response = SpectacularAPIView.as_view()(request)
+    return response.render()
+
+  # GET /schema/ : тот же YAML, что генерирует SpectacularAPIView
+  def test_yaml(self):
+    response = self.client.get(reverse('schema'))
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    expected = self.generated()
+    self.assertEqual(expected.content, response.content)
+    self.assertEqual(expected['Content-Type'], response['Content-Type'])
+    self.assertEqual(expected['Content-Disposition'], response['Content-Disposition'])
+
+  # GET /schema/?format=json и Accept: application/json : JSON
+  def test_json(self):
+    response = self.client.get(reverse('schema'), {'format': 'json'})
+    self.assertEqual('Blog Lite API', json.loads(response.content)['info']['title'])
+
+    response = self.client.get(reverse('schema'), HTTP_ACCEPT='application/json')
+    self.assertEqual(self.generated(HTTP_ACCEPT='application/json').content, response.content)
+
+  # If-None-Match : 304
+  def test_etag(self):
+    etag = self.client.get(reverse('schema'))['ETag']
+    response = self.client.get(reverse('schema'), HTTP_IF_NONE_MATCH=etag)
+
+    self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+    self.assertEqual(b'', response.content)
+
+  # Accept-Encoding: gzip : сжатый файл
+  def test_gzip(self):
+    plain = self.client.get(reverse('schema'))
+    response = self.client.get(reverse('schema'), HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+    self.assertEqual('gzip', response['Content-Encoding'])
+    self.assertIn('Accept-Encoding', response['Vary'])
+    self.assertNotEqual(plain['ETag'], response['ETag'])
+    self.assertEqual(plain.content, gzip.decompress(response.content))
+
+  # Генерация один раз на версию; новая версия - новые файлы
+  def test_generated_once_per_version(self):
+    with mock.patch.object(schema, 'build_schema', wraps=schema.build_schema) as build:
+      self.client.get(reverse('schema'))
+      self.client.get(reverse('schema'), {'format': 'json'})
+      self.assertEqual(1, build.call_count)
+
+      with override_settings(BLOG_SCHEMA_CACHE={**schema.get_schema_cache_settings(), 'VERSION': 'v2'}):
+        response = self.client.get(reverse('schema'))
+      self.assertEqual(2, build.call_count)
+
+    self.assertIn('v2', response['ETag'])
+    self.assertFalse(schema.schema_path('v1', 'yaml').exists())
+
+  # python manage.py build_schema
+  def test_command(self):
+    out = StringIO()
+    call_command('build_schema', stdout=out)
+    self.assertTrue(schema.schema_path('v1', 'yaml').exists())
+    self.assertTrue(schema.schema_path('v1', 'json', compressed=True).exists())
+
+    call_command('build_schema', stdout=out)
+    self.assertIn('уже собрана', out.getvalue())
+
+  # Версия кода зависит от исходников
+  def test_code_version(self):
+    version = schema.get_code_version()
+    self.assertEqual(version, schema.get_code_version())
+    self.assertRegex(version, r'^[0-9a-f]{16}$')
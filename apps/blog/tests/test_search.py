@@ -0,0 +1,91 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post, SubPost
+from apps.blog.search import SEARCH_TABLE
+
+
+class SearchTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.post_1 = Post.objects.create(
+      title='Заметки о Django',
+      body='Пишем API на Django REST framework',
+      author=cls.user
+    )
+    cls.post_2 = Post.objects.create(
+      title='Рецепт борща',
+      body='Свекла, капуста и немного терпения',
+      author=cls.user
+    )
+    cls.subpost_1 = SubPost.objects.create(
+      post=cls.post_2,
+      title='Шаг 1',
+      body='Обжарить свеклу на сковороде',
+    )
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+    self.url = reverse('post-search')
+
+  def search(self, q):
+    response = self.client.get(self.url, {'q': q})
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    return response.data['results']
+
+  # GET поиск по посту со сниппетом (200_OK)
+  def test_search_post(self):
+    results = self.search('django')
+
+    self.assertEqual(1, len(results))
+    self.assertEqual(self.post_1.id, results[0]['post'])
+    self.assertIsNone(results[0]['subpost'])
+    self.assertIn('<mark>Django</mark>', results[0]['snippet'])
+
+  # GET поиск по префиксу находит субпост
+  def test_search_subpost_prefix(self):
+    results = self.search('свекл')
+
+    self.assertEqual({(self.post_2.id, None), (self.post_2.id, self.subpost_1.id)},
+                     {(item['post'], item['subpost']) for item in results})
+
+  # Индекс следит за изменениями и удалением (триггеры)
+  def test_index_sync(self):
+    self.post_1.body = 'Теперь про Flask'
+    self.post_1.save()
+    self.assertEqual([], self.search('django rest'))
+    self.assertEqual(self.post_1.id, self.search('flask')[0]['post'])
+
+    self.post_2.delete()
+    self.assertEqual([], self.search('свекл'))
+
+  # Синтаксис FTS5 в запросе не ломает поиск
+  def test_search_special_chars(self):
+    self.assertEqual([], self.search('"NEAR( AND *'))
+
+  # GET без q (400_BAD_REQUEST)
+  def test_search_without_query(self):
+    response = self.client.get(self.url)
+
+    self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+  # Команда rebuild_search_index
+  def test_rebuild_command(self):
+    with connection.cursor() as cursor:
+      cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    self.assertEqual([], self.search('django'))
+
+    call_command('rebuild_search_index', stdout=StringIO())
+
+    self.assertEqual(self.post_1.id, self.search('django')[0]['post'])
@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, F
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.blog.models import Like, Post, SubPost
+from apps.blog.search import search
+
+
+class SeedBlogTestCase(TestCase):
+  def seed(self, **options):
+    out = StringIO()
+    call_command('seed_blog', stdout=out, **options)
+    return out.getvalue()
+
+  def index_names(self):
+    with connection.cursor() as cursor:
+      cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger') ORDER BY name")
+      return [row[0] for row in cursor.fetchall()]
+
+  # Количество строк и отчет о скорости
+  def test_seed_counts(self):
+    output = self.seed(users=20, posts=50, subposts_min=1, subposts_max=3, chunk_size=20)
+
+    self.assertEqual(20, User.objects.count())
+    self.assertEqual(50, Post.objects.count())
+    subposts = SubPost.objects.count()
+    self.assertGreaterEqual(subposts, 50)
+    self.assertLessEqual(subposts, 150)
+    self.assertIn('строк/с', output)
+
+  # likes_count совпадает с лайками, лайки распределены неравномерно
+  def test_seed_likes(self):
+    self.seed(users=30, posts=100, likes_per_post=3)
+
+    mismatched = Post.objects.annotate(total=Count('likes')).exclude(total=F('likes_count'))
+    self.assertFalse(mismatched.exists())
+    counts = sorted(Post.objects.values_list('likes_count', flat=True), reverse=True)
+    self.assertGreater(counts[0], counts[len(counts) // 2] * 3)
+    self.assertLessEqual(counts[0], 30)
+
+  # Повторный запуск досоздает данные после существующих
+  def test_seed_append(self):
+    self.seed(users=5, posts=10)
+    self.seed(users=0, posts=10)
+
+    self.assertEqual(5, User.objects.count())
+    self.assertEqual(20, Post.objects.count())
+    self.assertEqual(Like.objects.count(), sum(Post.objects.values_list('likes_count', flat=True)))
+
+  # --defer-indexes: индексы, триггеры и поиск восстановлены
+  def test_seed_defer_indexes(self):
+    before = self.index_names()
+
+    self.seed(users=5, posts=30, defer_indexes=True)
+
+    self.assertEqual(before, self.index_names())
+    post = Post.objects.first()
+    word = post.title.split()[-1]
+    self.assertIn(post.id, [item['post'] for item in search(word, 100)])
@@ -51,7 +51,8 @@ class PostSerializerTestCase(TestCase):
         'body': 'Содержание',
         'create_at': format_dt(post_1.create_at),
         'update_at': format_dt(post_1.update_at),
-        'views_count': 0
+        'views_count': 0,
+        'likes_count': 0
       },
       {
         'id': post_2.id,
@@ -60,7 +61,8 @@ class PostSerializerTestCase(TestCase):
         'body': 'Содержание',
         'create_at': format_dt(post_2.create_at),
         'update_at': format_dt(post_2.update_at),
-        'views_count': 0
+        'views_count': 0,
+        'likes_count': 0
       }
     ]
 
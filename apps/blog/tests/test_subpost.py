@@ -61,12 +61,53 @@ class SubPostApiTestCase(APITestCase):
 
     self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+  # POST без post (400_BAD_REQUEST)
+  def test_create_without_post(self):
+    self.client.force_login(self.user)
+    response = self.client.post(self.url_list, {'title': 'Подпост 1', 'body': 'Содержание'})
+
+    self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertIn('post', response.data)
+
   # GET (200_OK)
   def test_get(self):
     self.client.force_login(self.user)
     response = self.client.get(self.url_list)
     self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+  # GET ?post=id субпосты поста по позиции (200_OK)
+  def test_get_post_filter(self):
+    subpost_2 = SubPost.objects.create(post=self.post_2, title='Подпост 2', body='Содержание')
+    subpost_3 = SubPost.objects.create(post=self.post_2, title='Подпост 3', body='Содержание')
+    self.client.force_login(self.user)
+
+    response = self.client.get(self.url_list, {'post': self.post_2.id})
+
+    self.assertEqual(response.status_code, status.HTTP_200_OK)
+    self.assertEqual([subpost_2.id, subpost_3.id], [item['id'] for item in response.data['results']])
+
+  # GET ?post=id больше BIGINT (400_BAD_REQUEST)
+  def test_get_post_filter_invalid(self):
+    self.client.force_login(self.user)
+    response = self.client.get(self.url_list, {'post': '99999999999999999999999'})
+
+    self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertIn('post', response.data)
+
+  # PUT с другим постом: субпост встает в конец нового поста (200_OK)
+  def test_put_move_to_other_post(self):
+    self.client.force_login(self.user)
+    for title in ('Подпост 2', 'Подпост 3'):
+      self.client.post(self.url_list, {'post': self.post_2.id, 'title': title, 'body': 'Содержание'})
+    data = {'post': self.post_2.id, 'title': 'Подпост 1', 'body': 'Содержание'}
+    response = self.client.put(self.url_detail, data)
+
+    self.assertEqual(response.status_code, status.HTTP_200_OK)
+    ids = list(SubPost.objects.filter(post=self.post_2).order_by('position', 'id').values_list('id', flat=True))
+    self.assertEqual(self.subpost_1.id, ids[-1])
+    positions = SubPost.objects.filter(post=self.post_2).values_list('position', flat=True)
+    self.assertEqual(3, len(set(positions)))
+
   # PUT (200_OK)
   def test_put(self):
     self.client.force_login(self.user)
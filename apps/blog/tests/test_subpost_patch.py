@@ -0,0 +1,175 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post, SubPost
+from apps.blog.subpost_patch import POSITION_STEP
+
+
+class SubPostPatchTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(username='user', password='Test_UseR_1_Test')
+    cls.user_1 = User.objects.create_user(username='user_1', password='Test_UseR_1_Test')
+    cls.post = Post.objects.create(title='Пост', body='Содержание', author=cls.user)
+    cls.other_post = Post.objects.create(title='Другой пост', body='Содержание', author=cls.user)
+    cls.subposts = [
+      SubPost.objects.create(post=cls.post, title=f'Субпост {i}', body='Содержание', position=i * POSITION_STEP)
+      for i in range(1, 4)
+    ]
+    cls.other_subpost = SubPost.objects.create(post=cls.other_post, title='Чужой', body='Содержание')
+
+  def setUp(self):
+    self.client.force_login(self.user)
+
+  def patch(self, operations, post=None):
+    url = reverse('post-patch-subposts', args=[(post or self.post).id])
+    return self.client.patch(url, {'operations': operations}, format='json')
+
+  def order(self, post=None):
+    response = self.client.get(reverse('subpost-list'), {'post': (post or self.post).id, 'page_size': 1000})
+    return [item['id'] for item in response.data['results']]
+
+  # PATCH add в конец, после id и в начало (200_OK)
+  def test_add(self):
+    first, second, third = (subpost.id for subpost in self.subposts)
+    response = self.patch([
+      {'op': 'add', 'title': 'В конец', 'body': 'Текст'},
+      {'op': 'add', 'title': 'После первого', 'body': 'Текст', 'after': first},
+      {'op': 'add', 'title': 'В начало', 'body': 'Текст', 'after': None},
+    ])
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    end, after_first, start = (item['id'] for item in response.data['operations'])
+    self.assertEqual(['add'] * 3, [item['op'] for item in response.data['operations']])
+    self.assertEqual([start, first, after_first, second, third, end], self.order())
+    self.assertEqual('После первого', SubPost.objects.get(id=after_first).title)
+
+  # PATCH update и remove (200_OK)
+  def test_update_remove(self):
+    first, second, third = (subpost.id for subpost in self.subposts)
+    response = self.patch([
+      {'op': 'update', 'id': first, 'body': 'Новый текст'},
+      {'op': 'remove', 'id': second},
+    ])
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertEqual([{'op': 'update', 'id': first}, {'op': 'remove', 'id': second}], response.data['operations'])
+    self.assertEqual([first, third], self.order())
+    subpost = SubPost.objects.get(id=first)
+    self.assertEqual(('Субпост 1', 'Новый текст'), (subpost.title, subpost.body))
+
+  # PATCH move: в начало, в конец, после id (200_OK)
+  def test_move(self):
+    first, second, third = (subpost.id for subpost in self.subposts)
+    response = self.patch([
+      {'op': 'move', 'id': third, 'after': None},
+      {'op': 'move', 'id': first},
+      {'op': 'move', 'id': second, 'after': first},
+    ])
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    self.assertEqual([third, first, second], self.order())
+
+  # PATCH : порядок в ?include=subposts и время изменения поста
+  def test_include_order(self):
+    first, second, third = (subpost.id for subpost in self.subposts)
+    update_at = Post.objects.get(id=self.post.id).update_at
+    self.patch([{'op': 'move', 'id': first, 'after': third}])
+
+    response = self.client.get(reverse('post-detail', args=[self.post.id]), {'include': 'subposts'})
+    self.assertEqual([second, third, first], [item['id'] for item in response.data['subposts']])
+    self.assertGreater(Post.objects.get(id=self.post.id).update_at, update_at)
+
+  # PATCH чужого поста (403_FORBIDDEN)
+  def test_not_owner(self):
+    self.client.force_login(self.user_1)
+    response = self.patch([{'op': 'remove', 'id': self.subposts[0].id}])
+
+    self.assertEqual(status.HTTP_403_FORBIDDEN, response.status_code)
+    self.assertTrue(SubPost.objects.filter(id=self.subposts[0].id).exists())
+
+  # PATCH с субпостом другого поста в id или after (400_BAD_REQUEST)
+  def test_other_post_subpost(self):
+    for operation in (
+      {'op': 'remove', 'id': self.other_subpost.id},
+      {'op': 'add', 'title': 'Новый', 'body': 'Текст', 'after': self.other_subpost.id},
+    ):
+      response = self.patch([operation])
+      self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+    self.assertTrue(SubPost.objects.filter(id=self.other_subpost.id).exists())
+
+  # PATCH с неверной операцией (400_BAD_REQUEST)
+  def test_invalid_operations(self):
+    for operations in (
+      [],
+      [{'op': 'rename', 'id': self.subposts[0].id}],
+      [{'op': 'add', 'title': 'Без текста'}],
+      [{'op': 'update', 'id': self.subposts[0].id}],
+      [{'op': 'remove', 'id': self.subposts[0].id, 'after': None}],
+      [{'op': 'move', 'id': self.subposts[0].id, 'after': self.subposts[0].id}],
+    ):
+      response = self.patch(operations)
+      self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code, operations)
+
+  # PATCH с ошибкой в последней операции : откат всех (400_BAD_REQUEST)
+  def test_atomic(self):
+    first, second, third = (subpost.id for subpost in self.subposts)
+    response = self.patch([
+      {'op': 'add', 'title': 'Новый', 'body': 'Текст'},
+      {'op': 'remove', 'id': first},
+      {'op': 'update', 'id': first, 'title': 'Удален'},
+    ])
+
+    self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+    self.assertEqual([first, second, third], self.order())
+
+  # PATCH : зазор исчерпан - позиции пересчитываются, порядок сохраняется
+  def test_renumber(self):
+    first, second, third = (subpost.id for subpost in self.subposts)
+    operations = [{'op': 'add', 'title': f'Новый {i}', 'body': 'Текст', 'after': first} for i in range(15)]
+    response = self.patch(operations)
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    added = [item['id'] for item in response.data['operations']]
+    # Каждый следующий - сразу после first, перед предыдущим
+    self.assertEqual([first, *reversed(added), second, third], self.order())
+    positions = list(SubPost.objects.filter(post=self.post).order_by('position', 'id').values_list('position', flat=True))
+    self.assertEqual(len(positions), len(set(positions)))
+
+  # PATCH по субпостам с одинаковой позицией (созданы до миграции 0006)
+  def test_equal_positions(self):
+    subposts = [SubPost.objects.create(post=self.other_post, title=f'{i}', body='Текст') for i in range(3)]
+    first, second, third = (subpost.id for subpost in [self.other_subpost, *subposts[:2]])
+    response = self.patch([
+      {'op': 'add', 'title': 'Новый', 'body': 'Текст', 'after': first},
+      {'op': 'move', 'id': subposts[2].id, 'after': None},
+    ], post=self.other_post)
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    new = response.data['operations'][0]['id']
+    self.assertEqual([subposts[2].id, first, new, second, third], self.order(self.other_post))
+
+  # PATCH : число запросов не зависит от числа субпостов поста
+  def test_queries_independent_of_size(self):
+    def count_queries(size):
+      post = Post.objects.create(title='Пост', body='Содержание', author=self.user)
+      rows = SubPost.objects.bulk_create([
+        SubPost(post=post, title=f'{i}', body='Текст', position=(i + 1) * POSITION_STEP) for i in range(size)
+      ])
+      operations = [
+        {'op': 'add', 'title': 'Новый', 'body': 'Текст', 'after': rows[1].id},
+        {'op': 'update', 'id': rows[2].id, 'title': 'Обновлен'},
+        {'op': 'move', 'id': rows[3].id, 'after': None},
+        {'op': 'remove', 'id': rows[4].id},
+      ]
+      with CaptureQueriesContext(connection) as queries:
+        response = self.patch(operations, post=post)
+      self.assertEqual(status.HTTP_200_OK, response.status_code)
+      return len(queries)
+
+    self.assertEqual(count_queries(5), count_queries(500))
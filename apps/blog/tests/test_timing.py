@@ -0,0 +1,102 @@
+import json
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post
+from apps.blog.timing import ServerTimingMiddleware
+
+
+def parse_server_timing(header):
+  metrics = {}
+  for part in header.split(','):
+    name, *params = [item.strip() for item in part.split(';')]
+    metrics[name] = dict(param.split('=', 1) for param in params)
+  return metrics
+
+
+@override_settings(BLOG_SERVER_TIMING={'ENABLED': True})
+class ServerTimingTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.post = Post.objects.create(title='Пост 1', body='Содержание', author=cls.user)
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+    self.async_client.force_login(self.user)
+
+  # GET /posts/ : db, auth, serialize, render, total
+  def test_header(self):
+    with self.assertLogs('apps.blog.timing', 'INFO'):
+      response = self.client.get(reverse('post-list'))
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    metrics = parse_server_timing(response['Server-Timing'])
+    self.assertEqual({'db', 'auth', 'serialize', 'render', 'total'}, set(metrics))
+    self.assertEqual('"2 queries"', metrics['db']['desc'])
+    for metric in metrics.values():
+      self.assertGreaterEqual(float(metric['dur']), 0)
+
+  # Строка лога - JSON с замерами
+  def test_log_line(self):
+    with self.assertLogs('apps.blog.timing', 'INFO') as logs:
+      self.client.post(reverse('post-like', args=[self.post.id]))
+
+    data = json.loads(logs.records[0].getMessage())
+    self.assertEqual('LikeViewSet', data['view'])
+    self.assertEqual(200, data['status'])
+    self.assertGreaterEqual(data['queries'], 2)
+    self.assertIsNotNone(data['render_ms'])
+
+  # Ошибка в обработчике: заголовок все равно есть
+  def test_not_found(self):
+    with self.assertLogs('apps.blog.timing', 'INFO'):
+      response = self.client.get(reverse('subpost-detail', args=[99999]))
+
+    self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+    self.assertIn('serialize', parse_server_timing(response['Server-Timing']))
+
+  # Без LOG строки лога нет
+  @override_settings(BLOG_SERVER_TIMING={'ENABLED': True, 'LOG': False})
+  def test_without_log(self):
+    with self.assertNoLogs('apps.blog.timing', 'INFO'):
+      response = self.client.get(reverse('post-detail', args=[self.post.id]))
+
+    self.assertIn('Server-Timing', response)
+
+  # GET /async/posts/ : middleware в async-цепочке
+  async def test_async(self):
+    with self.assertLogs('apps.blog.timing', 'INFO'):
+      response = await self.async_client.get(reverse('async-post-list'))
+
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    metrics = parse_server_timing(response['Server-Timing'])
+    self.assertEqual({'db', 'auth', 'serialize', 'render', 'total'}, set(metrics))
+
+
+class ServerTimingDisabledTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+
+  # Выключено: middleware не попадает в цепочку, заголовка нет
+  @override_settings(BLOG_SERVER_TIMING={'ENABLED': False})
+  def test_disabled(self):
+    with self.assertRaises(MiddlewareNotUsed):
+      ServerTimingMiddleware(lambda request: None)
+
+    self.client.force_authenticate(self.user)
+    response = self.client.get(reverse('post-list'))
+    self.assertNotIn('Server-Timing', response)
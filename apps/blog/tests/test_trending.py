@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models import Post, PostScore
+from apps.blog.trending import get_trending_settings, refresh_scores
+
+
+class TrendingTestCase(APITestCase):
+  @classmethod
+  def setUpTestData(cls):
+    cls.user = User.objects.create_user(
+      username='test_user',
+      password='Test_UseR_1_Test'
+    )
+    cls.posts = [
+      Post.objects.create(title=f'Пост {i}', body='Содержание', author=cls.user)
+      for i in range(3)
+    ]
+
+  def setUp(self):
+    self.client.force_authenticate(self.user)
+
+  def view(self, post, times=1):
+    for _ in range(times):
+      self.client.get(reverse('post-add-view', args=[post.id]))
+
+  def trending_ids(self):
+    response = self.client.get(reverse('post-trending'))
+    self.assertEqual(status.HTTP_200_OK, response.status_code)
+    return [item['id'] for item in response.data['results']]
+
+  # GET /posts/trending/ по убыванию активности (200_OK)
+  def test_trending_order(self):
+    self.view(self.posts[0], 1)
+    self.view(self.posts[1], 3)
+    self.client.post(reverse('post-like', args=[self.posts[0].id]))
+
+    refresh_scores()
+
+    # Пост 0: 1 просмотр + лайк (вес 5) > пост 1: 3 просмотра
+    self.assertEqual([self.posts[0].id, self.posts[1].id], self.trending_ids())
+
+  # Пересчет затрагивает только посты с новой активностью
+  def test_incremental_refresh(self):
+    start = timezone.now()
+    # Активность раньше запаса OVERLAP: при следующем запуске не повторяется
+    Post.objects.filter(id__in=[self.posts[0].id, self.posts[1].id]).update(
+      views_count=1,
+      activity_at=start - timedelta(hours=1)
+    )
+    self.assertEqual(2, refresh_scores(now=start))
+
+    later = start + timedelta(minutes=10)
+    Post.objects.filter(id=self.posts[1].id).update(views_count=5, activity_at=later)
+
+    self.assertEqual(1, refresh_scores(now=later + timedelta(seconds=1)))
+    score = PostScore.objects.get(post=self.posts[1])
+    self.assertEqual(5, score.views_seen)
+    self.assertEqual(start, PostScore.objects.get(post=self.posts[0]).refreshed_at)
+
+  # Старая активность весит меньше такой же новой
+  def test_time_decay(self):
+    half_life = get_trending_settings()['HALF_LIFE']
+    now = timezone.now()
+    Post.objects.filter(id=self.posts[0].id).update(views_count=4, activity_at=now)
+    refresh_scores(now=now - timedelta(seconds=half_life * 3))
+    PostScore.objects.update(refreshed_at=now - timedelta(days=1))
+
+    Post.objects.filter(id=self.posts[1].id).update(views_count=1, activity_at=now)
+    refresh_scores(now=now)
+
+    # 4 просмотра три полураспада назад (вес 0.5) < 1 просмотр сейчас
+    self.assertEqual([self.posts[1].id, self.posts[0].id], self.trending_ids())
+
+  # Повторный пересчет без новых просмотров рейтинг не меняет
+  def test_refresh_idempotent(self):
+    self.view(self.posts[0], 2)
+    now = timezone.now()
+    refresh_scores(now=now)
+    before = PostScore.objects.get(post=self.posts[0]).score
+
+    refresh_scores(now=now + timedelta(seconds=1))
+
+    self.assertEqual(before, PostScore.objects.get(post=self.posts[0]).score)
+
+  # GET /posts/trending/ одним запросом к рейтингу с постами и авторами
+  def test_trending_queries(self):
+    for post in self.posts:
+      self.view(post)
+    refresh_scores()
+
+    with self.assertNumQueries(1):
+      self.client.get(reverse('post-trending'), {'limit': 2})
+
+  # Команда refresh_trending
+  def test_refresh_command(self):
+    self.view(self.posts[2])
+    out = StringIO()
+
+    call_command('refresh_trending', stdout=out)
+
+    self.assertIn('1', out.getvalue())
+    self.assertEqual([self.posts[2].id], self.trending_ids())
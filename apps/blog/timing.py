@@ -0,0 +1,163 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVER_TIMING = {
+  'ENABLED': False,
+  # Строка JSON в лог apps.blog.timing на каждый запрос
+  'LOG': True,
+}
+
+
+def get_server_timing_settings():
+  return {**DEFAULT_SERVER_TIMING, **getattr(settings, 'BLOG_SERVER_TIMING', {})}
+
+
+class RequestTimings:
+  """
+  Замеры одного запроса (мс)
+
+  db - все SQL-запросы; auth - аутентификация и проверка прав DRF;
+  serialize - код обработчика и сериализатора без времени SQL;
+  render - рендер ответа (JSON); total - весь запрос в middleware.
+  Метрики пересекаются: auth и serialize включают свои запросы к БД
+  только в db.
+  """
+  def __init__(self):
+    self.started = time.perf_counter()
+    self.queries = 0
+    self.db = 0.0
+    self.auth = None
+    self.serialize = None
+    self.render = None
+    self.total = None
+    self.view = None
+
+  def db_wrapper(self, execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+      return execute(sql, params, many, context)
+    finally:
+      self.db += (time.perf_counter() - start) * 1000
+      self.queries += 1
+
+  def as_header(self):
+    parts = [f'db;dur={self.db:.2f};desc="{self.queries} queries"']
+    for name in ('auth', 'serialize', 'render', 'total'):
+      value = getattr(self, name)
+      if value is not None:
+        parts.append(f'{name};dur={value:.2f}')
+    return ', '.join(parts)
+
+  def as_log(self, request, response):
+    data = {
+      'method': request.method,
+      'path': request.path,
+      'status': response.status_code,
+      'view': self.view,
+      'queries': self.queries,
+      'db_ms': round(self.db, 2),
+    }
+    for name in ('auth', 'serialize', 'render', 'total'):
+      value = getattr(self, name)
+      data[f'{name}_ms'] = round(value, 2) if value is not None else None
+    return json.dumps(data, ensure_ascii=False)
+
+
+class ServerTimingMiddleware:
+  """
+  Заголовок Server-Timing и строка лога с замерами запроса
+
+  Выключено (BLOG_SERVER_TIMING['ENABLED'] = False) - Django исключает
+  middleware из цепочки (MiddlewareNotUsed), накладных расходов нет.
+  Разбивку auth/serialize/render дает ServerTimingMixin во вьюсетах.
+  Работает и в async-цепочке (ASGI): не переводит запрос в поток.
+  """
+  sync_capable = True
+  async_capable = True
+
+  def __init__(self, get_response):
+    config = get_server_timing_settings()
+    if not config['ENABLED']:
+      raise MiddlewareNotUsed()
+    self.get_response = get_response
+    self.log = config['LOG']
+    if iscoroutinefunction(get_response):
+      markcoroutinefunction(self)
+
+  def __call__(self, request):
+    if iscoroutinefunction(self):
+      return self.__acall__(request)
+    timings = RequestTimings()
+    with self.measure_db(request, timings):
+      response = self.get_response(request)
+    return self.finish(request, response, timings)
+
+  async def __acall__(self, request):
+    timings = RequestTimings()
+    with self.measure_db(request, timings):
+      response = await self.get_response(request)
+    return self.finish(request, response, timings)
+
+  def measure_db(self, request, timings):
+    request.server_timing = timings
+    stack = ExitStack()
+    for connection in connections.all():
+      stack.enter_context(connection.execute_wrapper(timings.db_wrapper))
+    return stack
+
+  def finish(self, request, response, timings):
+    timings.total = (time.perf_counter() - timings.started) * 1000
+    header = timings.as_header()
+    if response.has_header('Server-Timing'):
+      header = f"{response['Server-Timing']}, {header}"
+    response['Server-Timing'] = header
+    if self.log:
+      logger.info(timings.as_log(request, response))
+    return response
+
+
+class ServerTimingMixin:
+  """
+  Разбивка времени запроса DRF для ServerTimingMiddleware
+
+  Без middleware (request.server_timing нет) ничего не замеряет.
+  """
+  def initial(self, request, *args, **kwargs):
+    timings = getattr(request, 'server_timing', None)
+    if timings is None:
+      return super().initial(request, *args, **kwargs)
+
+    timings.view = type(self).__name__
+    start = time.perf_counter()
+    super().initial(request, *args, **kwargs)
+    now = time.perf_counter()
+    timings.auth = (now - start) * 1000
+    # Начало обработчика: от него считается serialize
+    self._timing_handler = (now, timings.db)
+
+  def finalize_response(self, request, response, *args, **kwargs):
+    response = super().finalize_response(request, response, *args, **kwargs)
+    timings = getattr(request, 'server_timing', None)
+    handler = getattr(self, '_timing_handler', None)
+    if timings is None or handler is None:
+      return response
+
+    handler_start, db_before = handler
+    now = time.perf_counter()
+    timings.serialize = max(0.0, (now - handler_start) * 1000 - (timings.db - db_before))
+
+    if hasattr(response, 'add_post_render_callback'):
+      def rendered(response):
+        timings.render = (time.perf_counter() - now) * 1000
+      response.add_post_render_callback(rendered)
+    return response
@@ -0,0 +1,115 @@
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.blog.models import Post, PostScore
+
+
+DEFAULT_TRENDING = {
+  # Через сколько секунд вклад активности уменьшается вдвое
+  'HALF_LIFE': 6 * 60 * 60,
+  'VIEW_WEIGHT': 1.0,
+  'LIKE_WEIGHT': 5.0,
+  # Сколько постов пересчитывается за один bulk_create / bulk_update
+  'BATCH_SIZE': 500,
+  # Запас (секунды) к метке прошлого запуска: транзакции, закоммиченные
+  # после него с более ранним activity_at. Повторный пересчет безвреден
+  'OVERLAP': 60,
+}
+
+# Точка отсчета времени для score: менять нельзя без полного пересчета
+SCORE_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def get_trending_settings():
+  return {**DEFAULT_TRENDING, **getattr(settings, 'BLOG_TRENDING', {})}
+
+
+def logaddexp2(a, b):
+  """log2(2 ** a + 2 ** b) без переполнения; None - пустая сумма"""
+  if a is None:
+    return b
+  if b is None:
+    return a
+  high, low = max(a, b), min(a, b)
+  return high + math.log2(1 + 2 ** (low - high))
+
+
+def activity_score(weight, at, half_life):
+  """log2 вклада активности weight в момент at"""
+  if weight <= 0:
+    return None
+  return math.log2(weight) + (at - SCORE_EPOCH).total_seconds() / half_life
+
+
+def refresh_scores(now=None, batch_size=None):
+  """
+  Пересчитать рейтинг постов с активностью после прошлого запуска
+
+  Прирост просмотров и лайков берется как разница текущих счетчиков
+  поста и views_seen / likes_seen, поэтому активность, записанная во
+  время пересчета, не теряется - она попадет в следующий запуск.
+
+  :return: количество пересчитанных постов
+  """
+  config = get_trending_settings()
+  now = now or timezone.now()
+  batch_size = batch_size or config['BATCH_SIZE']
+
+  with transaction.atomic():
+    since = PostScore.objects.aggregate(last=Max('refreshed_at'))['last']
+    posts = Post.objects.filter(activity_at__isnull=False)
+    if since is not None:
+      posts = posts.filter(activity_at__gt=since - timedelta(seconds=config['OVERLAP']))
+    rows = posts.order_by('id').values_list('id', 'views_count', 'likes_count').iterator(chunk_size=batch_size)
+
+    refreshed = 0
+    while True:
+      batch = list(islice(rows, batch_size))
+      if not batch:
+        break
+      refreshed += refresh_batch(batch, now, config)
+  return refreshed
+
+
+def refresh_batch(batch, now, config):
+  existing = PostScore.objects.in_bulk([post_id for post_id, _, _ in batch])
+  to_create = []
+  to_update = []
+
+  for post_id, views_count, likes_count in batch:
+    score = existing.get(post_id)
+    if score is None:
+      score = PostScore(post_id=post_id)
+      to_create.append(score)
+    else:
+      to_update.append(score)
+
+    # Снятые лайки не уменьшают рейтинг: вклад прошлой активности уже затухает
+    weight = (
+      config['VIEW_WEIGHT'] * max(views_count - score.views_seen, 0)
+      + config['LIKE_WEIGHT'] * max(likes_count - score.likes_seen, 0)
+    )
+    score.score = logaddexp2(score.score, activity_score(weight, now, config['HALF_LIFE']))
+    score.views_seen = views_count
+    score.likes_seen = likes_count
+    score.refreshed_at = now
+
+  PostScore.objects.bulk_create(to_create)
+  PostScore.objects.bulk_update(to_update, ['score', 'views_seen', 'likes_seen', 'refreshed_at'])
+  return len(batch)
+
+
+def trending_posts(limit):
+  """Посты с наибольшим рейтингом: чтение по индексу score"""
+  scores = (
+    PostScore.objects.filter(score__isnull=False)
+    .select_related('post__author')
+    .order_by('-score')[:limit]
+  )
+  return [item.post for item in scores]
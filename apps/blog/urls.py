@@ -1,15 +1,45 @@
 from django.urls import path, include
 
-from rest_framework.routers import DefaultRouter
+from apps.blog.routers import BulkRouter
+from apps.blog.async_views import AsyncReadView
 
 from apps.blog.views import PostViewSet, SubPostViewSet, LikeViewSet
 
 
-router = DefaultRouter()
+router = BulkRouter()
 
 router.register(r'posts', PostViewSet, basename='post')
 router.register(r'subposts', SubPostViewSet, basename='subpost')
 
+# Чтение через async ORM (ASGI): те же ответы, что у /api/posts/ и /api/subposts/
+async_urlpatterns = [
+  path(
+    'posts/',
+    AsyncReadView.as_view(PostViewSet, {'get': 'list'}),
+    name='async-post-list'
+  ),
+  path(
+    'posts/<int:pk>/',
+    AsyncReadView.as_view(PostViewSet, {'get': 'retrieve'}),
+    name='async-post-detail'
+  ),
+  path(
+    'posts/<int:pk>/view/',
+    AsyncReadView.as_view(PostViewSet, {'get': 'add_view'}),
+    name='async-post-add-view'
+  ),
+  path(
+    'subposts/',
+    AsyncReadView.as_view(SubPostViewSet, {'get': 'list'}),
+    name='async-subpost-list'
+  ),
+  path(
+    'subposts/<int:pk>/',
+    AsyncReadView.as_view(SubPostViewSet, {'get': 'retrieve'}),
+    name='async-subpost-detail'
+  ),
+]
+
 
 urlpatterns = [
   path(
@@ -18,6 +48,7 @@ urlpatterns = [
     name='post-like' 
   ),
 
+  path('async/', include(async_urlpatterns)),
   path('', include(router.urls))
 ]
 
@@ -28,7 +59,8 @@ post_urlpatterns = [
   path('posts/', PostViewSet.as_view(
     {
       'get': 'list', 
-      'post': 'create'
+      'post': 'create',
+      'patch': 'bulk_update'
     }
   )),
   path('posts/<int:pk>/', PostViewSet.as_view(
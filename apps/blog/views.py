@@ -1,70 +1,197 @@
+from itertools import islice
+
+from asgiref.sync import sync_to_async
 from django.utils import timezone
 from django.db import transaction
-from django.db.models import F
-from django.shortcuts import get_object_or_404
+from django.db.models import Exists, F, OuterRef, Prefetch, Value
 
 from rest_framework import status
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.exceptions import ValidationError, PermissionDenied, NotFound
 
-from drf_spectacular.utils import extend_schema
 
 from apps.blog.models import Post, SubPost, Like
 from apps.blog.serializers import (
   PostSerializer, 
   SubPostSerializer, 
   SubPostWithIDSerializer, 
-  LikeSerializer
-)
-from apps.blog.pagination import PostPagination
-from apps.blog.docs.post_doc import (
-  LIST_POSTS_DOCS,
-  RETRIEVE_POST_DOCS,
-  ADD_VIEW_DOCS,
-  DELETE_POST_DOCS,
-  CREATE_POST_DOCS,
-  UPDATE_POST_DOCS,
-  PARTIAL_UPDATE_POST_DOCS,
-  POST_VIEW_SET_DOCS)
-from apps.blog.docs.subpost_doc import (
-  DELETE_SUBPOST_DOCS,
-  UPDATE_SUBPOST_DOCS,
-  CREATE_SUBPOST_DOCS,
-  RETRIEVE_SUBPOST_DOCS,
-  LIST_SUBPOSTS_DOCS,
-  SUBPOST_VIEW_SET_DOCS
-)
-from apps.blog.docs.like_doc import (
-  LIKE_VIEW_SET_DOCS,
-  ADD_RO_REMOVE_LIKE
+  LikeSerializer,
+  PostValuesSerializer,
+  SubPostValuesSerializer,
+  SubPostPatchSerializer
 )
+from apps.blog.cache import CachedResponseMixin, invalidate_post, invalidate_post_list, get_cache_stats
+from apps.blog.conditional import ConditionalGetMixin
+from apps.blog.fast_read import FastReadMixin
+from apps.blog.counters import view_buffer, get_view_buffer_settings
+from apps.blog.parsers import NDJSONParser, InvalidLine, get_ndjson_import_settings
+from apps.blog.services import MassCreation, toggle_like
+from apps.blog.search import search as search_posts
+from apps.blog.trending import trending_posts
+from apps.blog.timing import ServerTimingMixin
+from apps.blog.pagination import PostPagination, PostCursorPagination
+from apps.blog.permissions import IsAuthorOrReadOnly
+from apps.blog.subpost_patch import POSITION_STEP, SubPostPatch, next_position
+from apps.blog.docs.lazy import schema_docs
+
+# id - BIGINT: больше не передать в запрос (OverflowError в драйвере БД)
+MIN_ID, MAX_ID = -2 ** 63, 2 ** 63 - 1
+
+
+def parse_id(value):
+  """int(value) в пределах BIGINT, иначе ValueError"""
+  value = int(value)
+  if not MIN_ID <= value <= MAX_ID:
+    raise ValueError(f'id вне диапазона: {value}')
+  return value
+
+def get_id_param(request, name):
+  """?name=id из строки запроса: None, если не передан"""
+  value = request.query_params.get(name)
+  if value is None:
+    return None
+  try:
+    return parse_id(value)
+  except ValueError:
+    raise ValidationError({name: 'Ожидается целое число'})
 
-@extend_schema(**POST_VIEW_SET_DOCS)
-class PostViewSet(ModelViewSet):
+
+@schema_docs('post_doc.POST_VIEW_SET_DOCS')
+class PostViewSet(ServerTimingMixin, ConditionalGetMixin, CachedResponseMixin, FastReadMixin, ModelViewSet):
   http_method_names = ['get', 'post', 'put', 'patch', 'delete']
-  queryset = Post.objects.all()
+  # author нужен для author_display: без select_related +1 запрос на пост
+  queryset = Post.objects.select_related('author')
   serializer_class = PostSerializer
+  fast_read_serializer_class = PostValuesSerializer
+  # Владелец проверяется в get_object() по author_id
+  permission_classes = [*api_settings.DEFAULT_PERMISSION_CLASSES, IsAuthorOrReadOnly]
+  # Поля для ETag: счетчики меняются без update_at
+  conditional_fields = ('id', 'update_at', 'views_count', 'likes_count')
+  # ?include=subposts - встроить субпосты (одним prefetch-запросом на страницу)
+  # ?include=liked_by_me - флаг лайка текущего пользователя (подзапрос EXISTS)
+  include_options = ('subposts', 'liked_by_me')
+  max_subposts_limit = 100
+  max_likes_state_ids = 100
+  search_limit = 20
+  max_search_limit = 100
+  trending_limit = 20
+  max_trending_limit = 100
+
+  def get_parsers(self):
+    parsers = super().get_parsers()
+    # NDJSON - только потоковый импорт в create: в update request.data-генератор
+    # не ждут, такой запрос должен получить 415. action здесь еще не задан
+    action = getattr(self, 'action', None)
+    request = getattr(self, 'request', None)
+    if action is None and request is not None:
+      action = getattr(self, 'action_map', {}).get(request.method.lower())
+    if action == 'create':
+      parsers.append(NDJSONParser())
+    return parsers
+
+  def get_include(self):
+    if self.action not in ('list', 'retrieve'):
+      return set()
+    value = self.request.query_params.get('include', '')
+    include = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = include - set(self.include_options)
+    if unknown:
+      raise ValidationError({'include': f'Неизвестные значения: {sorted(unknown)}'})
+    return include
+
+  def get_queryset(self):
+    queryset = super().get_queryset()
+    if self.action == 'list':
+      # Порядок страниц PostPagination (индексы create_at, id и
+      # author, create_at, id); курсорная пагинация задает свой
+      queryset = queryset.order_by('create_at', 'id')
+      # ?author=id - посты автора (индекс author, create_at, id)
+      author_id = get_id_param(self.request, 'author')
+      if author_id is not None:
+        queryset = queryset.filter(author_id=author_id)
+    include = self.get_include()
+    if 'subposts' in include:
+      # Порядок совпадает с индексом (post, position, id): без сортировки
+      subposts = SubPost.objects.order_by('post_id', 'position', 'id')
+      if 'subposts_limit' in self.request.query_params:
+        # ?subposts_limit=N - не больше N субпостов на пост (оконная функция в prefetch).
+        # post_id уже в PARTITION BY: в ORDER BY окна он мешает взять порядок из индекса
+        limit = self.get_positive_int_param('subposts_limit', None, self.max_subposts_limit)
+        subposts = SubPost.objects.order_by('position', 'id')[:limit]
+      # to_attr: в Django 4.2 срез в Prefetch без to_attr падает
+      queryset = queryset.prefetch_related(
+        Prefetch('sub_posts', queryset=subposts, to_attr='included_subposts')
+      )
+    if 'liked_by_me' in include:
+      user = self.request.user
+      if user.is_authenticated:
+        liked_by_me = Exists(Like.objects.filter(post=OuterRef('pk'), user=user))
+      else:
+        liked_by_me = Value(False)
+      queryset = queryset.annotate(liked_by_me=liked_by_me)
+    return queryset
+
+  # Субпосты приходят через prefetch: с .values() он не работает
+  def use_fast_read(self):
+    return super().use_fast_read() and 'subposts' not in self.get_include()
+
+  def get_conditional_fields(self):
+    fields = super().get_conditional_fields()
+    if 'liked_by_me' in self.get_include():
+      fields = (*fields, 'liked_by_me')
+    return fields
+
+  # Ответ с liked_by_me у каждого пользователя свой
+  def get_response_cache_vary(self):
+    if 'liked_by_me' in self.get_include():
+      return f'user:{self.request.user.pk}'
+    return None
+
+  def get_serializer_context(self):
+    context = super().get_serializer_context()
+    context['include'] = self.get_include()
+    return context
+
+  # Класс выбирается при первом обращении: ConditionalGetMixin читает
+  # пагинатор до paginate_queryset
+  @property
+  def paginator(self):
+    if not hasattr(self, '_paginator'):
+      self.select_pagination_class()
+    return super().paginator
 
   # Добавить пагинацию если работает: 'list'
-  def paginate_queryset(self, queryset):
+  # ?pagination=cursor (или переданный cursor) - keyset-пагинация без OFFSET/COUNT
+  def select_pagination_class(self):
     if self.action == 'list':
-      self.pagination_class = PostPagination
-      return super().paginate_queryset(queryset)
-    self.pagination_class = None
-    return None
+      self.pagination_class = self.get_list_pagination_class()
+    else:
+      self.pagination_class = None
+
+  def get_list_pagination_class(self):
+    params = self.request.query_params
+    if params.get('pagination') == 'cursor' or PostCursorPagination.cursor_query_param in params:
+      return PostCursorPagination
+    return PostPagination
   
-  @extend_schema(**LIST_POSTS_DOCS)
+  @schema_docs('post_doc.LIST_POSTS_DOCS')
   def list(self, request, *args, **kwargs):
     return super().list(request, *args, **kwargs)
 
-  @extend_schema(**RETRIEVE_POST_DOCS)
+  @schema_docs('post_doc.RETRIEVE_POST_DOCS')
   def retrieve(self, request, *args, **kwargs):
     return super().retrieve(request, *args, **kwargs)
   
-  @extend_schema(**CREATE_POST_DOCS)
+  @schema_docs('post_doc.CREATE_POST_DOCS')
   def create(self, request, *args, **kwargs):
+    # Потоковый импорт: request.data - генератор, копировать его нельзя
+    if request.content_type.startswith(NDJSONParser.media_type):
+      return self.stream_create(request)
+
     data = request.data.copy()
 
     # Массовое создание постов
@@ -76,6 +203,7 @@ class PostViewSet(ModelViewSet):
       serializer = self.get_serializer(data=data, many=True)
       serializer.is_valid(raise_exception=True)
       created_objects = self.perform_bulk_create(serializer.validated_data)
+      invalidate_post_list()
       output_serializer = self.get_serializer(created_objects, many=True)
       return Response(output_serializer.data, status=status.HTTP_201_CREATED)
 
@@ -99,33 +227,28 @@ class PostViewSet(ModelViewSet):
       # Найдет ошибку: сделает откат базы
       with transaction.atomic():
         post = post_serializer.save()
-        now = timezone.now()
-        for item in subpost_serializer.validated_data:
+        for index, item in enumerate(subpost_serializer.validated_data, 1):
           item['post'] = post
+          item['position'] = index * POSITION_STEP
         SubPostViewSet.perform_bulk_create(subpost_serializer.validated_data)
+        invalidate_post_list()
 
         headers = self.get_success_headers(post_serializer.data)
       return Response(post_serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
     return super().create(request, *args, **kwargs)
   
-  @extend_schema(**UPDATE_POST_DOCS)
+  @schema_docs('post_doc.UPDATE_POST_DOCS')
   def update(self, request, *args, **kwargs):
-    user = request.user
     subposts_data = request.data.get('subposts', None)
     request.data.pop('subposts', None)
 
     partial = kwargs.pop('partial', False)
+    # Один SELECT поста (с автором для author_display) и проверка IsAuthorOrReadOnly
     instance = self.get_object()
     post_serializer = self.get_serializer(instance, data=request.data, partial=partial)
     post_serializer.is_valid(raise_exception=True)
 
-    post_id = kwargs['pk']
-    post_obj = get_object_or_404(Post, id=post_id)
-
-    if post_obj.author != user:
-      raise PermissionDenied(f'Доступ к посту {post_obj.id} ограничен')
-
     # Есть ли субпосты вместе с постом
     if subposts_data is not None:
       if not isinstance(subposts_data, list):
@@ -140,7 +263,8 @@ class PostViewSet(ModelViewSet):
         update_data = []
         update_ids = set()
 
-        post = post_serializer.save()
+        self.perform_update(post_serializer)
+        post = post_serializer.instance
 
         for item in subpost_serializer.validated_data:
           item['post'] = post
@@ -151,8 +275,7 @@ class PostViewSet(ModelViewSet):
             update_ids.add(item['id'])
             all_new_ids.add(item['id'])
 
-        old_subposts = SubPost.objects.filter(post=post)
-        old_ids = set(sub.id for sub in old_subposts)
+        old_ids = set(SubPost.objects.filter(post=post).values_list('id', flat=True))
 
         if all_new_ids - old_ids:
           raise PermissionDenied(f'Субпост(ы): (id){all_new_ids - old_ids} Не принадлежат посту: {post.id}.')
@@ -180,100 +303,336 @@ class PostViewSet(ModelViewSet):
           if fields_to_update:
             SubPost.objects.bulk_update(obj_map.values(), fields_to_update)
 
-        # create
+        # create: в конец, в порядке списка
+        if create_data:
+          position = next_position(post.id)
+          for index, item in enumerate(create_data):
+            item['position'] = position + index * POSITION_STEP
         SubPostViewSet.perform_bulk_create(create_data)
+    else:
+      self.perform_update(post_serializer)
 
-    self.perform_update(post_serializer)
     if getattr(instance, '_prefetched_objects_cache', None):
       instance._prefetched_objects_cache = {}
 
     return Response(post_serializer.data)
   
 
-  @extend_schema(**PARTIAL_UPDATE_POST_DOCS)
+  @schema_docs('post_doc.BULK_UPDATE_POSTS_DOCS')
+  def bulk_update(self, request, *args, **kwargs):
+    posts = MassCreation.mass_update(
+      self.get_serializer_class(),
+      request.data,
+      request.user,
+      self.get_serializer_context()
+    )
+    invalidate_post(*[post.id for post in posts])
+    serializer = self.get_serializer(posts, many=True)
+    return Response(serializer.data)
+
+  @schema_docs('post_doc.PARTIAL_UPDATE_POST_DOCS')
   def partial_update(self, request, *args, **kwargs):
     kwargs['partial'] = True
     return self.update(request, *args, **kwargs)
+
+  # Операции над субпостами вместо полного списка в PUT: стоимость - по числу операций
+  @schema_docs('post_doc.PATCH_SUBPOSTS_DOCS')
+  @action(detail=True, methods=['patch'], url_path='subposts')
+  def patch_subposts(self, request, pk):
+    post = self.get_object()
+    serializer = SubPostPatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    patch = SubPostPatch(post)
+    results = patch.apply(serializer.validated_data['operations'])
+    if patch.modified:
+      Post.objects.filter(id=post.id).update(update_at=patch.now)
+      invalidate_post(post.id)
+    return Response({'operations': results})
   
-  @extend_schema(**ADD_VIEW_DOCS)
+  @schema_docs('post_doc.ADD_VIEW_DOCS')
   @action(detail=True, methods=['get'], url_path='view')
   def add_view(self, request, pk):
-    updated = Post.objects.filter(pk=pk).update(views_count=F('views_count')+1)
+    # Буферизованный режим: просмотр копится в памяти, в БД уходит пачкой
+    if get_view_buffer_settings()['ENABLED']:
+      if not Post.objects.filter(pk=pk).exists():
+        raise NotFound(f"Пост с id={pk} не найден")
+      # Кэш сбрасывается при записи буфера в БД
+      view_buffer.add(pk)
+      return Response(status=status.HTTP_200_OK)
+
+    updated = Post.objects.filter(pk=pk).update(
+      views_count=F('views_count')+1,
+      activity_at=timezone.now()
+    )
+    if updated == 0:
+      raise NotFound(f"Пост с id={pk} не найден")
+    invalidate_post(pk)
+    return Response(status=status.HTTP_200_OK)
+
+  # add_view для /api/async/posts/{id}/view/
+  async def aadd_view(self, request, pk):
+    if get_view_buffer_settings()['ENABLED']:
+      if not await Post.objects.filter(pk=pk).aexists():
+        raise NotFound(f"Пост с id={pk} не найден")
+      # add() может записать буфер в БД
+      await sync_to_async(view_buffer.add)(pk)
+      return Response(status=status.HTTP_200_OK)
+
+    updated = await Post.objects.filter(pk=pk).aupdate(
+      views_count=F('views_count')+1,
+      activity_at=timezone.now()
+    )
     if updated == 0:
       raise NotFound(f"Пост с id={pk} не найден")
+    await sync_to_async(invalidate_post)(pk)
     return Response(status=status.HTTP_200_OK)
+
+  @schema_docs('post_doc.LIKES_STATE_DOCS')
+  @action(detail=False, methods=['get'], url_path='likes-state')
+  def likes_state(self, request):
+    """Состояние лайков текущего пользователя для списка постов"""
+    value = request.query_params.get('ids', '')
+    try:
+      ids = list(dict.fromkeys(parse_id(item) for item in value.split(',') if item.strip()))
+    except ValueError:
+      raise ValidationError({'ids': 'Ожидается список целых чисел через запятую'})
+    if not ids:
+      raise ValidationError({'ids': 'Обязательный параметр'})
+    if len(ids) > self.max_likes_state_ids:
+      raise ValidationError({'ids': f'Не больше {self.max_likes_state_ids} id за запрос'})
+
+    # Один запрос по индексу unique_together (user, post)
+    liked = set(
+      Like.objects.filter(user=request.user, post_id__in=ids).values_list('post_id', flat=True)
+    )
+    return Response({'liked': {str(post_id): post_id in liked for post_id in ids}})
+
+  @schema_docs('post_doc.TRENDING_POSTS_DOCS')
+  @action(detail=False, methods=['get'], url_path='trending')
+  def trending(self, request):
+    limit = self.get_positive_int_param('limit', self.trending_limit, self.max_trending_limit)
+    serializer = self.get_serializer(trending_posts(limit), many=True)
+    return Response({'results': serializer.data})
+
+  @schema_docs('post_doc.SEARCH_POSTS_DOCS')
+  @action(detail=False, methods=['get'], url_path='search')
+  def search(self, request):
+    query = request.query_params.get('q', '').strip()
+    if not query:
+      raise ValidationError({'q': 'Обязательный параметр'})
+    limit = self.get_positive_int_param('limit', self.search_limit, self.max_search_limit)
+    return Response({'q': query, 'results': search_posts(query, limit)})
+
+  # Счетчики кэша ответов list/retrieve
+  @schema_docs('post_doc.CACHE_STATS_DOCS')
+  @action(detail=False, methods=['get'], url_path='cache-stats', permission_classes=[IsAdminUser])
+  def cache_stats(self, request):
+    return Response(get_cache_stats())
   
-  @extend_schema(**DELETE_POST_DOCS)
+  @schema_docs('post_doc.DELETE_POST_DOCS')
   def destroy(self, request, *args, **kwargs):
     return super().destroy(request, *args, **kwargs)
   
+  def stream_create(self, request):
+    """
+    Импорт постов из application/x-ndjson
+
+    Строки читаются из потока чанками по chunk_size. Каждый чанк
+    валидируется построчно и пишется bulk_create(batch_size) в своей
+    транзакции: ошибки строк не откатывают остальные.
+    """
+    config = get_ndjson_import_settings()
+    chunk_size = self.get_positive_int_param('chunk_size', config['CHUNK_SIZE'], config['MAX_CHUNK_SIZE'])
+    batch_size = self.get_positive_int_param('batch_size', config['BATCH_SIZE'], chunk_size)
+
+    items = iter(request.data)
+    chunks = []
+    created_total = 0
+    failed_total = 0
+    start = 0
+
+    while True:
+      chunk = list(islice(items, chunk_size))
+      if not chunk:
+        break
+
+      valid_data = []
+      errors = []
+      for index, item in enumerate(chunk, start=start):
+        if isinstance(item, InvalidLine):
+          errors.append({'index': index, 'errors': {'non_field_errors': [item.message]}})
+          continue
+        if not isinstance(item, dict):
+          errors.append({'index': index, 'errors': {'non_field_errors': ['Ожидается JSON-объект']}})
+          continue
+        serializer = self.get_serializer(data=item)
+        if serializer.is_valid():
+          valid_data.append(serializer.validated_data)
+        else:
+          errors.append({'index': index, 'errors': serializer.errors})
+
+      if valid_data:
+        with transaction.atomic():
+          Post.objects.bulk_create([Post(**item) for item in valid_data], batch_size=batch_size)
+
+      chunks.append({
+        'chunk': len(chunks),
+        'start': start,
+        'end': start + len(chunk) - 1,
+        'created': len(valid_data),
+        'failed': len(errors),
+        'errors': errors,
+      })
+      created_total += len(valid_data)
+      failed_total += len(errors)
+      start += len(chunk)
+
+    if created_total:
+      invalidate_post_list()
+
+    summary = {
+      'created': created_total,
+      'failed': failed_total,
+      'chunk_size': chunk_size,
+      'batch_size': batch_size,
+      'chunks': chunks,
+    }
+    response_status = status.HTTP_201_CREATED if not failed_total else status.HTTP_207_MULTI_STATUS
+    return Response(summary, status=response_status)
+
+  def get_positive_int_param(self, name, default, maximum):
+    value = self.request.query_params.get(name)
+    if value is None:
+      return default
+    try:
+      value = int(value)
+    except ValueError:
+      raise ValidationError({name: 'Ожидается целое число'})
+    if value < 1:
+      raise ValidationError({name: 'Ожидается число больше 0'})
+    return min(value, maximum)
+
+  def perform_create(self, serializer):
+    super().perform_create(serializer)
+    invalidate_post_list()
+
+  def perform_update(self, serializer):
+    super().perform_update(serializer)
+    invalidate_post(serializer.instance.id)
+
+  def perform_destroy(self, instance):
+    post_id = instance.id
+    super().perform_destroy(instance)
+    invalidate_post(post_id)
+
   def perform_bulk_create(self, serializer_validated_data):
     return Post.objects.bulk_create([Post(**item) for item in serializer_validated_data])
 
 
-@extend_schema(**SUBPOST_VIEW_SET_DOCS)
-class SubPostViewSet(ModelViewSet):
+@schema_docs('subpost_doc.SUBPOST_VIEW_SET_DOCS')
+class SubPostViewSet(ServerTimingMixin, ConditionalGetMixin, FastReadMixin, ModelViewSet):
   http_method_names = ['list', 'get', 'post', 'put', 'delete', 'retrieve']
   queryset = SubPost.objects.all()
   serializer_class = SubPostSerializer
+  fast_read_serializer_class = SubPostValuesSerializer
+  permission_classes = [*api_settings.DEFAULT_PERMISSION_CLASSES, IsAuthorOrReadOnly]
+  # Автор поста - аннотацией в том же SELECT субпоста
+  author_id_attr = 'post_author_id'
+
+  def get_queryset(self):
+    queryset = super().get_queryset()
+    if self.action in ('update', 'partial_update', 'destroy'):
+      return queryset.annotate(post_author_id=F('post__author_id'))
+    if self.action != 'list':
+      return queryset
+    # ?post=id - субпосты поста по порядку (индекс post, position, id)
+    post_id = get_id_param(self.request, 'post')
+    if post_id is not None:
+      return queryset.filter(post_id=post_id).order_by('position', 'id')
+    return queryset.order_by('id')
 
   
-  @extend_schema(**LIST_SUBPOSTS_DOCS)
+  @schema_docs('subpost_doc.LIST_SUBPOSTS_DOCS')
   def list(self, request, *args, **kwargs):
     return super().list(request, *args, **kwargs)
 
   
-  @extend_schema(**RETRIEVE_SUBPOST_DOCS)
+  @schema_docs('subpost_doc.RETRIEVE_SUBPOST_DOCS')
   def retrieve(self, request, *args, **kwargs):
     return super().retrieve(request, *args, **kwargs)
 
 
-  @extend_schema(**CREATE_SUBPOST_DOCS)
+  @schema_docs('subpost_doc.CREATE_SUBPOST_DOCS')
   def create(self, request, *args, **kwargs):
-    post_id = self.request.data.get('post')
-    user = self.request.user
-    
-    post = get_object_or_404(Post, id=post_id)
-    if post.author != user:
-      raise PermissionDenied(f'Вы не владелец поста: {post}')
-    
     return super().create(request, *args, **kwargs)
   
-  @extend_schema(**DELETE_SUBPOST_DOCS)
+  @schema_docs('subpost_doc.DELETE_SUBPOST_DOCS')
   def destroy(self, request, *args, **kwargs):
     return super().destroy(request, *args, **kwargs)
 
-  @extend_schema(**UPDATE_SUBPOST_DOCS)
+  @schema_docs('subpost_doc.UPDATE_SUBPOST_DOCS')
   def update(self, request, *args, **kwargs):
     return super().update(request, *args, **kwargs)
 
+  def perform_create(self, serializer):
+    # post в сериализаторе необязателен: без него только PUT сохраняет прежний пост
+    if 'post' not in serializer.validated_data:
+      raise ValidationError({'post': 'Обязательное поле.'})
+    post = serializer.validated_data['post']
+    self.check_post_author(post)
+    # В конец поста
+    serializer.save(position=next_position(post.id))
+    self.touch_posts(post.id)
+
+  def perform_update(self, serializer):
+    old_post_id = serializer.instance.post_id
+    post = serializer.validated_data.get('post')
+    if post is not None:
+      self.check_post_author(post)
+    if post is not None and post.id != old_post_id:
+      # Позиция в старом посте к новому отношения не имеет: в конец нового поста
+      serializer.save(position=next_position(post.id))
+    else:
+      super().perform_update(serializer)
+    self.touch_posts(old_post_id, serializer.instance.post_id)
+
+  def perform_destroy(self, instance):
+    post_id = instance.post_id
+    super().perform_destroy(instance)
+    self.touch_posts(post_id)
+
+  # Пост уже загружен полем post сериализатора: сравнение author_id без запроса за User
+  def check_post_author(self, post):
+    if post.author_id != self.request.user.id:
+      raise PermissionDenied(f'Вы не владелец поста: {post.id}')
+
+  # Изменение субпоста - изменение поста: update_at (ETag, ?include=subposts) и кэш
+  def touch_posts(self, *post_ids):
+    Post.objects.filter(id__in=post_ids).update(update_at=timezone.now())
+    invalidate_post(*post_ids)
+
   def perform_bulk_create(serializer_validated_data):
     return SubPost.objects.bulk_create([SubPost(**item) for item in serializer_validated_data])
 
 
-@extend_schema(**LIKE_VIEW_SET_DOCS)
-class LikeViewSet(ModelViewSet):
+@schema_docs('like_doc.LIKE_VIEW_SET_DOCS')
+class LikeViewSet(ServerTimingMixin, ModelViewSet):
   queryset = Like.objects.all()
   serializer_class = LikeSerializer
 
-  @extend_schema(**ADD_RO_REMOVE_LIKE)
+  @schema_docs('like_doc.ADD_RO_REMOVE_LIKE')
   @action(detail=True, methods=['post'])
   def like(self, request, *args, **kwargs):
-    user = request.user
     post_id = kwargs['pk']
 
-    post = get_object_or_404(Post, id=post_id)
-
-    like = Like.objects.filter(user=user, post=post).first()
-    if like:
-      like.delete()
-      return Response({'message': 'Лайк убран'})
+    # Лайк и счетчик likes_count меняются в одной транзакции за 2 запроса
+    result = toggle_like(request.user.id, post_id)
+    if result is None:
+      raise NotFound()
+    liked, likes_count = result
+    invalidate_post(post_id)
 
-    serializer = self.get_serializer(data={
-      'post': post.id,
-      'user': user.id
-    })
-    serializer.is_valid(raise_exception=True)
-    self.perform_create(serializer)
-    return Response({'message': 'Вы поставили лайк'}, status=status.HTTP_200_OK)
+    message = 'Вы поставили лайк' if liked else 'Лайк убран'
+    return Response({'message': message, 'liked': liked, 'likes_count': likes_count}, status=status.HTTP_200_OK)
   
@@ -0,0 +1,199 @@
+"""
+Async-чтение (/api/async/) под ASGI против синхронного пути под WSGI при многих соединениях
+
+python -m benchmarks.bench_async --posts 10000 --concurrency 10,100,500 --requests 2000 --output async.json
+
+Приложения config.wsgi / config.asgi вызываются в процессе, без сети:
+- wsgi: /api/posts/ через WSGI на пуле из --threads потоков (как gunicorn --threads);
+- asgi_sync: /api/posts/ через ASGI - синхронный вьюсет в потоке на запрос;
+- asgi_async: /api/async/posts/ через ASGI - async ORM.
+
+concurrency - число клиентов, каждый отправляет следующий запрос после
+ответа на предыдущий. Задержка включает ожидание свободного потока,
+throughput_rps - запросов за секунду реального времени. Для замера по
+сети: uvicorn config.asgi:application и gunicorn config.wsgi с
+нагрузочным инструментом на тех же URL.
+"""
+import argparse
+import asyncio
+import io
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from benchmarks.utils import seed_blog, setup_django, summarize, write_results
+
+
+ENDPOINTS = {
+  # имя: (синхронный URL, async URL, query string)
+  'list': ('post-list', 'async-post-list', ''),
+  'list_cursor': ('post-list', 'async-post-list', 'pagination=cursor'),
+  'retrieve': ('post-detail', 'async-post-detail', ''),
+  'add_view': ('post-add-view', 'async-post-add-view', ''),
+}
+
+
+def wsgi_get(application, path, query, cookie):
+  environ = {
+    'REQUEST_METHOD': 'GET',
+    'PATH_INFO': path,
+    'QUERY_STRING': query,
+    'SERVER_NAME': 'testserver',
+    'SERVER_PORT': '80',
+    'SERVER_PROTOCOL': 'HTTP/1.1',
+    'HTTP_HOST': 'testserver',
+    'HTTP_COOKIE': cookie,
+    'wsgi.url_scheme': 'http',
+    'wsgi.input': io.BytesIO(),
+    'wsgi.errors': io.StringIO(),
+    'wsgi.multithread': True,
+    'wsgi.multiprocess': False,
+    'wsgi.run_once': False,
+    'wsgi.version': (1, 0),
+  }
+  status = []
+  response = application(environ, lambda value, headers, exc_info=None: status.append(value))
+  try:
+    for _ in response:
+      pass
+  finally:
+    response.close()
+  return int(status[0].split()[0])
+
+
+async def asgi_get(application, path, query, cookie):
+  scope = {
+    'type': 'http',
+    'asgi': {'version': '3.0'},
+    'http_version': '1.1',
+    'method': 'GET',
+    'scheme': 'http',
+    'path': path,
+    'raw_path': path.encode(),
+    'query_string': query.encode(),
+    'root_path': '',
+    'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+    'client': ('127.0.0.1', 50000),
+    'server': ('testserver', 80),
+  }
+  messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+  status = []
+
+  async def receive():
+    if messages:
+      return messages.pop()
+    # Клиент не отключается
+    await asyncio.Future()
+
+  async def send(message):
+    if message['type'] == 'http.response.start':
+      status.append(message['status'])
+
+  await application(scope, receive, send)
+  return status[0]
+
+
+def run_wsgi(application, path, query, cookie, clients, total, threads):
+  latencies = []
+  errors = 0
+  with ThreadPoolExecutor(max_workers=threads) as pool:
+    started = time.perf_counter()
+    pending = {}
+    submitted = 0
+
+    def submit():
+      nonlocal submitted
+      submitted += 1
+      future = pool.submit(wsgi_get, application, path, query, cookie)
+      pending[future] = time.perf_counter()
+
+    # Клиенты: следующий запрос - после ответа на предыдущий
+    for _ in range(min(clients, total)):
+      submit()
+    while pending:
+      done, _ = wait(pending, return_when=FIRST_COMPLETED)
+      for future in done:
+        latencies.append((time.perf_counter() - pending.pop(future)) * 1000)
+        if future.result() >= 400:
+          errors += 1
+        if submitted < total:
+          submit()
+    wall = time.perf_counter() - started
+  return latencies, errors, wall
+
+
+async def run_asgi(application, path, query, cookie, clients, total):
+  latencies = []
+  errors = 0
+  remaining = total
+
+  async def client():
+    nonlocal remaining, errors
+    while remaining > 0:
+      remaining -= 1
+      start = time.perf_counter()
+      status = await asgi_get(application, path, query, cookie)
+      latencies.append((time.perf_counter() - start) * 1000)
+      if status >= 400:
+        errors += 1
+
+  started = time.perf_counter()
+  await asyncio.gather(*(client() for _ in range(clients)))
+  return latencies, errors, time.perf_counter() - started
+
+
+def result(latencies, errors, wall):
+  return {**summarize(latencies), 'throughput_rps': round(len(latencies) / wall, 1), 'errors': errors}
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--posts', type=int, default=10000)
+  parser.add_argument('--concurrency', default='10,100,500', help='Одновременных клиентов через запятую')
+  parser.add_argument('--requests', type=int, default=1000, help='Запросов на один замер')
+  parser.add_argument('--threads', type=int, default=8, help='Потоков WSGI-сервера')
+  parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='list')
+  parser.add_argument('--output')
+  args = parser.parse_args()
+
+  db_path = setup_django()
+  try:
+    from django.conf import settings
+    from django.test import Client
+    from django.urls import reverse
+    from apps.blog.models import Post
+    from config.asgi import application as asgi_application
+    from config.wsgi import application as wsgi_application
+
+    seed_blog(args.posts, subposts_max=2, defer_indexes=True)
+    post = Post.objects.select_related('author').order_by('id')[args.posts // 2]
+    # Сессия вместо Basic: хэш пароля на каждый запрос заслонил бы разницу
+    client = Client()
+    client.force_login(post.author)
+    cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+    sync_name, async_name, query = ENDPOINTS[args.endpoint]
+    url_args = [] if sync_name == 'post-list' else [post.id]
+    sync_path = reverse(sync_name, args=url_args)
+    async_path = reverse(async_name, args=url_args)
+
+    results = {}
+    for clients in [int(value) for value in args.concurrency.split(',')]:
+      results[str(clients)] = {
+        'wsgi': result(*run_wsgi(
+          wsgi_application, sync_path, query, cookie, clients, args.requests, args.threads
+        )),
+        'asgi_sync': result(*asyncio.run(
+          run_asgi(asgi_application, sync_path, query, cookie, clients, args.requests)
+        )),
+        'asgi_async': result(*asyncio.run(
+          run_asgi(asgi_application, async_path, query, cookie, clients, args.requests)
+        )),
+      }
+    write_results(args.output, 'async', results, vars(args))
+  finally:
+    os.remove(db_path)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,152 @@
+"""
+Эндпоинты API через настоящий URLconf (тестовый клиент DRF) на нескольких объемах данных
+
+python -m benchmarks.bench_endpoints --scales 1000,10000,100000 --output endpoints.json
+python -m benchmarks.compare base.json endpoints.json
+
+Для каждого объема база дополняется до нужного количества постов, затем
+каждый эндпоинт замеряется iterations раз: p50/p95/p99, пропускная
+способность и число SQL-запросов на один вызов. Клиент авторизован через
+force_authenticate - в замер не входят запросы сессии.
+"""
+import argparse
+import os
+
+from benchmarks.utils import measure, seed_blog, setup_django, summarize, write_results
+
+
+ENDPOINTS = [
+  'list',
+  'list_last_page',
+  'list_cursor',
+  'list_include_subposts',
+  'retrieve',
+  'bulk_create',
+  'update_with_subposts',
+  'like_toggle',
+  'add_view',
+]
+
+
+class EndpointBench:
+  """Запросы к эндпоинтам: (setup или None, func) по имени"""
+
+  def __init__(self, bulk_size):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from apps.blog.models import Post
+
+    self.bulk_size = bulk_size
+    self.reverse = reverse
+    # Пост из середины таблицы: не первый и не последний
+    count = Post.objects.count()
+    self.post = Post.objects.select_related('author').order_by('id')[count // 2]
+    self.last_page = max(1, -(-count // 3))
+    # Автор поста: PUT доступен только ему
+    self.client = APIClient()
+    self.client.force_authenticate(self.post.author)
+
+  def get_calls(self):
+    reverse = self.reverse
+    list_url = reverse('post-list')
+    detail_url = reverse('post-detail', args=[self.post.id])
+    return {
+      'list': (None, lambda: self.client.get(list_url)),
+      'list_last_page': (None, lambda: self.client.get(list_url, {'page': self.last_page})),
+      'list_cursor': (None, lambda: self.client.get(list_url, {'pagination': 'cursor'})),
+      'list_include_subposts': (None, lambda: self.client.get(list_url, {'include': 'subposts'})),
+      'retrieve': (None, lambda: self.client.get(detail_url)),
+      'bulk_create': (None, lambda: self.client.post(list_url, self.bulk_payload(), format='json')),
+      'update_with_subposts': (
+        self.update_payload,
+        lambda payload: self.client.put(detail_url, payload, format='json')
+      ),
+      'like_toggle': (None, lambda: self.client.post(reverse('post-like', args=[self.post.id]))),
+      'add_view': (None, lambda: self.client.get(reverse('post-add-view', args=[self.post.id]))),
+    }
+
+  def bulk_payload(self):
+    return [{'title': f'Bulk {i}', 'body': 'Содержание'} for i in range(self.bulk_size)]
+
+  def update_payload(self):
+    """
+    Диф субпостов: все, кроме первого, обновляются, первый удаляется,
+    один создается - количество субпостов не меняется между замерами
+    """
+    from apps.blog.models import SubPost
+
+    ids = list(SubPost.objects.filter(post=self.post).order_by('id').values_list('id', flat=True))
+    subposts = [{'id': subpost_id, 'title': 'Обновлен', 'body': 'Содержание'} for subpost_id in ids[1:]]
+    subposts.append({'title': 'Новый', 'body': 'Содержание'})
+    return {'title': self.post.title, 'body': 'Обновлен', 'subposts': subposts}
+
+
+def count_queries(setup, func):
+  from django.db import connection
+  from django.test.utils import CaptureQueriesContext
+
+  arg = setup() if setup else None
+  with CaptureQueriesContext(connection) as ctx:
+    response = func(arg) if setup else func()
+  return len(ctx.captured_queries), response.status_code
+
+
+def run_scale(args, endpoints):
+  bench = EndpointBench(args.bulk_size)
+  calls = bench.get_calls()
+  results = {}
+  for name in endpoints:
+    setup, func = calls[name]
+    queries, status_code = count_queries(setup, func)
+    if status_code >= 400:
+      print(f'{name}: HTTP {status_code}')
+    summary = summarize(measure(func, args.iterations, warmup=args.warmup, setup=setup))
+    results[name] = {**summary, 'queries': queries, 'status': status_code}
+  return results
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--scales', default='1000,10000', help='Количество постов через запятую')
+  parser.add_argument('--users', type=int, default=1000)
+  parser.add_argument('--subposts-max', type=int, default=4, help='Субпостов на пост: от 0 до N')
+  parser.add_argument('--likes-per-post', type=float, default=3.0)
+  parser.add_argument('--iterations', type=int, default=50)
+  parser.add_argument('--warmup', type=int, default=3)
+  parser.add_argument('--bulk-size', type=int, default=50, help='Постов в одном bulk_create')
+  parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+  parser.add_argument('--output')
+  args = parser.parse_args()
+
+  scales = sorted(int(value) for value in args.scales.split(','))
+  endpoints = [name for name in args.endpoints.split(',') if name]
+  unknown = set(endpoints) - set(ENDPOINTS)
+  if unknown:
+    parser.error(f'Неизвестные эндпоинты: {sorted(unknown)}')
+
+  db_path = setup_django()
+  try:
+    from django.contrib.auth.models import User
+    from apps.blog.models import Post
+
+    results = {}
+    for scale in scales:
+      # База растет от объема к объему: досоздаем недостающие посты
+      missing = scale - Post.objects.count()
+      if missing > 0:
+        seed_blog(
+          missing,
+          users=0 if User.objects.exists() else args.users,
+          subposts_max=args.subposts_max,
+          likes_per_post=args.likes_per_post,
+          seed=scale,
+          defer_indexes=True,
+        )
+      results[str(scale)] = run_scale(args, endpoints)
+    write_results(args.output, 'endpoints', results, vars(args))
+  finally:
+    os.remove(db_path)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,44 @@
+"""
+Поиск: FTS5 (/api/posts/search/) против icontains
+
+python -m benchmarks.bench_search --posts 50000 --output search.json
+"""
+import argparse
+import os
+
+from benchmarks.utils import measure, seed_blog, setup_django, summarize, write_results
+
+
+# Редкие слова (несколько совпадений) и частые (совпадает почти все):
+# icontains на частых словах останавливается на LIMIT, на редких - читает всю таблицу
+QUERIES = ['тег42', 'тег9001', 'django', 'курсор поиск']
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--posts', type=int, default=20000)
+  parser.add_argument('--subposts-max', type=int, default=4, help='Субпостов на пост: от 0 до N')
+  parser.add_argument('--iterations', type=int, default=20)
+  parser.add_argument('--limit', type=int, default=20)
+  parser.add_argument('--output')
+  args = parser.parse_args()
+
+  db_path = setup_django()
+  try:
+    from apps.blog.search import naive_search, search
+
+    seed_blog(args.posts, subposts_max=args.subposts_max, defer_indexes=True)
+
+    results = {}
+    for query in QUERIES:
+      results[query] = {
+        'fts5': summarize(measure(lambda: search(query, args.limit), args.iterations)),
+        'icontains': summarize(measure(lambda: naive_search(query, args.limit), args.iterations)),
+      }
+    write_results(args.output, 'search', results, vars(args))
+  finally:
+    os.remove(db_path)
+
+
+if __name__ == '__main__':
+  main()
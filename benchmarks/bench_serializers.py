@@ -0,0 +1,63 @@
+"""
+Чтение постов: PostSerializer по моделям против .values() + PostValuesSerializer
+
+python -m benchmarks.bench_serializers --posts 20000 --sizes 20,100,1000 --output serializers.json
+
+Размеры - запрос и сериализация N постов без HTTP; endpoint - страница
+GET /api/posts/?pagination=cursor через тестовый клиент с включенным и
+выключенным BLOG_FAST_READ.
+"""
+import argparse
+import os
+
+from benchmarks.utils import measure, seed_blog, setup_django, summarize, write_results
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--posts', type=int, default=20000)
+  parser.add_argument('--sizes', default='20,100,1000', help='Постов в одном ответе через запятую')
+  parser.add_argument('--iterations', type=int, default=30)
+  parser.add_argument('--output')
+  args = parser.parse_args()
+
+  db_path = setup_django()
+  try:
+    from django.test import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from apps.blog.models import Post
+    from apps.blog.serializers import PostSerializer, PostValuesSerializer
+
+    seed_blog(args.posts, subposts_max=0, defer_indexes=True)
+    queryset = Post.objects.select_related('author').order_by('create_at', 'id')
+    fast = PostValuesSerializer()
+    post = Post.objects.select_related('author').first()
+    client = APIClient()
+    client.force_authenticate(post.author)
+    list_url = reverse('post-list')
+
+    def endpoint(enabled):
+      def call():
+        with override_settings(BLOG_FAST_READ={'ENABLED': enabled}):
+          return client.get(list_url, {'pagination': 'cursor'})
+      return call
+
+    results = {}
+    for size in [int(value) for value in args.sizes.split(',')]:
+      page = queryset[:size]
+      results[str(size)] = {
+        'serializer': summarize(measure(lambda: PostSerializer(page.all(), many=True).data, args.iterations)),
+        'values': summarize(measure(lambda: fast.many(page.values(*fast.lookups)), args.iterations)),
+      }
+    results['endpoint'] = {
+      'serializer': summarize(measure(endpoint(False), args.iterations)),
+      'values': summarize(measure(endpoint(True), args.iterations)),
+    }
+    write_results(args.output, 'serializers', results, vars(args))
+  finally:
+    os.remove(db_path)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,86 @@
+"""
+Старт воркера: время импорта config.wsgi и RSS с ленивыми аннотациями схемы и без них
+
+python -m benchmarks.bench_startup --runs 20 --output startup.json
+
+Каждый замер - отдельный процесс python: import config.wsgi и загрузка
+URL (вьюсеты, роутер) - то, что воркер делает до первого ответа.
+- eager: BLOG_LAZY_SCHEMA_DOCS=0, docs и drf_spectacular импортируются при старте;
+- lazy: BLOG_LAZY_SCHEMA_DOCS=1, только при генерации схемы.
+
+import_ms - время импорта внутри процесса, process_ms - запуск процесса
+целиком, rss_kb - пиковый RSS процесса (ru_maxrss).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.utils import ROOT, summarize, write_results
+
+
+MODES = {
+  'eager': '0',
+  'lazy': '1',
+}
+
+WORKER_SCRIPT = '''
+import json, resource, sys, time
+start = time.perf_counter()
+import config.wsgi
+from django.urls import resolve
+resolve('/api/posts/')
+import_ms = (time.perf_counter() - start) * 1000
+modules = sum(1 for name in sys.modules if name.startswith(('drf_spectacular', 'apps.blog.docs')))
+print(json.dumps({
+  'import_ms': import_ms,
+  'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+  'modules': modules,
+}))
+'''
+
+
+def run_worker(lazy):
+  env = {
+    **os.environ,
+    'DJANGO_SETTINGS_MODULE': 'config.settings.base',
+    'SECRET_KEY': os.environ.get('SECRET_KEY', 'benchmark-secret-key'),
+    'BLOG_LAZY_SCHEMA_DOCS': lazy,
+  }
+  start = time.perf_counter()
+  result = subprocess.run(
+    [sys.executable, '-c', WORKER_SCRIPT], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+  )
+  process_ms = (time.perf_counter() - start) * 1000
+  return {**json.loads(result.stdout), 'process_ms': process_ms}
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--runs', type=int, default=20, help='Процессов на режим')
+  parser.add_argument('--output')
+  args = parser.parse_args()
+
+  samples = {mode: [] for mode in MODES}
+  # Режимы чередуются: прогрев дискового кэша и фон влияют на оба одинаково
+  for _ in range(args.runs):
+    for mode, lazy in MODES.items():
+      samples[mode].append(run_worker(lazy))
+
+  results = {}
+  for mode, runs in samples.items():
+    rss = sorted(run['rss_kb'] for run in runs)
+    results[mode] = {
+      'import': summarize([run['import_ms'] for run in runs]),
+      'process': summarize([run['process_ms'] for run in runs]),
+      'rss_kb_median': rss[len(rss) // 2],
+      'rss_kb_max': rss[-1],
+      'schema_modules': runs[0]['modules'],
+    }
+  write_results(args.output, 'startup', results, vars(args))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,87 @@
+"""
+Сравнение двух прогонов бенчмарка (JSON из --output)
+
+python -m benchmarks.compare base.json new.json --metric p95_ms --threshold 10
+
+Печатает метрику и число запросов по каждому объему и эндпоинту.
+Код выхода 1, если метрика выросла больше чем на threshold процентов
+или выросло число SQL-запросов.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def load(path):
+  return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def flatten(results, prefix=()):
+  """
+  {scale: {endpoint: {метрики}}} -> {(scale, endpoint): {метрики}}
+
+  Вложенность у бенчмарков разная: листом считается словарь с 'count'
+  """
+  rows = {}
+  for key, value in results.items():
+    path = (*prefix, key)
+    if isinstance(value, dict) and 'count' in value:
+      rows[path] = value
+    elif isinstance(value, dict):
+      rows.update(flatten(value, path))
+  return rows
+
+
+def compare(base, new, metric, threshold):
+  """
+  :return: (строки таблицы, есть ли регрессии)
+  """
+  base_rows = flatten(base['results'])
+  new_rows = flatten(new['results'])
+  lines = []
+  regressed = False
+  for path in sorted(set(base_rows) | set(new_rows)):
+    name = ' / '.join(path)
+    old, cur = base_rows.get(path), new_rows.get(path)
+    if old is None or cur is None:
+      lines.append(f'{name:<50} {"только в " + ("новом" if old is None else "базовом"):>30}')
+      continue
+
+    old_value, new_value = old.get(metric), cur.get(metric)
+    delta = None
+    if old_value and new_value is not None:
+      delta = (new_value - old_value) / old_value * 100
+    mark = ''
+    if delta is not None and delta > threshold:
+      mark = ' !'
+      regressed = True
+    if 'queries' in old and cur.get('queries', 0) > old['queries']:
+      mark = ' !'
+      regressed = True
+
+    queries = ''
+    if 'queries' in old or 'queries' in cur:
+      queries = f'{old.get("queries")}->{cur.get("queries")}'
+    delta_text = f'{delta:+.1f}%' if delta is not None else '-'
+    lines.append(f'{name:<50} {old_value!s:>10} {new_value!s:>10} {delta_text:>9} {queries:>8}{mark}')
+  return lines, regressed
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('base')
+  parser.add_argument('new')
+  parser.add_argument('--metric', default='p95_ms')
+  parser.add_argument('--threshold', type=float, default=10.0, help='Допустимый рост метрики, %%')
+  args = parser.parse_args()
+
+  base, new = load(args.base), load(args.new)
+  print(f'{base.get("revision")} -> {new.get("revision")}, метрика {args.metric}')
+  lines, regressed = compare(base, new, args.metric, args.threshold)
+  print('\n'.join(lines))
+  sys.exit(1 if regressed else 0)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,127 @@
+"""
+Общие функции бенчмарков
+
+Бенчмарки запускаются из корня проекта: python -m benchmarks.<имя> --help
+Каждый работает на своей временной базе SQLite, рабочая база не трогается.
+"""
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def setup_django(db_path=None, debug=False):
+  """
+  Настроить Django на отдельной базе SQLite и применить миграции
+
+  :param db_path: Путь к базе (по умолчанию - временный файл)
+  :return: Путь к базе
+  """
+  sys.path.insert(0, str(ROOT))
+  os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.base')
+  os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+
+  import django
+  from django.conf import settings
+
+  if db_path is None:
+    handle, db_path = tempfile.mkstemp(prefix='blog_bench_', suffix='.sqlite3')
+    os.close(handle)
+  settings.DATABASES['default']['NAME'] = str(db_path)
+  settings.DEBUG = debug
+  django.setup()
+
+  from django.core.management import call_command
+  call_command('migrate', verbosity=0)
+  return db_path
+
+
+def seed_blog(posts, users=100, **options):
+  """
+  Наполнить базу командой seed_blog (python manage.py seed_blog --help)
+
+  Повторный вызов досоздает посты; users=0 - лайки и авторы из уже
+  созданных пользователей
+  """
+  from django.core.management import call_command
+  call_command('seed_blog', posts=posts, users=users, verbosity=0, **options)
+
+
+def measure(func, iterations, warmup=3, setup=None):
+  """
+  :param setup: Вызывается перед каждым замером вне таймера, результат передается в func
+  :return: Список задержек в миллисекундах
+  """
+  def run_once():
+    if setup is None:
+      start = time.perf_counter()
+      func()
+    else:
+      arg = setup()
+      start = time.perf_counter()
+      func(arg)
+    return (time.perf_counter() - start) * 1000
+
+  for _ in range(warmup):
+    run_once()
+  return [run_once() for _ in range(iterations)]
+
+
+def percentile(ordered, percent):
+  if not ordered:
+    return None
+  index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+  return ordered[index]
+
+
+def summarize(latencies):
+  ordered = sorted(latencies)
+  total = sum(ordered)
+  return {
+    'count': len(ordered),
+    'mean_ms': round(total / len(ordered), 3) if ordered else None,
+    'p50_ms': round(percentile(ordered, 50), 3) if ordered else None,
+    'p95_ms': round(percentile(ordered, 95), 3) if ordered else None,
+    'p99_ms': round(percentile(ordered, 99), 3) if ordered else None,
+    'max_ms': round(ordered[-1], 3) if ordered else None,
+    'throughput_rps': round(len(ordered) / (total / 1000), 1) if total else None,
+  }
+
+
+def git_revision():
+  try:
+    return subprocess.run(
+      ['git', 'rev-parse', '--short', 'HEAD'],
+      cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+
+def write_results(path, benchmark, results, params=None):
+  """
+  Записать результаты в JSON (для сравнения прогонов)
+  """
+  payload = {
+    'benchmark': benchmark,
+    'created_at': datetime.now(timezone.utc).isoformat(),
+    'revision': git_revision(),
+    'python': platform.python_version(),
+    'sqlite': sqlite3.sqlite_version,
+    'platform': platform.platform(),
+    'params': params or {},
+    'results': results,
+  }
+  text = json.dumps(payload, ensure_ascii=False, indent=2)
+  if path:
+    Path(path).write_text(text, encoding='utf-8')
+  print(text)
+  return payload
@@ -34,6 +34,7 @@ INSTALLED_APPS = [
 
     # modules
     "rest_framework",
+    "rest_framework.authtoken",
     "drf_spectacular",
 
     # apps
@@ -41,6 +42,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Первым: total включает остальные middleware (выключается BLOG_SERVER_TIMING)
+    "apps.blog.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -133,13 +136,26 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        # 'rest_framework.authentication.TokenAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
+        # Basic с кэшем проверенных паролей (apps/blog/authentication.py, BLOG_AUTH_CACHE)
+        'apps.blog.authentication.CachedBasicAuthentication',
+        # Authorization: Token <key>, ключ - POST /api/auth/token/
+        'rest_framework.authentication.TokenAuthentication',
         'rest_framework.authentication.SessionAuthentication'
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # JSON на orjson, если установлен (requirements/prod.txt), иначе stdlib json.
+    # Вывод тот же, что у JSONRenderer
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.blog.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.blog.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20
 }
@@ -149,4 +165,83 @@ SPECTACULAR_SETTINGS = {
   'DESCRIPTION': 'Документация API для blog_lite',
   'VERSION': '1.0.0',
   'SERVE_INCLUDE_SCHEMA': False,
-}
\ No newline at end of file
+  # Применяет отложенные аннотации schema_docs (BLOG_LAZY_SCHEMA_DOCS)
+  'DEFAULT_GENERATOR_CLASS': 'apps.blog.docs.generator.LazyDocsSchemaGenerator',
+}
+
+# Аннотации схемы (apps/blog/docs) применяются только при генерации схемы:
+# воркер не импортирует docs и drf_spectacular при старте
+BLOG_LAZY_SCHEMA_DOCS = os.getenv('BLOG_LAZY_SCHEMA_DOCS') == '1'
+
+# Буфер счетчика просмотров (apps/blog/counters.py)
+# ENABLED: копить просмотры в памяти и писать в БД одним UPDATE
+BLOG_VIEW_BUFFER = {
+  'ENABLED': os.getenv('BLOG_VIEW_BUFFER') == '1',
+  'MAX_PENDING': 100,
+  'FLUSH_INTERVAL': 5,
+}
+
+# Кэш: locmem по умолчанию, файловый - для нескольких процессов на одной машине
+CACHES = {
+  'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+  },
+  'file': {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': BASE_DIR / 'cache',
+  },
+}
+
+# Кэш ответов PostViewSet.list/retrieve (apps/blog/cache.py)
+# ALIAS: ключ из CACHES
+BLOG_RESPONSE_CACHE = {
+  'ENABLED': os.getenv('BLOG_RESPONSE_CACHE') == '1',
+  'ALIAS': os.getenv('BLOG_RESPONSE_CACHE_ALIAS', 'default'),
+  'TIMEOUT': 300,
+}
+
+# Потоковый импорт постов в формате application/x-ndjson
+# CHUNK_SIZE: сколько строк валидируется и пишется в одной транзакции
+# BATCH_SIZE: batch_size для bulk_create
+BLOG_NDJSON_IMPORT = {
+  'CHUNK_SIZE': 500,
+  'MAX_CHUNK_SIZE': 5000,
+  'BATCH_SIZE': 500,
+}
+
+# Заголовок Server-Timing и лог apps.blog.timing: БД, auth, сериализация, рендер
+BLOG_SERVER_TIMING = {
+  'ENABLED': os.getenv('BLOG_SERVER_TIMING') == '1',
+  'LOG': True,
+}
+
+# Лента /api/posts/trending/: рейтинг пересчитывает
+# python manage.py refresh_trending (cron, раз в несколько минут)
+BLOG_TRENDING = {
+  'HALF_LIFE': 6 * 60 * 60,
+  'VIEW_WEIGHT': 1.0,
+  'LIKE_WEIGHT': 5.0,
+  'BATCH_SIZE': 500,
+}
+
+# Быстрое чтение list/retrieve постов и субпостов: .values() без ModelSerializer
+# (apps/blog/fast_read.py). Формат ответа тот же
+BLOG_FAST_READ = {
+  'ENABLED': os.getenv('BLOG_FAST_READ', '1') == '1',
+}
+
+# Готовая схема OpenAPI для /api/schema/ (apps/blog/schema.py): файлы в DIR,
+# версия - хэш исходников (или VERSION, например git sha). Собрать заранее:
+# python manage.py build_schema
+BLOG_SCHEMA_CACHE = {
+  'DIR': BASE_DIR / 'cache' / 'schema',
+  'VERSION': os.getenv('BLOG_SCHEMA_VERSION') or None,
+}
+
+# Кэш проверенных логинов/паролей BasicAuthentication в памяти процесса
+# (apps/blog/authentication.py): повторный запрос клиента - без хэширования пароля
+BLOG_AUTH_CACHE = {
+  'ENABLED': os.getenv('BLOG_AUTH_CACHE', '1') == '1',
+  'TTL': 300,
+  'MAX_SIZE': 10000,
+}
@@ -1,5 +1,10 @@
 # Настройки для продакшена
+import os
+
 from .base import *   # noqa: F403
 
 DEBUG = False
 ALLOWED_HOSTS = ['Тут домен']
+
+# Аннотации схемы - при первой генерации схемы, а не при старте воркера
+BLOG_LAZY_SCHEMA_DOCS = os.getenv('BLOG_LAZY_SCHEMA_DOCS', '1') == '1'
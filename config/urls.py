@@ -2,7 +2,8 @@ from django.contrib import admin
 from django.urls import path, include
 
 
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+# Классы схемы и токена импортируются при первом запросе: drf_spectacular не грузится при старте воркера
+from apps.blog.docs.lazy import lazy_view
 
 
 urlpatterns = [
@@ -11,13 +12,15 @@ urlpatterns = [
 
     path(
         'api/schema/', 
-        SpectacularAPIView.as_view(), 
+        lazy_view('apps.blog.schema.CachedSchemaView'), 
         name='schema'
     ),
     path(
         'api/schema/swagger-ui/',
-        SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'
+        lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='swagger-ui'
     ),
 
         path('api/drf-auth/', include('rest_framework.urls')),
+    # Ключ для Authorization: Token <key> по username/password
+    path('api/auth/token/', lazy_view('rest_framework.authtoken.views.ObtainAuthToken'), name='auth-token'),
 ]